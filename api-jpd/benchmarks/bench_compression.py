@@ -0,0 +1,114 @@
+"""
+Benchmark `CompressionMiddleware` gzip levels on typical lobby list responses.
+
+Builds `LobbySchema` pages of 10 and 100 lobbies, serializes them as `ORJSONResponse`
+does, and compresses them with gzip at levels 1, 6 (default) and 9.
+Does not require Postgres or Redis.
+
+Usage: PYTHONPATH=src python benchmarks/bench_compression.py [--iterations 200]
+"""
+
+import argparse
+import datetime
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from configs import settings
+from enums.lobby import LobbyStateEnum
+from enums.prompt import PromptTypeEnum
+from middlewares import CompressionMiddleware
+from schemas.category.nested import CategoryWithPromptsSchema
+from schemas.lobby.nested import LobbySchema
+from schemas.lobby_category.base import BaseLobbyCategorySchema
+from schemas.prompt.base import BasePromptSchema
+from schemas.user.base import BaseUserSchema
+
+PAGE_SIZES = (10, 100)
+CATEGORIES_PER_LOBBY = 5
+PROMPTS_PER_CATEGORY = 5
+
+
+def create_lobbies(count: int) -> list[LobbySchema]:
+    created_at = datetime.datetime(2025, 1, 1)
+    host = BaseUserSchema(id=1, username="benchmark", created_at=created_at, password="")
+    lobbies = []
+    for lobby_id in range(1, count + 1):
+        categories = [
+            CategoryWithPromptsSchema(
+                id=lobby_id * 10 + i,
+                name=f"Category {lobby_id * 10 + i}",
+                owner_id=host.id,
+                version=1,
+                prompts=[
+                    BasePromptSchema(
+                        id=(lobby_id * 10 + i) * 10 + order,
+                        category_id=lobby_id * 10 + i,
+                        question=f"What is the answer to question number {order}?",
+                        question_type=PromptTypeEnum.TEXT,
+                        answer=f"Answer {order}",
+                        answer_type=PromptTypeEnum.TEXT,
+                        order=order,
+                        score=order * 100,
+                    )
+                    for order in range(1, PROMPTS_PER_CATEGORY + 1)
+                ],
+            )
+            for i in range(CATEGORIES_PER_LOBBY)
+        ]
+        lobbies.append(
+            LobbySchema(
+                id=lobby_id,
+                host_id=host.id,
+                state=LobbyStateEnum.CREATED,
+                created_at=created_at,
+                version=1,
+                host=host,
+                categories=categories,
+                lobby_categories=[
+                    BaseLobbyCategorySchema(lobby_id=lobby_id, category_id=category.id)
+                    for category in categories
+                ],
+            ),
+        )
+    return lobbies
+
+
+GZIP_LEVELS = (1, 6, 9)
+
+
+def measure(middleware: CompressionMiddleware, body: bytes, iterations: int) -> None:
+    def compress() -> bytes:
+        compressor = middleware.create_compressor("gzip")
+        return compressor.compress(body) + compressor.flush()
+
+    compressed = compress()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        compress()
+    elapsed_ms = (time.perf_counter() - started) * 1000 / iterations
+    ratio = len(body) / len(compressed)
+    print(
+        f"  gzip {middleware.gzip_level} {elapsed_ms:8.3f} ms/call  {len(compressed):>8} bytes  "
+        f"ratio {ratio:5.1f}x",
+    )
+
+
+def main(iterations: int) -> None:
+    for page_size in PAGE_SIZES:
+        body = orjson.dumps(jsonable_encoder(create_lobbies(page_size)))
+        print(f"GET /lobby, {page_size} lobbies: {len(body)} bytes")
+        for gzip_level in GZIP_LEVELS:
+            middleware = CompressionMiddleware(
+                app=None,
+                minimum_size=settings.compression_minimum_size,
+                gzip_level=gzip_level,
+            )
+            measure(middleware, body, iterations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    main(parser.parse_args().iterations)
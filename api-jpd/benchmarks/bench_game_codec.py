@@ -0,0 +1,97 @@
+"""
+Benchmark size and decode time of games stored as JSON and as blobs of `encode_game`.
+
+Games have 6 categories of 5 prompts and up to 8 players. The JSON baseline is the
+previous storage format, read as decoded text and validated by pydantic. Blobs are
+compressed with zlib.
+Does not require Redis.
+
+Usage: PYTHONPATH=src python benchmarks/bench_game_codec.py [--iterations 2000]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from configs import settings
+from enums.game import GameStateEnum
+from enums.prompt import PromptTypeEnum
+from schemas.category.nested import CategoryInGameSchema
+from schemas.game import GameSchema
+from schemas.player import LeadSchema, PlayerSchema
+from schemas.prompt.base import PromptInGameSchema
+from utils.game_codec import decode_game, encode_game
+
+PLAYER_COUNTS = (2, 8)
+CATEGORY_COUNT = 6
+PROMPTS_PER_CATEGORY = 5
+
+
+def create_game(player_count: int) -> GameSchema:
+    return GameSchema(
+        id=1,
+        state=GameStateEnum.SELECT_PROMPT,
+        lead=LeadSchema(id=1, username="lead"),
+        players=[
+            PlayerSchema(id=player_id, username=f"player {player_id}", score=player_id * 100)
+            for player_id in range(2, player_count + 2)
+        ],
+        categories=[
+            CategoryInGameSchema(
+                id=category_id,
+                name=f"Category {category_id}",
+                prompts=[
+                    PromptInGameSchema(
+                        id=category_id * PROMPTS_PER_CATEGORY + order,
+                        category_id=category_id,
+                        question=f"Question {order} of category {category_id}, " * 2,
+                        question_type=PromptTypeEnum.TEXT,
+                        answer=f"Answer {order}",
+                        answer_type=PromptTypeEnum.TEXT,
+                        order=order,
+                        score=order * 100,
+                    )
+                    for order in range(1, PROMPTS_PER_CATEGORY + 1)
+                ],
+            )
+            for category_id in range(CATEGORY_COUNT)
+        ],
+    )
+
+
+def measure(name: str, iterations: int, size: int, call: Callable[[], object]) -> None:
+    call()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    elapsed_us = (time.perf_counter() - started) * 1_000_000 / iterations
+    print(f"{name:<24} {size:8} bytes  {elapsed_us:8.2f} us/decode")
+
+
+def main(iterations: int) -> None:
+    for player_count in PLAYER_COUNTS:
+        game = create_game(player_count)
+        json_blob = game.model_dump_json().encode()
+        blob = encode_game(game)
+        compressed_blob = encode_game(game, settings.redis_game_compression_min_size)
+
+        print(f"{player_count} players")
+        measure(
+            "JSON",
+            iterations,
+            len(json_blob),
+            lambda json_blob=json_blob: GameSchema.model_validate_json(json_blob.decode()),
+        )
+        measure("compact", iterations, len(blob), lambda blob=blob: decode_game(blob))
+        measure(
+            "compact, compressed",
+            iterations,
+            len(compressed_blob),
+            lambda blob=compressed_blob: decode_game(blob),
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    main(parser.parse_args().iterations)
@@ -0,0 +1,100 @@
+"""
+Benchmark round trips of reading and writing several games with `GameRepo`.
+
+Compares one `get_game` and `set_game` per game with batched `get_games` and
+`set_games`, which use MGET and a pipeline. Round trips are counted as commands sent
+to Redis by connections. Requires Redis configured through `API_REDIS_*` variables,
+e.g. `make local-infra-up`. Written games expire.
+
+Usage: PYTHONPATH=src python benchmarks/bench_redis.py [--iterations 50]
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from redis.asyncio.connection import AbstractConnection
+
+from enums.game import GameStateEnum
+from repositories import GameRepo
+from schemas.game import GameSchema
+from schemas.player import LeadSchema, PlayerSchema
+from storages import get_redis_manager
+
+GAME_COUNTS = (1, 10, 100)
+FIRST_GAME_ID = 1_000_000
+
+
+class RoundTripCounter:
+    def __init__(self):
+        self.count = 0
+        self._send_packed_command = AbstractConnection.send_packed_command
+
+    def __enter__(self) -> "RoundTripCounter":
+        counter = self
+
+        async def send_packed_command(connection: AbstractConnection, *args, **kwargs) -> None:
+            counter.count += 1
+            await counter._send_packed_command(connection, *args, **kwargs)
+
+        AbstractConnection.send_packed_command = send_packed_command
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        AbstractConnection.send_packed_command = self._send_packed_command
+
+
+def create_games(count: int) -> list[GameSchema]:
+    return [
+        GameSchema(
+            id=FIRST_GAME_ID + game_id,
+            state=GameStateEnum.BEFORE_START,
+            lead=LeadSchema(id=1, username="lead"),
+            players=[PlayerSchema(id=i, username=f"player {i}") for i in range(2, 6)],
+            categories=[],
+        )
+        for game_id in range(count)
+    ]
+
+
+async def measure(
+    name: str,
+    iterations: int,
+    call: Callable[[], Awaitable],
+) -> None:
+    await call()
+    with RoundTripCounter() as counter:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await call()
+        elapsed_ms = (time.perf_counter() - started) * 1000 / iterations
+    print(f"{name:<32} {elapsed_ms:8.2f} ms/call  {counter.count / iterations:6.0f} round trips")
+
+
+async def main(iterations: int) -> None:
+    game_repo = GameRepo(redis_manager=get_redis_manager())
+
+    for count in GAME_COUNTS:
+        games = create_games(count)
+        game_ids = [game.id for game in games]
+
+        async def update_one_by_one(games: list[GameSchema] = games) -> None:
+            for game in games:
+                await game_repo.set_game(await game_repo.get_game(game.id))
+
+        async def update_in_batch(game_ids: list[int] = game_ids) -> None:
+            await game_repo.set_games(await game_repo.get_games(*game_ids))
+
+        await game_repo.set_games(games)
+        print(f"{count} games")
+        await measure("get_game + set_game per game", iterations, update_one_by_one)
+        await measure("get_games + set_games", iterations, update_in_batch)
+
+    await get_redis_manager().close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    asyncio.run(main(parser.parse_args().iterations))
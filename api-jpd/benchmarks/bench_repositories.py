@@ -0,0 +1,169 @@
+"""
+Benchmark nested list reads of `LobbyRepo.filter` and `CategoryRepo.filter`.
+
+Compares ORM loading (selectinload + `from_attributes` validation) with the JSON
+aggregation read path and the cached read path at page size 100. Requires a migrated
+Postgres and Redis configured through `API_DB_*` and `API_REDIS_*` variables,
+e.g. `make local-infra-up`. Seeded data is rolled back, its cache entries expire.
+
+Usage: PYTHONPATH=src python benchmarks/bench_repositories.py [--iterations 50]
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from configs import settings
+from enums.lobby import LobbyStateEnum
+from enums.prompt import PromptTypeEnum
+from models.category import CategoryModel
+from models.lobby import LobbyModel
+from models.lobby_category import LobbyCategoryModel
+from models.prompt import PromptModel
+from models.user import UserModel
+from repositories import CategoryRepo, LobbyRepo
+from schemas.category.nested import CategorySchema
+from schemas.lobby.base import LobbySearchSchema
+from schemas.lobby.nested import LobbySchema
+from schemas.storage import DBConnectionSchema
+from storages import DBManager, get_cache_manager
+from utils.validation import validate_model
+
+PAGE_SIZE = 100
+CATEGORIES_PER_LOBBY = 5
+
+
+async def seed(session: AsyncSession) -> int:
+    user = UserModel(username="benchmark", password="benchmark")
+    session.add(user)
+    await session.flush()
+
+    categories = [CategoryModel(name=f"Category {i}", owner_id=user.id) for i in range(PAGE_SIZE)]
+    session.add_all(categories)
+    await session.flush()
+
+    session.add_all(
+        PromptModel(
+            category_id=category.id,
+            question=f"Question {order}",
+            question_type=PromptTypeEnum.TEXT,
+            answer=f"Answer {order}",
+            answer_type=PromptTypeEnum.TEXT,
+            order=order,
+            score=100,
+        )
+        for category in categories
+        for order in range(1, 4)
+    )
+    lobbies = [LobbyModel(host_id=user.id, state=LobbyStateEnum.CREATED) for _ in range(PAGE_SIZE)]
+    session.add_all(lobbies)
+    await session.flush()
+
+    session.add_all(
+        LobbyCategoryModel(lobby_id=lobby.id, category_id=categories[(i + j) % PAGE_SIZE].id)
+        for i, lobby in enumerate(lobbies)
+        for j in range(CATEGORIES_PER_LOBBY)
+    )
+    await session.flush()
+    session.expunge_all()
+    return user.id
+
+
+async def orm_categories(session: AsyncSession, owner_id: int) -> list[CategorySchema]:
+    stmt = (
+        select(CategoryModel)
+        .where(CategoryModel.owner_id == owner_id)
+        .options(
+            selectinload(CategoryModel.owner),
+            selectinload(CategoryModel.prompts),
+            selectinload(CategoryModel.lobbies),
+            selectinload(CategoryModel.lobby_categories),
+        )
+        .limit(PAGE_SIZE)
+    )
+    categories = (await session.scalars(stmt)).all()
+    session.expunge_all()
+    return validate_model(categories, CategorySchema)
+
+
+async def orm_lobbies(session: AsyncSession, host_id: int) -> list[LobbySchema]:
+    stmt = (
+        select(LobbyModel)
+        .where(LobbyModel.host_id == host_id)
+        .options(
+            selectinload(LobbyModel.host),
+            selectinload(LobbyModel.lobby_categories),
+            selectinload(LobbyModel.categories).options(selectinload(CategoryModel.prompts)),
+        )
+        .order_by(desc(LobbyModel.created_at))
+        .limit(PAGE_SIZE)
+    )
+    lobbies = (await session.scalars(stmt)).all()
+    session.expunge_all()
+    return validate_model(lobbies, LobbySchema)
+
+
+async def measure(name: str, iterations: int, call: Callable[[], Awaitable[list]]) -> None:
+    result = await call()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await call()
+    elapsed_ms = (time.perf_counter() - started) * 1000 / iterations
+    print(f"{name:<32} {elapsed_ms:8.2f} ms/call  ({len(result)} rows)")
+
+
+async def main(iterations: int) -> None:
+    settings.page_size = PAGE_SIZE
+    db_manager = DBManager(db_url=settings.db_url, conn_config=DBConnectionSchema(rollback=True))
+    cache_manager = get_cache_manager()
+
+    async with db_manager.session() as session:
+        user_id = await seed(session)
+        category_repo = CategoryRepo(session=session, cache_manager=cache_manager)
+        lobby_repo = LobbyRepo(session=session, cache_manager=cache_manager)
+        categories_stmt = select(CategoryModel).where(CategoryModel.owner_id == user_id)
+        lobbies_stmt = (
+            select(LobbyModel)
+            .where(LobbyModel.host_id == user_id)
+            .order_by(desc(LobbyModel.created_at))
+        )
+
+        await measure(
+            "CategoryRepo.filter (ORM)",
+            iterations,
+            lambda: orm_categories(session, user_id),
+        )
+        await measure(
+            "CategoryRepo.filter (JSON)",
+            iterations,
+            lambda: category_repo._select_json(categories_stmt.limit(PAGE_SIZE)),
+        )
+        await measure(
+            "CategoryRepo.filter (cached)",
+            iterations,
+            lambda: category_repo.filter(owner_id=user_id),
+        )
+        await measure("LobbyRepo.filter (ORM)", iterations, lambda: orm_lobbies(session, user_id))
+        await measure(
+            "LobbyRepo.filter (JSON)",
+            iterations,
+            lambda: lobby_repo._select_json(lobbies_stmt.limit(PAGE_SIZE)),
+        )
+        await measure(
+            "LobbyRepo.filter (cached)",
+            iterations,
+            lambda: lobby_repo.filter(LobbySearchSchema(host_id=user_id)),
+        )
+
+    await db_manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    asyncio.run(main(parser.parse_args().iterations))
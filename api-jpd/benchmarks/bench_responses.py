@@ -0,0 +1,96 @@
+"""
+Benchmark requests per second of `GET /api/v1/lobby` with and without `ModelResponse`.
+
+The application is called in-process with `LobbyService` replaced by a stub returning
+prebuilt pages of `LobbySchema`, so only routing, serialization and middlewares are
+measured. The baseline is the previous handler, returning models for FastAPI
+to validate and serialize with `response_model`. Does not require Postgres or Redis.
+
+Usage: PYTHONPATH=src python benchmarks/bench_responses.py [--requests 200]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Annotated, ClassVar
+
+import httpx
+from bench_compression import create_lobbies
+from fastapi import Depends, Header, Query, Response
+
+from application import app
+from schemas.base import VersionSchema
+from schemas.lobby.base import LobbySearchSchema
+from schemas.lobby.nested import LobbySchema
+from services import LobbyService
+from storages import use_read_only_db_session
+from utils.etag import create_etag, create_not_modified_response, is_etag_matched
+
+PAGE_SIZES = (10, 100)
+
+
+class StubLobbyService:
+    lobbies: ClassVar[list[LobbySchema]] = []
+
+    async def search_lobby_versions(self, search: LobbySearchSchema) -> list[VersionSchema]:
+        return [VersionSchema(id=lobby.id, version=lobby.version) for lobby in self.lobbies]
+
+    async def search_lobbies(
+        self,
+        search: LobbySearchSchema,
+        versions: list[VersionSchema] | None = None,
+    ) -> list[LobbySchema]:
+        return self.lobbies
+
+
+@app.get(
+    "/benchmark/lobby",
+    response_model=list[LobbySchema],
+    dependencies=[Depends(use_read_only_db_session)],
+    include_in_schema=False,
+)
+async def search_lobbies_with_response_model(
+    search: Annotated[LobbySearchSchema, Query()],
+    lobby_service: Annotated[LobbyService, Depends()],
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> list[LobbySchema] | Response:
+    versions = await lobby_service.search_lobby_versions(search)
+    etag = create_etag(versions)
+    if is_etag_matched(if_none_match, etag):
+        return create_not_modified_response(etag)
+
+    response.headers["ETag"] = etag
+    return await lobby_service.search_lobbies(search, versions=versions)
+
+
+async def measure(client: httpx.AsyncClient, name: str, url: str, requests: int) -> None:
+    resp = await client.get(url)
+    resp.raise_for_status()
+    started = time.perf_counter()
+    for _ in range(requests):
+        await client.get(url)
+    elapsed = time.perf_counter() - started
+    print(f"  {name:<16} {requests / elapsed:8.1f} requests/sec  ({len(resp.content)} bytes)")
+
+
+async def main(requests: int) -> None:
+    app.dependency_overrides[LobbyService] = StubLobbyService
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Accept-Encoding": "identity"}
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://test",
+        headers=headers,
+    ) as client:
+        for page_size in PAGE_SIZES:
+            StubLobbyService.lobbies = create_lobbies(page_size)
+            print(f"GET /lobby, {page_size} lobbies")
+            await measure(client, "response_model", "/benchmark/lobby", requests)
+            await measure(client, "ModelResponse", "/api/v1/lobby", requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    asyncio.run(main(parser.parse_args().requests))
@@ -1,8 +1,20 @@
-from fastapi import APIRouter, Depends, Request
-from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
-from fastapi.openapi.utils import get_openapi
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Request, Response
+from fastapi.responses import HTMLResponse
 
 from auth import check_basic_auth
+from errors.request import ServiceUnavailableError
+from storages import (
+    CacheManager,
+    DBManager,
+    RedisManager,
+    get_cache_manager,
+    get_db_manager,
+    get_redis_manager,
+)
+from utils.docs import get_docs
+from utils.etag import create_not_modified_response, is_etag_matched
 
 router = APIRouter(tags=["internal"], include_in_schema=False)
 
@@ -12,28 +24,44 @@ async def health(request: Request):
     return {"status": "healthy", "version": request.app.version}
 
 
+@router.get("/ready")
+async def ready(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        raise ServiceUnavailableError("Connection pools are not warm")
+    return {"status": "ready"}
+
+
+@router.get("/metrics", dependencies=[Depends(check_basic_auth)])
+async def get_metrics(
+    db_manager: Annotated[DBManager, Depends(get_db_manager)],
+    redis_manager: Annotated[RedisManager, Depends(get_redis_manager)],
+    cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
+):
+    return {
+        "db_pools": db_manager.pool_stats(),
+        "redis_pool": redis_manager.pool_stats(),
+        "redis_shard_pools": {shard.name: shard.pool_stats() for shard in redis_manager.shards},
+        "redis_client_cache": redis_manager.client_cache_stats(),
+        "cache": cache_manager.stats(),
+    }
+
+
 @router.get("/docs", dependencies=[Depends(check_basic_auth)])
 async def get_swagger_documentation(request: Request):
-    return get_swagger_ui_html(
-        openapi_url=request.app.url_path_for("get_openapi_schema"),
-        title=request.app.title + " - Swagger UI",
-    )
+    return HTMLResponse(get_docs(request.app).swagger_ui_html)
 
 
 @router.get("/redoc", dependencies=[Depends(check_basic_auth)])
 async def get_redoc_documentation(request: Request):
-    return get_redoc_html(
-        openapi_url=request.app.url_path_for("get_openapi_schema"),
-        title=request.app.title + " - ReDoc",
-    )
+    return HTMLResponse(get_docs(request.app).redoc_html)
 
 
 @router.get("/openapi.json", dependencies=[Depends(check_basic_auth)])
-async def get_openapi_schema(request: Request):
-    return get_openapi(
-        title=request.app.title,
-        version=request.app.version,
-        openapi_version=request.app.openapi_version,
-        description=request.app.description,
-        routes=request.app.routes,
-    )
+async def get_openapi_schema(
+    request: Request,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    docs = get_docs(request.app)
+    if is_etag_matched(if_none_match, docs.etag):
+        return create_not_modified_response(docs.etag)
+    return Response(docs.openapi, media_type="application/json", headers={"ETag": docs.etag})
@@ -1,36 +1,130 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from api.v1 import prompt
 from auth import authenticate_user
+from constants import MAX_CATEGORIES_IN_BATCH
+from enums.transfer import TransferFormatEnum
+from schemas.base import VersionSchema
 from schemas.category.base import (
     BaseCategorySchema,
     CategoryCreatePublicSchema,
     CategorySearchSchema,
 )
-from schemas.category.nested import CategorySchema, CategoryUpdateSchema
+from schemas.category.nested import (
+    CategoryBatchSchema,
+    CategoryImportResultSchema,
+    CategorySchema,
+    CategoryUpdateSchema,
+)
 from schemas.user.base import BaseUserSchema
-from services import CategoryService
+from services import CategoryService, CategoryTransferService
+from services.category_transfer import TRANSFER_MEDIA_TYPES
+from storages import use_read_only_db_session
+from utils.etag import create_etag, create_not_modified_response, is_etag_matched
+from utils.responses import ModelResponse
 
 router = APIRouter(prefix="/category", tags=["prompt"])
 router.include_router(prompt.router)
 
 
-@router.get("", response_model=list[CategorySchema])
+@router.get(
+    "",
+    response_model=list[CategorySchema],
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
+    dependencies=[Depends(use_read_only_db_session)],
+)
 async def search_categories(
     search: Annotated[CategorySearchSchema, Query()],
     category_service: Annotated[CategoryService, Depends()],
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    versions = await category_service.search_category_versions(search=search)
+    etag = create_etag(versions)
+    if is_etag_matched(if_none_match, etag):
+        return create_not_modified_response(etag)
+
+    categories = await category_service.search_categories(search=search, versions=versions)
+    return ModelResponse(categories, headers={"ETag": etag})
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(use_read_only_db_session)],
+)
+async def export_categories(
+    category_transfer_service: Annotated[CategoryTransferService, Depends()],
+    user: Annotated[BaseUserSchema, Depends(authenticate_user)],
+    transfer_format: Annotated[TransferFormatEnum, Query(alias="format")] = (
+        TransferFormatEnum.NDJSON
+    ),
 ):
-    return await category_service.search_categories(search=search)
+    return StreamingResponse(
+        category_transfer_service.export_categories(transfer_format, user_id=user.id),
+        media_type=TRANSFER_MEDIA_TYPES[transfer_format],
+    )
 
 
-@router.get("/{category_id}", response_model=CategorySchema)
+@router.post(
+    "/import",
+    response_model=CategoryImportResultSchema,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {media_type: {} for media_type in TRANSFER_MEDIA_TYPES.values()},
+        },
+    },
+)
+async def import_categories(
+    request: Request,
+    category_transfer_service: Annotated[CategoryTransferService, Depends()],
+    user: Annotated[BaseUserSchema, Depends(authenticate_user)],
+    transfer_format: Annotated[TransferFormatEnum, Query(alias="format")] = (
+        TransferFormatEnum.NDJSON
+    ),
+):
+    return await category_transfer_service.import_categories(
+        request.stream(),
+        transfer_format,
+        user_id=user.id,
+    )
+
+
+@router.get(
+    "/batch",
+    response_model=CategoryBatchSchema,
+    dependencies=[Depends(use_read_only_db_session)],
+)
+async def get_categories(
+    ids: Annotated[list[int], Query(min_length=1, max_length=MAX_CATEGORIES_IN_BATCH)],
+    category_service: Annotated[CategoryService, Depends()],
+):
+    return ModelResponse(await category_service.get_categories(ids))
+
+
+@router.get(
+    "/{category_id}",
+    response_model=CategorySchema,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
+    dependencies=[Depends(use_read_only_db_session)],
+)
 async def get_category(
     category_id: int,
     category_service: Annotated[CategoryService, Depends()],
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    return await category_service.get_category(category_id)
+    if if_none_match:
+        etag = create_etag([await category_service.get_category_version(category_id)])
+        if is_etag_matched(if_none_match, etag):
+            return create_not_modified_response(etag)
+
+    category = await category_service.get_category(category_id)
+    etag = create_etag([VersionSchema(id=category.id, version=category.version)])
+    return ModelResponse(category, headers={"ETag": etag})
 
 
 @router.post("", response_model=BaseCategorySchema, status_code=status.HTTP_201_CREATED)
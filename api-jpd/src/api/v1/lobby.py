@@ -1,8 +1,9 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, status
 
 from auth import authenticate_user
+from schemas.base import VersionSchema
 from schemas.lobby.base import (
     BaseLobbySchema,
     LobbyCreatePublicSchema,
@@ -12,24 +13,52 @@ from schemas.lobby.base import (
 from schemas.lobby.nested import LobbySchema
 from schemas.user.base import BaseUserSchema
 from services import LobbyService
+from storages import use_read_only_db_session
+from utils.etag import create_etag, create_not_modified_response, is_etag_matched
+from utils.responses import ModelResponse
 
 router = APIRouter(prefix="/lobby", tags=["lobby"])
 
 
-@router.get("", response_model=list[LobbySchema])
+@router.get(
+    "",
+    response_model=list[LobbySchema],
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
+    dependencies=[Depends(use_read_only_db_session)],
+)
 async def search_lobbies(
     search: Annotated[LobbySearchSchema, Query()],
     lobby_service: Annotated[LobbyService, Depends()],
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    return await lobby_service.search_lobbies(search)
+    versions = await lobby_service.search_lobby_versions(search)
+    etag = create_etag(versions)
+    if is_etag_matched(if_none_match, etag):
+        return create_not_modified_response(etag)
+
+    lobbies = await lobby_service.search_lobbies(search, versions=versions)
+    return ModelResponse(lobbies, headers={"ETag": etag})
 
 
-@router.get("/{lobby_id}", response_model=LobbySchema)
+@router.get(
+    "/{lobby_id}",
+    response_model=LobbySchema,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
+    dependencies=[Depends(use_read_only_db_session)],
+)
 async def get_lobby(
     lobby_id: int,
     lobby_service: Annotated[LobbyService, Depends()],
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    return await lobby_service.get_lobby(lobby_id)
+    if if_none_match:
+        etag = create_etag([await lobby_service.get_lobby_version(lobby_id)])
+        if is_etag_matched(if_none_match, etag):
+            return create_not_modified_response(etag)
+
+    lobby = await lobby_service.get_lobby(lobby_id)
+    etag = create_etag([VersionSchema(id=lobby.id, version=lobby.version)])
+    return ModelResponse(lobby, headers={"ETag": etag})
 
 
 @router.post("", response_model=BaseLobbySchema, status_code=status.HTTP_201_CREATED)
@@ -42,7 +71,7 @@ async def create_lobby(
 
 
 @router.post(
-    "{lobby_id}/start",
+    "/{lobby_id}/start",
     response_model=LobbyStartedPublicSchema,
     status_code=status.HTTP_201_CREATED,
 )
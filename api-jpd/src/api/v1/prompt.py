@@ -3,15 +3,25 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, status
 
 from auth import authenticate_user
-from schemas.prompt.base import BasePromptSchema, PromptCreatePublicSchema, PromptUpdateSchema
+from schemas.prompt.base import (
+    BasePromptSchema,
+    PromptBulkCreatePublicSchema,
+    PromptCreatePublicSchema,
+    PromptUpdateSchema,
+)
 from schemas.prompt.nested import PromptSchema
 from schemas.user.base import BaseUserSchema
 from services import PromptService
+from storages import use_read_only_db_session
 
 router = APIRouter(prefix="/{category_id}/prompt", tags=["prompt"])
 
 
-@router.get("/{prompt_id}", response_model=PromptSchema)
+@router.get(
+    "/{prompt_id}",
+    response_model=PromptSchema,
+    dependencies=[Depends(use_read_only_db_session)],
+)
 async def get_prompt(
     category_id: int,
     prompt_id: int,
@@ -34,6 +44,20 @@ async def create_prompt(
     )
 
 
+@router.put("", response_model=list[BasePromptSchema])
+async def replace_prompts(
+    category_id: int,
+    prompts: PromptBulkCreatePublicSchema,
+    prompt_service: Annotated[PromptService, Depends()],
+    user: Annotated[BaseUserSchema, Depends(authenticate_user)],
+):
+    return await prompt_service.replace_prompts(
+        prompts=prompts,
+        category_id=category_id,
+        user_id=user.id,
+    )
+
+
 @router.patch("/{prompt_id}", response_model=BasePromptSchema)
 async def update_prompt(
     category_id: int,
@@ -7,11 +7,16 @@ from schemas.token import TokenSchema
 from schemas.user.base import BaseUserSchema, UserCreatePublicSchema
 from schemas.user.nested import UserSchema
 from services import UserService
+from storages import use_read_only_db_session
 
 router = APIRouter(prefix="/user", tags=["user"])
 
 
-@router.get("/me", response_model=UserSchema)
+@router.get(
+    "/me",
+    response_model=UserSchema,
+    dependencies=[Depends(use_read_only_db_session)],
+)
 async def get_current_user(
     user: Annotated[BaseUserSchema, Depends(authenticate_user)],
     user_service: Annotated[UserService, Depends()],
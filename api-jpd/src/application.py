@@ -11,6 +11,7 @@ from configs import override_external_loggers, settings
 from constants import ONE_DAY_IN_SECONDS
 from errors import add_error_handlers
 from lifespan import lifespan
+from middlewares import CompressionMiddleware
 from websocket.server import sio
 
 override_external_loggers()
@@ -35,6 +36,11 @@ app.add_middleware(
     allow_headers=["*"],
     max_age=ONE_DAY_IN_SECONDS,
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+)
 
 
 app.include_router(api.router)
@@ -6,15 +6,20 @@ import jwt
 from fastapi import Depends
 from fastapi.security import HTTPBasicCredentials, OAuth2PasswordRequestForm
 from jwt import InvalidTokenError
+from pydantic import ValidationError
 
 from auth.password import verify_password
 from auth.scheme import basic_security, oauth2_scheme
 from configs import settings
 from errors.auth import ForbiddenError, UnauthorizedError
+from schemas.game import GameSessionShema
 from schemas.token import TokenPayloadSchema, TokenSchema
 from schemas.user.base import BaseUserSchema
 from services import UserService
 
+# Access tokens have no audience, PyJWT rejects tokens of other audiences when none is expected
+_RESUME_TOKEN_AUDIENCE = "game.resume"
+
 
 def check_basic_auth(
     credentials: Annotated[HTTPBasicCredentials, Depends(basic_security)],
@@ -83,3 +88,36 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
     return encoded_jwt
+
+
+def create_resume_token(session: GameSessionShema) -> str:
+    """
+    Create short-lived token restoring game session of reconnecting Socket.IO client.
+
+    The token has resume audience, so it is not accepted as access token.
+
+    :param session: game session of client
+    :return: signed token
+    """
+    expire = datetime.now(UTC) + timedelta(seconds=settings.resume_token_expiration_sec)
+    to_encode = {"aud": _RESUME_TOKEN_AUDIENCE, "exp": expire, **session.model_dump()}
+    return jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
+
+
+def decode_resume_token(token: str) -> GameSessionShema:
+    """
+    Restore game session from resume token without database access.
+
+    :param token: signed token
+    :return: game session
+    """
+    try:
+        payload = jwt.decode(
+            token,
+            settings.secret_key,
+            algorithms=["HS256"],
+            audience=_RESUME_TOKEN_AUDIENCE,
+        )
+        return GameSessionShema.model_validate(payload)
+    except (InvalidTokenError, ValidationError) as error:
+        raise UnauthorizedError("Failed to verify resume token") from error
@@ -1,19 +1,34 @@
+import atexit
+import copy
+import itertools
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+from collections import defaultdict
 
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
 
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
 LOG_FORMAT = "[%(asctime)s] %(levelname)s in %(name)s: %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_JSON = os.environ.get("LOG_JSON", "false").lower() == "true"
+LOG_SOCKET_SAMPLE_RATE = float(os.environ.get("LOG_SOCKET_SAMPLE_RATE", "0.01"))
+
+SOCKETIO_LOGGER_NAME = "websocket.socketio"
+ENGINEIO_LOGGER_NAME = "websocket.engineio"
 
 
 class ProjectLoggerFilter(logging.Filter):
+    """Pass project records from `LOG_LEVEL` and external ones from WARNING."""
+
     def __init__(self) -> None:
         super().__init__()
-        self.project_modules = {
+        self.project_modules = (
             "api",
             "auth",
             "configs",
@@ -28,24 +43,94 @@ class ProjectLoggerFilter(logging.Filter):
             "main",
             "migrations",
             "websocket",
-        }
+        )
         self.project_log_level = getattr(logging, LOG_LEVEL)
+        self._min_levels: dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        min_level = self._min_levels.get(record.name)
+        if min_level is None:
+            min_level = self._get_min_level(record.name)
+            self._min_levels[record.name] = min_level
+        return record.levelno >= min_level
+
+    def _get_min_level(self, name: str) -> int:
+        if name == "root" or name.startswith(self.project_modules):
+            return self.project_log_level
+        return logging.WARNING
+
+
+class SamplingFilter(logging.Filter):
+    """Pass one of every `1 / rate` records below WARNING of loggers with given names."""
+
+    def __init__(self, names: tuple[str, ...], rate: float) -> None:
+        super().__init__()
+        self.names = names
+        self.every = max(round(1 / rate), 1) if rate > 0 else 0
+        self._counters: defaultdict[str, itertools.count] = defaultdict(itertools.count)
 
     def filter(self, record: logging.LogRecord) -> bool:
-        if any(record.name.startswith(module) for module in self.project_modules):
-            return record.levelno >= self.project_log_level
-        if record.name == "root":
-            return record.levelno >= self.project_log_level
-        return record.levelno >= logging.WARNING
+        if record.levelno >= logging.WARNING or not record.name.startswith(self.names):
+            return True
+        return bool(self.every) and next(self._counters[record.name]) % self.every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry).decode()
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    listener: logging.handlers.QueueListener
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Arguments are merged before they change, formatting is left to listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
 
 def override_external_loggers() -> None:
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(logging.DEBUG)
-    handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt="%Y-%m-%d %H:%M:%S"))
-    handler.addFilter(ProjectLoggerFilter())
+    """
+    Route records of all loggers to stdout through queue drained by listener thread.
+
+    Filtering and sampling happen in logging threads, formatting and writing in
+    listener thread, so slow stdout never blocks event loop. Records are written as
+    JSON lines if `LOG_JSON` is true.
 
+    :return:
+    """
     root_logger = logging.getLogger()
+    for handler in root_logger.handlers:
+        if isinstance(handler, _QueueHandler):
+            handler.listener.stop()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setLevel(logging.DEBUG)
+    formatter_class = JsonFormatter if LOG_JSON else logging.Formatter
+    stream_handler.setFormatter(formatter_class(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(ProjectLoggerFilter())
+    queue_handler.addFilter(
+        SamplingFilter((SOCKETIO_LOGGER_NAME, ENGINEIO_LOGGER_NAME), LOG_SOCKET_SAMPLE_RATE),
+    )
+    queue_handler.listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    queue_handler.listener.start()
+    atexit.register(queue_handler.listener.stop)
+
     root_logger.handlers.clear()
-    root_logger.addHandler(handler)
-    root_logger.setLevel(logging.DEBUG)
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(min(getattr(logging, LOG_LEVEL), logging.WARNING))
@@ -1,7 +1,10 @@
+import os
+import tempfile
 from functools import cached_property
 from typing import Literal
 
 import sqlalchemy
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,8 +21,10 @@ class Settings(BaseSettings):
     # Uvicorn
     host: str = "0.0.0.0"
     port: int = 8000
-    workers_count: int = 1
-    reload: bool = True
+    workers_count: int = Field(default_factory=lambda: os.cpu_count() or 1)
+    workers_socket_dir: str = tempfile.gettempdir()
+    worker_id: int | None = None
+    reload: bool = False
 
     # App environment
     environment: Literal["test", "local", "prod"] = "local"
@@ -31,10 +36,29 @@ class Settings(BaseSettings):
     openapi_schema_pass: str = "jeopardy"
     secret_key: str = "secret"
     token_expiration_sec: int = 24 * 60 * 60  # 1 day
+    resume_token_expiration_sec: int = 10 * 60  # 10 minutes
+
+    # Compression
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    ws_per_message_deflate: bool = True
 
     # Pagination
     page_size: int = 10
 
+    # Startup and shutdown
+    pool_prewarm_retry_sec: float = 5.0
+    drain_timeout_sec: float = 10.0
+    drain_reconnect_window_sec: float = 5.0
+    shutdown_timeout_sec: float = 10.0
+
+    # Game events emitted to a room within window are merged, `0` merges events of one loop tick
+    ws_emit_coalesce_sec: float | None = 0.01
+
+    # Presence
+    presence_heartbeat_sec: float = 1.0
+    presence_ttl_sec: float = 5.0
+
     # Variables for database
     db_apply_migrations: bool = False
     db_driver: str = "postgresql+asyncpg"
@@ -49,9 +73,19 @@ class Settings(BaseSettings):
     db_rollback: bool = False
     db_expire_on_commit: bool = False
     db_conn_pool_size: int = 10
+    db_conn_pool_min_size: int = 2
+    db_conn_pool_max_overflow: int = 10
+    db_conn_pool_timeout: float = 30
     db_conn_pool_recycle: int = 3600
+    db_conn_pool_pre_ping: bool = False
+    db_statement_cache_size: int = 100
+    db_pgbouncer: bool = False
+    db_stream_batch_size: int = 1000
+    db_replica_urls: list[str] = []
+    db_replica_retry_sec: float = 5.0
 
-    # Variables for redis
+    # Variables for redis, `memory` backend keeps state in process of single worker
+    storage_backend: Literal["redis", "memory"] = "redis"
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
@@ -59,8 +93,22 @@ class Settings(BaseSettings):
     redis_password: str | None = None
     redis_decode_responses: bool = True
     redis_socket_timeout: float | None = None
+    redis_socket_connect_timeout: float | None = None
+    redis_health_check_interval: int = 0
+    redis_min_connections: int = 2
     redis_max_connections: int = 10
+    redis_pool_timeout: float | None = None
+    # Shards of games, JSON list of URLs, keys are routed by consistent hashing of game IDs
+    redis_shard_urls: list[str] = []
+    redis_client_cache_namespaces: list[str] = ["game"]
+    redis_client_cache_max_size: int = 1024
     redis_expiration_sec: int = 7 * 24 * 60 * 60  # 7 days in seconds
+    redis_game_compression_min_size: int | None = 1024
+
+    # Variables for cache
+    cache_expiration_sec: int = 300
+    cache_local_expiration_sec: float = 5
+    cache_local_max_size: int = 1024
 
     @cached_property
     def db_url(self) -> sqlalchemy.URL:
@@ -1,5 +1,11 @@
 UnsetSentinel = object()
 
+# Storage
+READ_ONLY_SESSION_KEY = "read_only"
+REPLICA_SESSION_KEY = "replica"
+AFTER_COMMIT_KEY = "after_commit"
+CACHE_PENDING_KEY = "cache_pending"
+
 # Time
 ONE_DAY_IN_SECONDS = 60 * 60 * 24
 
@@ -9,3 +15,7 @@ MIN_CATEGORIES_IN_LOBBY = 3
 MAX_CATEGORIES_IN_LOBBY = 5
 MIN_NUM_PLAYERS = 2
 MAX_NUM_PLAYERS = 8
+
+# Batch requests
+MAX_CATEGORIES_IN_BATCH = 100
+MAX_IMPORT_ERRORS = 20
@@ -0,0 +1,6 @@
+from enum import StrEnum, auto
+
+
+class TransferFormatEnum(StrEnum):
+    NDJSON = auto()
+    CSV = auto()
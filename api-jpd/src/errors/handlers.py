@@ -5,6 +5,7 @@ from typing import Any, ParamSpec, TypeVar
 
 from fastapi import FastAPI, Request, status
 from fastapi.responses import ORJSONResponse
+from socketio.exceptions import ConnectionRefusedError as SocketConnectionRefusedError
 
 from errors.base import BaseError
 from errors.validation import SQLModelValidationError
@@ -42,13 +43,16 @@ def handle_event_errors(
 
             try:
                 return await func(*args, **kwargs)
+            except SocketConnectionRefusedError:
+                # Sent to client in CONNECT_ERROR packet by Socket.IO server
+                raise
             except BaseError as error:
-                _logger.error(f"Expected error in {func.__name__}: {error.detail}")
+                _logger.error("Expected error in %s: %s", func.__name__, error.detail)
                 if emit_error and self_arg and sid:
                     await self_arg._emit_error(f"Error: {error.detail}", room=sid)
                 return return_value
             except Exception as error:
-                _logger.error(f"Uncaught error in {func.__name__}: {error}", exc_info=True)
+                _logger.error("Uncaught error in %s: %s", func.__name__, error, exc_info=True)
                 if emit_error and self_arg and sid:
                     await self_arg._emit_error("Internal server error", room=sid)
                 return return_value
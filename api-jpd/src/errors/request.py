@@ -16,3 +16,8 @@ class NotFoundError(BaseError):
 class InputValidationError(BaseError):
     detail = "Input validation error"
     status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class ServiceUnavailableError(BaseError):
+    detail = "Service unavailable"
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
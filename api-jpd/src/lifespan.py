@@ -1,9 +1,14 @@
+import asyncio
 import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from configs import settings
+from storages import get_cache_manager, get_db_manager, get_redis_manager
+from websocket.server import game_namespace
+
 _logger = logging.getLogger(__name__)
 
 
@@ -27,15 +32,80 @@ async def run_startup_events(app: FastAPI) -> None:
     """
     Perform startup events.
 
+    Pools are prewarmed in background, application is not ready until they are warm.
+    Background tasks are kept in `app.state.tasks` to be stopped on shutdown.
+
     :param app: application
     :return:
     """
+    app.state.ready = False
+    app.state.tasks = [
+        asyncio.create_task(prewarm_pools(app)),
+        asyncio.create_task(get_cache_manager().listen()),
+        asyncio.create_task(get_redis_manager().track_invalidations()),
+        asyncio.create_task(
+            game_namespace.track_presence(
+                heartbeat_sec=settings.presence_heartbeat_sec,
+                ttl_sec=settings.presence_ttl_sec,
+            ),
+        ),
+    ]
+
+
+async def run_drain_events() -> None:
+    """
+    Hand Socket.IO clients over to other processes before server closes connections.
+
+    :return:
+    """
+    await game_namespace.drain(
+        timeout=settings.drain_timeout_sec,
+        reconnect_window_sec=settings.drain_reconnect_window_sec,
+    )
 
 
 async def run_shutdown_events(app: FastAPI) -> None:
     """
     Perform shutdown events.
 
+    Background tasks are cancelled and awaited, then connection pools are closed,
+    all within `shutdown_timeout_sec`.
+
+    :param app: application
+    :return:
+    """
+    tasks = app.state.tasks
+    for task in tasks:
+        task.cancel()
+    try:
+        async with asyncio.timeout(settings.shutdown_timeout_sec):
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.gather(get_db_manager().close(), get_redis_manager().close())
+    except TimeoutError:
+        _logger.warning(
+            f"Background tasks and connection pools were not closed in "
+            f"{settings.shutdown_timeout_sec} seconds",
+        )
+
+
+async def prewarm_pools(app: FastAPI) -> None:
+    """
+    Open minimal number of connections to database and Redis, retrying until succeeded.
+
     :param app: application
     :return:
     """
+    while True:
+        try:
+            await asyncio.gather(get_db_manager().prewarm(), get_redis_manager().prewarm())
+        except Exception as error:
+            _logger.warning(
+                f"Failed to prewarm connection pools, retrying in "
+                f"{settings.pool_prewarm_retry_sec} seconds",
+                exc_info=error,
+            )
+            await asyncio.sleep(settings.pool_prewarm_retry_sec)
+        else:
+            break
+    app.state.ready = True
+    _logger.info("Connection pools are warm")
@@ -1,18 +1,178 @@
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import signal
+from collections.abc import Sequence
+from multiprocessing.process import BaseProcess
+from types import FrameType
+
 import uvicorn
 
 from configs import override_external_loggers, settings
 from migrations.scripts import run_migrations
+from websocket.sticky import StickyFront
 
-if __name__ == "__main__":
-    override_external_loggers()
+_logger = logging.getLogger(__name__)
 
-    if settings.db_apply_migrations:
-        run_migrations()
+_WORKER_CHECK_INTERVAL_SEC = 1.0
+
+
+class _DrainingServer(uvicorn.Server):
+    """Server draining Socket.IO clients on the first exit signal before shutting down."""
+
+    def __init__(self, config: uvicorn.Config):
+        super().__init__(config)
+        self._drain_task: asyncio.Task | None = None
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        if self._drain_task is not None or self.should_exit:
+            super().handle_exit(sig, frame)
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            super().handle_exit(sig, frame)
+            return
+        loop.call_soon_threadsafe(self._start_drain, sig, frame)
+
+    def _start_drain(self, sig: int, frame: FrameType | None) -> None:
+        self._drain_task = asyncio.create_task(self._drain(sig, frame))
+
+    async def _drain(self, sig: int, frame: FrameType | None) -> None:
+        # Imported lazily like `application`, so worker ID is set before Socket.IO server
+        from lifespan import run_drain_events
 
-    uvicorn.run(
+        try:
+            await run_drain_events()
+        except Exception as error:
+            _logger.error("Failed to drain clients", exc_info=error)
+        super().handle_exit(sig, frame)
+
+
+def run_server() -> None:
+    if settings.reload:
+        uvicorn.run(
+            app="application:socket_app",
+            host=settings.host,
+            port=settings.port,
+            reload=True,
+            log_config=None,
+            ws_per_message_deflate=settings.ws_per_message_deflate,
+        )
+        return
+
+    config = uvicorn.Config(
         app="application:socket_app",
         host=settings.host,
         port=settings.port,
-        reload=settings.reload,
         log_config=None,
+        ws_per_message_deflate=settings.ws_per_message_deflate,
+    )
+    _DrainingServer(config).run()
+
+
+def run_worker(worker_id: int, path: str) -> None:
+    settings.worker_id = worker_id
+    override_external_loggers()
+    config = uvicorn.Config(
+        app="application:socket_app",
+        uds=path,
+        # Only the sticky front connects to worker sockets, it sets client address
+        forwarded_allow_ips="*",
+        log_config=None,
+        ws_per_message_deflate=settings.ws_per_message_deflate,
     )
+    _DrainingServer(config).run()
+
+
+def run_workers() -> None:
+    """
+    Run `workers_count` worker processes behind sticky front, restarting exited ones.
+
+    Workers listen on unix sockets and share state through Redis: cache invalidations
+    and Socket.IO client manager, so events emitted by one worker reach clients of all.
+
+    :return:
+    """
+    paths = [
+        os.path.join(settings.workers_socket_dir, f"jeopardy-{settings.port}-{worker_id}.sock")
+        for worker_id in range(settings.workers_count)
+    ]
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, args=(worker_id, path))
+        for worker_id, path in enumerate(paths)
+    ]
+    for process in processes:
+        process.start()
+    _logger.info(f"Started {len(processes)} workers on {settings.host}:{settings.port}")
+
+    try:
+        with contextlib.suppress(asyncio.CancelledError, KeyboardInterrupt):
+            asyncio.run(_serve_front(paths, processes))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+async def _serve_front(paths: Sequence[str], processes: list[BaseProcess]) -> None:
+    """
+    Serve sticky front until exit signal, then stop workers before closing the front.
+
+    Workers are stopped one at a time, so clients drained by one reconnect to the
+    remaining ones, the front keeps piping messages of draining workers. Clients of the
+    last worker can only be handed off to other hosts.
+
+    :param paths: unix socket paths of workers
+    :param processes: worker processes
+    :return:
+    """
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    sticky_front = StickyFront(paths)
+    async with asyncio.TaskGroup() as group:
+        front = group.create_task(sticky_front.serve(settings.host, settings.port))
+        supervisor = group.create_task(_supervise_workers(paths, processes))
+        await stopping.wait()
+
+        supervisor.cancel()
+        for worker_id, process in enumerate(processes):
+            sticky_front.retire_worker(worker_id)
+            process.terminate()
+            await asyncio.to_thread(process.join)
+        front.cancel()
+
+
+async def _supervise_workers(paths: Sequence[str], processes: list[BaseProcess]) -> None:
+    context = multiprocessing.get_context("spawn")
+    while True:
+        await asyncio.sleep(_WORKER_CHECK_INTERVAL_SEC)
+        for worker_id, process in enumerate(processes):
+            if process.is_alive():
+                continue
+            _logger.warning(f"Worker {worker_id} exited with code {process.exitcode}, restarting")
+            processes[worker_id] = context.Process(
+                target=run_worker,
+                args=(worker_id, paths[worker_id]),
+            )
+            processes[worker_id].start()
+
+
+if __name__ == "__main__":
+    override_external_loggers()
+
+    if settings.db_apply_migrations:
+        run_migrations()
+
+    # State of memory storage backend is not shared, so its server runs in one process
+    if settings.reload or settings.workers_count == 1 or settings.storage_backend == "memory":
+        run_server()
+    else:
+        run_workers()
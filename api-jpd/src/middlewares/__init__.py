@@ -0,0 +1 @@
+from middlewares.compression import CompressionMiddleware
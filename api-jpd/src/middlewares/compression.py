@@ -0,0 +1,154 @@
+import zlib
+from typing import Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+COMPRESSIBLE_MEDIA_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/",
+)
+_NOT_COMPRESSED_STATUSES = {204, 206, 304}
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes, /) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with gzip if accepted by `Accept-Encoding`.
+
+    Responses smaller than `minimum_size`, without body (204, 304), already encoded
+    or of binary media types are sent as is.
+    """
+
+    encodings = ("gzip",)
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def negotiate(self, accept_encoding: str) -> str | None:
+        """
+        Choose supported encoding preferred by client.
+
+        :param accept_encoding: `Accept-Encoding` header value
+        :return: encoding or None if no supported encoding is accepted
+        """
+        accepted = {}
+        for item in accept_encoding.lower().split(","):
+            name, _, params = item.strip().partition(";")
+            quality = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    continue
+            accepted[name.strip()] = quality
+
+        candidates = [
+            encoding
+            for encoding in self.encodings
+            if accepted.get(encoding, accepted.get("*", 0)) > 0
+        ]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda encoding: accepted.get(encoding, accepted.get("*")))
+
+    def create_compressor(self, encoding: str) -> _Compressor:
+        if encoding != "gzip":
+            raise ValueError(f"Unsupported encoding {encoding}")
+        return zlib.compressobj(self.gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self._middleware = middleware
+        self._encoding = encoding
+        self._send = send
+        self._start_message: Message | None = None
+        self._compressor: _Compressor | None = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            self._start_message = message
+            headers = Headers(raw=message["headers"])
+            if not self._is_compressible(message["status"], headers):
+                await self._send_passthrough(message)
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._compressor is None:
+            if not more_body and len(body) < self._middleware.minimum_size:
+                await self._send_passthrough(message)
+                return
+            self._compressor = self._middleware.create_compressor(self._encoding)
+            body = self._compressor.compress(body)
+            if not more_body:
+                body += self._compressor.flush()
+            await self._send_start(content_length=None if more_body else len(body))
+        else:
+            body = self._compressor.compress(body)
+            if not more_body:
+                body += self._compressor.flush()
+
+        if body or not more_body:
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    def _is_compressible(self, status: int, headers: Headers) -> bool:
+        if status < 200 or status in _NOT_COMPRESSED_STATUSES:
+            return False
+        if "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "")
+        return media_type.startswith(COMPRESSIBLE_MEDIA_TYPES)
+
+    async def _send_passthrough(self, message: Message) -> None:
+        self._passthrough = True
+        if message is not self._start_message:
+            MutableHeaders(raw=self._start_message["headers"]).add_vary_header("Accept-Encoding")
+            await self._send(self._start_message)
+        await self._send(message)
+
+    async def _send_start(self, content_length: int | None) -> None:
+        headers = MutableHeaders(raw=self._start_message["headers"])
+        headers["Content-Encoding"] = self._encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        # Encoded representation differs byte-wise, strong tags become weak
+        etag = headers.get("ETag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        await self._send(self._start_message)
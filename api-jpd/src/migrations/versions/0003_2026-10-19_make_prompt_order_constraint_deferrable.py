@@ -0,0 +1,38 @@
+"""
+Make prompt order constraint deferrable.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:02:41.318204
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.drop_constraint("uq_prompt_category_order", "prompt", type_="unique")
+    op.create_unique_constraint(
+        "uq_prompt_category_order",
+        "prompt",
+        ["category_id", "order"],
+        deferrable=True,
+        initially="IMMEDIATE",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_prompt_category_order", "prompt", type_="unique")
+    op.create_unique_constraint(
+        "uq_prompt_category_order",
+        "prompt",
+        ["category_id", "order"],
+    )
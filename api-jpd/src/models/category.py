@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.base import BaseDBModel
@@ -10,6 +10,7 @@ class CategoryModel(BaseDBModel):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(64))
     owner_id: Mapped[int] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"))
+    version: Mapped[int] = mapped_column(server_default=text("1"))
 
     owner: Mapped["UserModel"] = relationship(back_populates="categories")
 
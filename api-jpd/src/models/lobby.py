@@ -17,6 +17,7 @@ class LobbyModel(BaseDBModel):
         TIMESTAMP(timezone=False),
         server_default=text("CURRENT_TIMESTAMP"),
     )
+    version: Mapped[int] = mapped_column(server_default=text("1"))
 
     host: Mapped["UserModel"] = relationship(back_populates="lobbies")
 
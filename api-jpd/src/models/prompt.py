@@ -7,7 +7,15 @@ from models.base import BaseDBModel
 
 class PromptModel(BaseDBModel):
     __tablename__ = "prompt"
-    __table_args__ = (UniqueConstraint("category_id", "order", name="uq_prompt_category_order"),)
+    __table_args__ = (
+        UniqueConstraint(
+            "category_id",
+            "order",
+            name="uq_prompt_category_order",
+            deferrable=True,
+            initially="IMMEDIATE",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     category_id: Mapped[int] = mapped_column(ForeignKey("prompt_category.id", ondelete="CASCADE"))
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Enum, Integer, MetaData, SmallInteger, String, Table
+
+from enums.prompt import PromptTypeEnum
+
+# Temporary tables live outside the main metadata, so migrations never pick them up
+staging_meta = MetaData()
+
+prompt_import_table = Table(
+    "prompt_import",
+    staging_meta,
+    Column("line", Integer, nullable=False),
+    Column("category_key", String(64), nullable=False),
+    Column("category_name", String(64), nullable=False),
+    Column("question", String(256)),
+    Column("question_type", Enum(PromptTypeEnum, name="prompt_type_enum", create_type=False)),
+    Column("answer", String(256)),
+    Column("answer_type", Enum(PromptTypeEnum, name="prompt_type_enum", create_type=False)),
+    Column("order", SmallInteger),
+    Column("score", Integer),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
@@ -1,5 +1,7 @@
 from repositories.category import CategoryRepo
+from repositories.category_transfer import CategoryTransferRepo
 from repositories.game import GameRepo
 from repositories.lobby import LobbyRepo
+from repositories.presence import PresenceRepo
 from repositories.prompt import PromptRepo
 from repositories.user import UserRepo
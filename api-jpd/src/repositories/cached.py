@@ -0,0 +1,207 @@
+import abc
+import contextlib
+import functools
+from collections.abc import Iterable, Sequence
+from typing import Annotated
+
+from fastapi import Depends
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import ColumnElement, Select, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from constants import AFTER_COMMIT_KEY, CACHE_PENDING_KEY, REPLICA_SESSION_KEY
+from models.base import BaseDBModel
+from models.category import CategoryModel
+from models.lobby import LobbyModel
+from models.lobby_category import LobbyCategoryModel
+from repositories.mixins import RelationalRepoMixin
+from storages import CacheManager, get_cache_manager, get_db_session
+
+CATEGORY_CACHE_NAME_SPACE = "category"
+LOBBY_CACHE_NAME_SPACE = "lobby"
+
+_CACHE_NAME_SPACES = {
+    CategoryModel: CATEGORY_CACHE_NAME_SPACE,
+    LobbyModel: LOBBY_CACHE_NAME_SPACE,
+}
+
+# Embedding model, link column of model and link column of embedding model
+_EMBEDDINGS = {
+    CategoryModel: (LobbyModel, LobbyCategoryModel.category_id, LobbyCategoryModel.lobby_id),
+    LobbyModel: (CategoryModel, LobbyCategoryModel.lobby_id, LobbyCategoryModel.category_id),
+}
+
+
+class InvalidatingRepoMixin(RelationalRepoMixin):
+    """
+    Repository mutating categories, lobbies or values embedded by them.
+
+    Categories embed their lobbies and lobbies embed their categories, so mutations
+    touch both sides: bump their versions, used as ETags, and invalidate their cache.
+    Invalidations are applied after commit; until then, the session bypasses cache
+    for invalidated values to read its own writes.
+    """
+
+    def __init__(
+        self,
+        session: Annotated[AsyncSession, Depends(get_db_session)],
+        cache_manager: Annotated[CacheManager, Depends(get_cache_manager)],
+    ):
+        super().__init__(session)
+        self._cache = cache_manager
+
+    async def _touch_categories(self, *category_ids: int) -> None:
+        """
+        Bump versions of categories and lobbies embedding them, and invalidate their cache.
+
+        :param category_ids: category IDs
+        :return:
+        """
+        lobby_ids = select(LobbyCategoryModel.lobby_id).where(
+            LobbyCategoryModel.category_id.in_(category_ids),
+        )
+        await self._touch(CategoryModel, CategoryModel.id.in_(category_ids))
+        await self._touch(LobbyModel, LobbyModel.id.in_(lobby_ids))
+
+    async def _touch_lobbies(self, *lobby_ids: int) -> None:
+        """
+        Bump versions of lobbies and categories embedding them, and invalidate their cache.
+
+        :param lobby_ids: lobby IDs
+        :return:
+        """
+        category_ids = select(LobbyCategoryModel.category_id).where(
+            LobbyCategoryModel.lobby_id.in_(lobby_ids),
+        )
+        await self._touch(LobbyModel, LobbyModel.id.in_(lobby_ids))
+        await self._touch(CategoryModel, CategoryModel.id.in_(category_ids))
+
+    async def _delete_touching(
+        self,
+        model: type[CategoryModel | LobbyModel],
+        whereclause: ColumnElement[bool],
+    ) -> bool:
+        """
+        Delete value and bump versions of values embedding it in one statement.
+
+        Statements of one query see links of deleted value before deletion cascades
+        to them, and embedding values are touched only if value is deleted.
+
+        :param model: model of value
+        :param whereclause: filter of value
+        :return: whether value was deleted
+        """
+        embedding_model, link_column, embedding_link_column = _EMBEDDINGS[model]
+        deleted = delete(model).where(whereclause).returning(model.id).cte("deleted")
+        embedding_ids = select(embedding_link_column).where(link_column.in_(select(deleted.c.id)))
+        touched = (
+            update(embedding_model)
+            .where(embedding_model.id.in_(embedding_ids))
+            .values(version=embedding_model.version + 1)
+            .returning(embedding_model.id)
+            .cte("touched")
+        )
+        stmt = select(deleted.c.id, select(func.array_agg(touched.c.id)).scalar_subquery())
+        row = (await self.execute(stmt)).one_or_none()
+        if row is None:
+            return False
+
+        deleted_id, touched_ids = row
+        self._invalidate(_CACHE_NAME_SPACES[model], [deleted_id])
+        self._invalidate(_CACHE_NAME_SPACES[embedding_model], touched_ids or [])
+        return True
+
+    async def _touch(
+        self,
+        model: type[CategoryModel | LobbyModel],
+        whereclause: ColumnElement[bool],
+    ) -> None:
+        stmt = (
+            update(model).where(whereclause).values(version=model.version + 1).returning(model.id)
+        )
+        self._invalidate(_CACHE_NAME_SPACES[model], await self.scalars(stmt))
+
+    def _invalidate(self, namespace: str, ids: Sequence[int]) -> None:
+        """
+        Invalidate cached values after session is committed.
+
+        :param namespace: cache namespace
+        :param ids: IDs of values
+        :return:
+        """
+        if not ids:
+            return
+
+        pending = self._session.info.setdefault(CACHE_PENDING_KEY, set())
+        pending.update((namespace, value_id) for value_id in ids)
+        callbacks = self._session.info.setdefault(AFTER_COMMIT_KEY, [])
+        callbacks.append(functools.partial(self._cache.invalidate, namespace, list(ids)))
+
+
+class CachedRepoMixin(InvalidatingRepoMixin, abc.ABC):
+    """Repository reading categories or lobbies through cache, see `InvalidatingRepoMixin`."""
+
+    CACHE_NAME_SPACE: str = ""
+    CACHE_MODEL: type[BaseDBModel] | None = None
+    CACHE_DTO: type[BaseModel] | None = None
+
+    async def _select_by_ids(
+        self,
+        ids: Sequence[int],
+        versions: dict[int, int] | None = None,
+    ) -> list[BaseModel]:
+        """
+        Load DTOs from cache, loading and caching missing ones with `_select_json`.
+
+        Cached DTOs of other than expected versions are stale, e.g. cached by a reader
+        racing with invalidation, so they are loaded too and match ETags of versions.
+
+        :param ids: IDs of DTOs
+        :param versions: expected versions by ID
+        :return: found DTOs in the order of IDs
+        """
+        dtos = await self._get_cached(ids)
+        if versions:
+            dtos = {
+                value_id: dto
+                for value_id, dto in dtos.items()
+                if versions.get(value_id, dto.version) == dto.version
+            }
+        missing_ids = [value_id for value_id in ids if value_id not in dtos]
+        if missing_ids:
+            stmt = select(self.CACHE_MODEL).where(self.CACHE_MODEL.id.in_(missing_ids))
+            loaded_dtos = await self._select_json(stmt)
+            await self._set_cached(loaded_dtos)
+            dtos.update((dto.id, dto) for dto in loaded_dtos)
+        return [dtos[value_id] for value_id in ids if value_id in dtos]
+
+    async def select_version(self, value_id: int) -> int | None:
+        stmt = select(self.CACHE_MODEL.version).where(self.CACHE_MODEL.id == value_id)
+        return await self.scalar(stmt)
+
+    @abc.abstractmethod
+    async def _select_json(self, stmt: Select) -> list[BaseModel]:
+        pass
+
+    async def _get_cached(self, ids: Iterable[int]) -> dict[int, BaseModel]:
+        pending = self._session.info.get(CACHE_PENDING_KEY, set())
+        ids = [value_id for value_id in ids if (self.CACHE_NAME_SPACE, value_id) not in pending]
+        values = await self._cache.get_many(self.CACHE_NAME_SPACE, ids)
+        dtos = {}
+        for value_id, value in values.items():
+            # Values cached before DTO changes are reloaded
+            with contextlib.suppress(ValidationError):
+                dtos[value_id] = self.CACHE_DTO.model_validate_json(value)
+        return dtos
+
+    async def _set_cached(self, dtos: Sequence[BaseModel]) -> None:
+        # Replicas may lag behind invalidations, their reads would be cached until expiration
+        if self._session.info.get(REPLICA_SESSION_KEY):
+            return
+        pending = self._session.info.get(CACHE_PENDING_KEY, set())
+        values = {
+            dto.id: dto.model_dump_json()
+            for dto in dtos
+            if (self.CACHE_NAME_SPACE, dto.id) not in pending
+        }
+        await self._cache.set_many(self.CACHE_NAME_SPACE, values)
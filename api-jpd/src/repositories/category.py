@@ -1,17 +1,37 @@
-from sqlalchemy import and_, case, delete, insert, select, update
+from sqlalchemy import Select, and_, case, func, insert, select, update
 from sqlalchemy.orm import selectinload
 
 from configs import settings
+from errors.request import BadRequestError
 from models.category import CategoryModel
+from models.lobby import LobbyModel
+from models.lobby_category import LobbyCategoryModel
 from models.prompt import PromptModel
-from repositories.mixins import RelationalRepoMixin
-from schemas.category.base import BaseCategorySchema, CategoryCreateSchema
+from models.user import UserModel
+from repositories.cached import CATEGORY_CACHE_NAME_SPACE, CachedRepoMixin
+from schemas.base import VersionSchema
+from schemas.category.base import (
+    BaseCategorySchema,
+    CategoryCreateSchema,
+    CategorySummarySchema,
+)
 from schemas.category.nested import CategorySchema, CategoryUpdateSchema
-from utils.validation import validate_model
+from schemas.prompt.base import PromptOrderUpdateSchema
+from schemas.user.base import UserPublicSchema
+from utils.sql import json_array, json_object, json_text
+from utils.validation import validate_json_models, validate_model
 
 
-class CategoryRepo(RelationalRepoMixin):
+class CategoryRepo(CachedRepoMixin):
+    CACHE_NAME_SPACE = CATEGORY_CACHE_NAME_SPACE
+    CACHE_MODEL = CategoryModel
+    CACHE_DTO = CategorySchema
+
     async def select(self, category_id: int) -> CategorySchema | None:
+        cached_categories = await self._get_cached([category_id])
+        if category_id in cached_categories:
+            return cached_categories[category_id]
+
         stmt = (
             select(CategoryModel)
             .where(CategoryModel.id == category_id)
@@ -22,8 +42,20 @@ class CategoryRepo(RelationalRepoMixin):
                 selectinload(CategoryModel.lobby_categories),
             )
         )
-        category = await self.scalar(stmt)
-        return validate_model(category, CategorySchema)
+        category = validate_model(await self.scalar(stmt), CategorySchema)
+        if category is not None:
+            await self._set_cached([category])
+        return category
+
+    async def select_many(
+        self,
+        *category_ids: int,
+        versions: dict[int, int] | None = None,
+    ) -> list[CategorySchema]:
+        if not category_ids:
+            raise BadRequestError("No category IDs have been provided")
+
+        return await self._select_by_ids(category_ids, versions=versions)
 
     async def filter(
         self,
@@ -31,6 +63,18 @@ class CategoryRepo(RelationalRepoMixin):
         name: str | None = None,
         owner_id: int | None = None,
     ) -> list[CategorySchema]:
+        versions = await self.filter_versions(category_ids, name, owner_id)
+        return await self._select_by_ids(
+            [version.id for version in versions],
+            versions={version.id: version.version for version in versions},
+        )
+
+    async def filter_versions(
+        self,
+        category_ids: list[int] | None = None,
+        name: str | None = None,
+        owner_id: int | None = None,
+    ) -> list[VersionSchema]:
         filters = []
         if category_ids:
             filters.append(CategoryModel.id.in_(category_ids))
@@ -39,53 +83,125 @@ class CategoryRepo(RelationalRepoMixin):
         if owner_id is not None:
             filters.append(CategoryModel.owner_id == owner_id)
 
-        stmt = (
-            select(CategoryModel)
-            .options(
-                selectinload(CategoryModel.owner),
-                selectinload(CategoryModel.prompts),
-                selectinload(CategoryModel.lobbies),
-                selectinload(CategoryModel.lobby_categories),
-            )
-            .limit(settings.page_size)
-        )
+        stmt = select(CategoryModel.id, CategoryModel.version)
         if filters:
             stmt = stmt.where(and_(*filters))
-        categories = await self.scalars(stmt)
-        return validate_model(categories, CategorySchema)
+        stmt = stmt.order_by(CategoryModel.id).limit(settings.page_size)
+        result = await self.execute(stmt)
+        return validate_model(result.mappings().all(), VersionSchema)
 
     async def insert(self, category: CategoryCreateSchema) -> BaseCategorySchema:
         stmt = insert(CategoryModel).values(category.model_dump()).returning(CategoryModel)
         created_category = await self.scalar(stmt)
         return validate_model(created_category, BaseCategorySchema)
 
-    async def update(self, category_id: int, category: CategoryUpdateSchema) -> None:
-        if category.name is not None:
-            stmt = (
-                update(CategoryModel)
-                .where(CategoryModel.id == category_id)
-                .values(name=category.name)
-            )
-            await self.execute(stmt)
+    async def select_summary(self, category_id: int) -> CategorySummarySchema | None:
+        stmt = select(*self._summary_columns()).where(CategoryModel.id == category_id)
+        result = await self.execute(stmt)
+        return validate_model(result.mappings().one_or_none(), CategorySummarySchema)
+
+    async def update(
+        self,
+        category_id: int,
+        category: CategoryUpdateSchema,
+        owner_id: int | None = None,
+    ) -> CategorySummarySchema | None:
+        filters = [CategoryModel.id == category_id]
+        if owner_id is not None:
+            filters.append(CategoryModel.owner_id == owner_id)
 
-        if category.prompts is not None:
-            final_mapping = {p.id: p.order for p in category.prompts}
-            temp_mapping = {p_id: -order for p_id, order in final_mapping.items()}
+        name = category.name if category.name is not None else CategoryModel.name
+        stmt = (
+            update(CategoryModel)
+            .where(and_(*filters))
+            .values(name=name)
+            .returning(*self._summary_columns())
+        )
+        result = await self.execute(stmt)
+        updated_category = validate_model(result.mappings().one_or_none(), CategorySummarySchema)
+        if updated_category is not None:
+            await self._touch_categories(category_id)
+        return updated_category
 
-            stmt_temp = (
-                update(PromptModel)
-                .where(PromptModel.id.in_(temp_mapping.keys()))
-                .values(order=case(temp_mapping, value=PromptModel.id))
-            )
-            await self.execute(stmt_temp)
+    async def update_prompt_orders(
+        self,
+        category_id: int,
+        prompts: list[PromptOrderUpdateSchema],
+    ) -> int:
+        order_mapping = {p.id: p.order for p in prompts}
 
-            stmt_final = (
-                update(PromptModel)
-                .where(PromptModel.id.in_(final_mapping.keys()))
-                .values(order=case(final_mapping, value=PromptModel.id))
+        stmt = (
+            update(PromptModel)
+            .where(
+                PromptModel.category_id == category_id,
+                PromptModel.id.in_(order_mapping.keys()),
             )
-            await self.execute(stmt_final)
+            .values(order=case(order_mapping, value=PromptModel.id))
+            .returning(PromptModel.id)
+        )
+        result = await self.execute(stmt)
+        updated_count = len(result.all())
+        if updated_count:
+            await self._touch_categories(category_id)
+        return updated_count
 
-    async def delete(self, category_id: int) -> None:
-        stmt = delete(CategoryModel).where(CategoryModel.id == category_id)
-        await self.execute(stmt)
+    async def delete(self, category_id: int, owner_id: int | None = None) -> bool:
+        filters = [CategoryModel.id == category_id]
+        if owner_id is not None:
+            filters.append(CategoryModel.owner_id == owner_id)
+
+        return await self._delete_touching(CategoryModel, and_(*filters))
+
+    async def _select_json(self, stmt: Select) -> list[CategorySchema]:
+        """
+        Load categories with nested relations as a single JSON document.
+
+        One statement replaces the main query and a query per relation, and rows are
+        validated straight from JSON without building ORM instances.
+
+        :param stmt: select of categories to load
+        :return: categories
+        """
+        page = stmt.subquery("category_page")
+
+        owner = select(
+            json_object(*(UserModel.__table__.c[name] for name in UserPublicSchema.model_fields)),
+        ).where(UserModel.id == page.c.owner_id)
+        prompts = select(
+            json_array(json_object(*PromptModel.__table__.c), PromptModel.order),
+        ).where(PromptModel.category_id == page.c.id)
+        lobbies = (
+            select(json_array(json_object(*LobbyModel.__table__.c)))
+            .join(LobbyCategoryModel, LobbyCategoryModel.lobby_id == LobbyModel.id)
+            .where(LobbyCategoryModel.category_id == page.c.id)
+        )
+        lobby_categories = select(
+            json_array(json_object(*LobbyCategoryModel.__table__.c)),
+        ).where(LobbyCategoryModel.category_id == page.c.id)
+
+        category = json_object(
+            *page.c,
+            owner=owner.scalar_subquery(),
+            prompts=prompts.scalar_subquery(),
+            lobbies=lobbies.scalar_subquery(),
+            lobby_categories=lobby_categories.scalar_subquery(),
+        )
+        json_stmt = select(json_text(json_array(category))).select_from(page)
+        categories = await self.scalar(json_stmt)
+        return validate_json_models(categories, CategorySchema)
+
+    @classmethod
+    def _summary_columns(cls) -> tuple:
+        prompt_count = (
+            select(func.count(PromptModel.id))
+            .where(PromptModel.category_id == CategoryModel.id)
+            .correlate(CategoryModel)
+            .scalar_subquery()
+        )
+        return (
+            CategoryModel.id,
+            CategoryModel.name,
+            CategoryModel.owner_id,
+            CategoryModel.version,
+            prompt_count.label("prompt_count"),
+        )
@@ -0,0 +1,120 @@
+from collections.abc import AsyncIterable, AsyncIterator
+
+from sqlalchemy import func, insert, literal, or_, select
+from sqlalchemy.schema import CreateTable
+
+from configs import settings
+from constants import NUM_PROMPTS_IN_CATEGORY
+from models.category import CategoryModel
+from models.prompt import PromptModel
+from models.staging import prompt_import_table
+from repositories.mixins import RelationalRepoMixin
+from schemas.category.nested import CategoryImportResultSchema, CategoryTransferSchema
+from schemas.prompt.base import PromptCreatePublicSchema
+
+_PROMPT_COLUMNS = ("question", "question_type", "answer", "answer_type", "order", "score")
+
+
+class CategoryTransferRepo(RelationalRepoMixin):
+    async def stream_categories(self, owner_id: int) -> AsyncIterator[CategoryTransferSchema]:
+        stmt = (
+            select(
+                CategoryModel.id,
+                CategoryModel.name,
+                *(getattr(PromptModel, name) for name in _PROMPT_COLUMNS),
+            )
+            .outerjoin(PromptModel, PromptModel.category_id == CategoryModel.id)
+            .where(CategoryModel.owner_id == owner_id)
+            .order_by(CategoryModel.id, PromptModel.order)
+            .execution_options(yield_per=settings.db_stream_batch_size)
+        )
+        result = await self.stream(stmt)
+
+        category, category_id = None, None
+        async for row in result:
+            if row.id != category_id:
+                if category is not None:
+                    yield category
+                category, category_id = CategoryTransferSchema(name=row.name), row.id
+            if row.question is not None:
+                category.prompts.append(
+                    PromptCreatePublicSchema.model_validate(row, from_attributes=True),
+                )
+
+        if category is not None:
+            yield category
+
+    async def stage_prompts(self, records: AsyncIterable[tuple]) -> None:
+        """
+        Create temporary staging table and COPY records into it.
+
+        The table is dropped on commit, so it has to be merged within the same transaction.
+
+        :param records: rows ordered as `prompt_import` table columns
+        :return:
+        """
+        await self.execute(CreateTable(prompt_import_table))
+        await self.copy_records(prompt_import_table, records)
+
+    async def select_invalid_staged_categories(self) -> list[str]:
+        staging = prompt_import_table
+        stmt = (
+            select(staging.c.category_key)
+            .where(staging.c.question.is_not(None))
+            .group_by(staging.c.category_key)
+            .having(
+                or_(
+                    func.count() > NUM_PROMPTS_IN_CATEGORY,
+                    func.count(staging.c.order.distinct()) < func.count(),
+                ),
+            )
+            .order_by(func.min(staging.c.line))
+        )
+        return list(await self.scalars(stmt))
+
+    async def merge_staged(self, owner_id: int) -> CategoryImportResultSchema:
+        staging = prompt_import_table
+
+        category_keys = (
+            select(
+                staging.c.category_key,
+                func.min(staging.c.category_name).label("name"),
+                func.nextval(func.pg_get_serial_sequence(CategoryModel.__tablename__, "id")).label(
+                    "id",
+                ),
+            )
+            .group_by(staging.c.category_key)
+            .cte("category_keys")
+        )
+        new_categories = (
+            insert(CategoryModel)
+            .from_select(
+                ["id", "name", "owner_id"],
+                select(category_keys.c.id, category_keys.c.name, literal(owner_id)),
+            )
+            .returning(CategoryModel.id)
+            .cte("new_categories")
+        )
+        new_prompts = (
+            insert(PromptModel)
+            .from_select(
+                ["category_id", *_PROMPT_COLUMNS],
+                select(category_keys.c.id, *(staging.c[name] for name in _PROMPT_COLUMNS))
+                .join(category_keys, category_keys.c.category_key == staging.c.category_key)
+                .where(staging.c.question.is_not(None)),
+            )
+            .returning(PromptModel.id)
+            .cte("new_prompts")
+        )
+
+        stmt = select(
+            select(func.count())
+            .select_from(new_categories)
+            .scalar_subquery()
+            .label(
+                "categories_count",
+            ),
+            select(func.count()).select_from(new_prompts).scalar_subquery().label("prompts_count"),
+        )
+        result = await self.execute(stmt)
+        return CategoryImportResultSchema.model_validate(result.mappings().one())
@@ -1,13 +1,66 @@
+from collections.abc import Callable
+
+from configs import settings
 from repositories.mixins import RedisRepoMixin
 from schemas.game import GameSchema
+from utils.game_codec import decode_game, encode_game
 
 
 class GameRepo(RedisRepoMixin):
+    """
+    Games in compact blobs of `encode_game`, read as bytes without decoding responses.
+
+    Games stored as JSON by previous versions are read until they are written again.
+    """
+
     NAME_SPACE = "game"
+    SHARD_KEY = "game_id"
 
     async def get_game(self, game_id: int) -> GameSchema | None:
-        game = await self.get(name="game", game_id=game_id)
-        return GameSchema.model_validate_json(game) if game else None
+        game = await self.get(name="game", decode=False, game_id=game_id)
+        return decode_game(game) if game else None
 
     async def set_game(self, game: GameSchema) -> None:
-        await self.set(name="game", value=game.model_dump_json(), game_id=game.id)
+        await self.set(name="game", value=self._encode(game), game_id=game.id)
+
+    async def get_games(self, *game_ids: int) -> list[GameSchema]:
+        keys = [self._create_key(name="game", game_id=game_id) for game_id in game_ids]
+        games = await self.get_many(*keys, decode=False)
+        return [decode_game(game) for game in games if game]
+
+    async def set_games(self, games: list[GameSchema]) -> None:
+        await self.set_many(
+            {self._create_key(name="game", game_id=game.id): self._encode(game) for game in games},
+        )
+
+    async def update_games(
+        self,
+        *game_ids: int,
+        update: Callable[[GameSchema], None],
+    ) -> list[GameSchema]:
+        """
+        Update existing games in place by `update`, atomically per shard.
+
+        :param game_ids: game IDs
+        :param update: function updating game, called again if game is written meanwhile
+        :return: updated games
+        """
+        games = {}
+
+        def update_blobs(blobs: dict[str, bytes | None]) -> dict[str, bytes]:
+            encoded = {}
+            for key, blob in blobs.items():
+                if blob:
+                    game = decode_game(blob)
+                    update(game)
+                    games[game.id] = game
+                    encoded[key] = self._encode(game)
+            return encoded
+
+        keys = [self._create_key(name="game", game_id=game_id) for game_id in game_ids]
+        await self.update_many(*keys, update=update_blobs, decode=False)
+        return [games[game_id] for game_id in game_ids if game_id in games]
+
+    @classmethod
+    def _encode(cls, game: GameSchema) -> bytes:
+        return encode_game(game, compression_min_size=settings.redis_game_compression_min_size)
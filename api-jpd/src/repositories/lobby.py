@@ -1,33 +1,63 @@
-from sqlalchemy import and_, delete, desc, insert, select, update
-from sqlalchemy.orm import selectinload
+from sqlalchemy import (
+    Integer,
+    Select,
+    and_,
+    column,
+    desc,
+    insert,
+    select,
+    update,
+    values,
+)
 
 from configs import settings
 from enums.lobby import LobbyStateEnum
 from models.category import CategoryModel
 from models.lobby import LobbyModel
 from models.lobby_category import LobbyCategoryModel
-from repositories.mixins import RelationalRepoMixin
-from schemas.lobby.base import LobbyCreateSchema, LobbySearchSchema
+from models.prompt import PromptModel
+from models.user import UserModel
+from repositories.cached import (
+    CATEGORY_CACHE_NAME_SPACE,
+    LOBBY_CACHE_NAME_SPACE,
+    CachedRepoMixin,
+)
+from schemas.base import VersionSchema
+from schemas.lobby.base import BaseLobbySchema, LobbyCreateSchema, LobbySearchSchema
 from schemas.lobby.nested import LobbySchema
-from schemas.lobby_category.base import BaseLobbyCategorySchema
-from utils.validation import validate_model
-
-
-class LobbyRepo(RelationalRepoMixin):
-    async def select(self, lobby_id: int) -> LobbySchema:
-        stmt = (
-            select(LobbyModel)
-            .where(LobbyModel.id == lobby_id)
-            .options(
-                selectinload(LobbyModel.host),
-                selectinload(LobbyModel.lobby_categories),
-                selectinload(LobbyModel.categories).options(selectinload(CategoryModel.prompts)),
-            )
-        )
-        lobby = await self.scalar(stmt)
-        return validate_model(lobby, LobbySchema)
+from schemas.user.base import UserPublicSchema
+from utils.sql import json_array, json_object, json_text
+from utils.validation import validate_json_models, validate_model
+
+
+class LobbyRepo(CachedRepoMixin):
+    CACHE_NAME_SPACE = LOBBY_CACHE_NAME_SPACE
+    CACHE_MODEL = LobbyModel
+    CACHE_DTO = LobbySchema
+
+    async def select(self, lobby_id: int) -> LobbySchema | None:
+        lobbies = await self._select_by_ids([lobby_id])
+        return lobbies[0] if lobbies else None
+
+    async def select_base(self, lobby_id: int) -> BaseLobbySchema | None:
+        lobby = await self.scalar(select(LobbyModel).where(LobbyModel.id == lobby_id))
+        return validate_model(lobby, BaseLobbySchema)
+
+    async def select_many(
+        self,
+        *lobby_ids: int,
+        versions: dict[int, int] | None = None,
+    ) -> list[LobbySchema]:
+        return await self._select_by_ids(lobby_ids, versions=versions)
 
     async def filter(self, search: LobbySearchSchema) -> list[LobbySchema]:
+        versions = await self.filter_versions(search)
+        return await self._select_by_ids(
+            [version.id for version in versions],
+            versions={version.id: version.version for version in versions},
+        )
+
+    async def filter_versions(self, search: LobbySearchSchema) -> list[VersionSchema]:
         filters = []
         if search.host_id is not None:
             filters.append(LobbyModel.host_id == search.host_id)
@@ -36,38 +66,128 @@ class LobbyRepo(RelationalRepoMixin):
         if search.created_at is not None:
             filters.append(LobbyModel.created_at >= search.created_at)
 
-        stmt = select(LobbyModel).options(
-            selectinload(LobbyModel.host),
-            selectinload(LobbyModel.lobby_categories),
-            selectinload(LobbyModel.categories).options(selectinload(CategoryModel.prompts)),
-        )
+        stmt = select(LobbyModel.id, LobbyModel.version)
         if filters:
             stmt = stmt.where(and_(*filters))
-        stmt = stmt.order_by(desc(LobbyModel.created_at)).limit(settings.page_size)
-        lobbies = await self.scalars(stmt)
-        return validate_model(lobbies, LobbySchema)
+        stmt = stmt.order_by(desc(LobbyModel.created_at), desc(LobbyModel.id)).limit(
+            settings.page_size,
+        )
+        result = await self.execute(stmt)
+        return validate_model(result.mappings().all(), VersionSchema)
 
-    async def insert(self, lobby: LobbyCreateSchema) -> LobbySchema:
-        stmt = (
+    async def insert(self, lobby: LobbyCreateSchema) -> BaseLobbySchema:
+        lobby_cte = (
             insert(LobbyModel)
             .values(lobby.model_dump(exclude={"category_ids"}))
-            .returning(LobbyModel.id)
+            .returning(
+                LobbyModel.id,
+                LobbyModel.host_id,
+                LobbyModel.state,
+                LobbyModel.created_at,
+                LobbyModel.version,
+            )
+            .cte("new_lobby")
+        )
+        category_ids = values(column("category_id", Integer), name="category_ids").data(
+            [(category_id,) for category_id in lobby.category_ids],
         )
-        lobby_id = await self.scalar(stmt)
-        await self.execute(
-            insert(LobbyCategoryModel),
-            [
-                BaseLobbyCategorySchema(category_id=cid, lobby_id=lobby_id).model_dump()
-                for cid in lobby.category_ids
-            ],
+        lobby_category_cte = (
+            insert(LobbyCategoryModel)
+            .from_select(
+                ["lobby_id", "category_id"],
+                select(lobby_cte.c.id, category_ids.c.category_id),
+            )
+            .returning(LobbyCategoryModel.category_id)
+            .cte("new_lobby_categories")
         )
-        return await self.select(lobby_id)
+        # Categories embed their lobbies, so linked ones are touched in the same statement
+        category_cte = (
+            update(CategoryModel)
+            .where(CategoryModel.id.in_(select(lobby_category_cte.c.category_id)))
+            .values(version=CategoryModel.version + 1)
+            .returning(CategoryModel.id)
+            .cte("touched_categories")
+        )
+
+        stmt = select(lobby_cte).add_cte(lobby_category_cte, category_cte)
+        result = await self.execute(stmt)
+        self._invalidate(CATEGORY_CACHE_NAME_SPACE, lobby.category_ids)
+        return validate_model(result.mappings().one(), BaseLobbySchema)
+
+    async def update(
+        self,
+        lobby_id: int,
+        state: LobbyStateEnum,
+        *,
+        host_id: int | None = None,
+        expected_state: LobbyStateEnum | None = None,
+    ) -> LobbySchema | None:
+        """
+        Change lobby state in a single statement.
+
+        Filtering by `expected_state` makes the transition atomic: concurrent transitions out
+        of the same state cannot both succeed.
+
+        :param lobby_id: lobby ID
+        :param state: new lobby state
+        :param host_id: required lobby host
+        :param expected_state: required current lobby state
+        :return: updated lobby or None if no lobby matched the filters
+        """
+        filters = [LobbyModel.id == lobby_id]
+        if host_id is not None:
+            filters.append(LobbyModel.host_id == host_id)
+        if expected_state is not None:
+            filters.append(LobbyModel.state == expected_state)
+
+        stmt = update(LobbyModel).where(and_(*filters)).values(state=state).returning(LobbyModel.id)
+        updated_lobby_id = await self.scalar(stmt)
+        if updated_lobby_id is None:
+            return None
+        await self._touch_lobbies(updated_lobby_id)
+        return await self.select(updated_lobby_id)
+
+    async def delete(self, lobby_id: int, host_id: int | None = None) -> bool:
+        filters = [LobbyModel.id == lobby_id]
+        if host_id is not None:
+            filters.append(LobbyModel.host_id == host_id)
 
-    async def update(self, lobby_id: int, state: LobbyStateEnum) -> LobbySchema:
-        stmt = update(LobbyModel).where(LobbyModel.id == lobby_id).values(state=state)
-        await self.scalar(stmt)
-        return await self.select(lobby_id)
+        return await self._delete_touching(LobbyModel, and_(*filters))
 
-    async def delete(self, lobby_id: int) -> None:
-        stmt = delete(LobbyModel).where(LobbyModel.id == lobby_id)
-        await self.execute(stmt)
+    async def _select_json(self, stmt: Select) -> list[LobbySchema]:
+        """
+        Load lobbies with nested relations as a single JSON document.
+
+        :param stmt: select of lobbies to load
+        :return: lobbies in the order of the select
+        """
+        page = stmt.subquery("lobby_page")
+
+        host = select(
+            json_object(*(UserModel.__table__.c[name] for name in UserPublicSchema.model_fields)),
+        ).where(UserModel.id == page.c.host_id)
+        prompts = select(
+            json_array(json_object(*PromptModel.__table__.c), PromptModel.order),
+        ).where(PromptModel.category_id == CategoryModel.id)
+        categories = (
+            select(
+                json_array(
+                    json_object(*CategoryModel.__table__.c, prompts=prompts.scalar_subquery()),
+                ),
+            )
+            .join(LobbyCategoryModel, LobbyCategoryModel.category_id == CategoryModel.id)
+            .where(LobbyCategoryModel.lobby_id == page.c.id)
+        )
+        lobby_categories = select(
+            json_array(json_object(*LobbyCategoryModel.__table__.c)),
+        ).where(LobbyCategoryModel.lobby_id == page.c.id)
+
+        lobby = json_object(
+            *page.c,
+            host=host.scalar_subquery(),
+            categories=categories.scalar_subquery(),
+            lobby_categories=lobby_categories.scalar_subquery(),
+        )
+        json_stmt = select(json_text(json_array(lobby, desc(page.c.created_at)))).select_from(page)
+        lobbies = await self.scalar(json_stmt)
+        return validate_json_models(lobbies, LobbySchema)
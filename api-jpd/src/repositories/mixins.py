@@ -1,17 +1,29 @@
+import asyncio
 import logging
-from collections.abc import Sequence
+from collections import defaultdict
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, contextmanager
 from datetime import timedelta
 from typing import Annotated, Any
 
+import asyncpg
 import redis.asyncio as redis
 from fastapi import Depends
-from sqlalchemy import Executable
+from redis.asyncio.client import NEVER_DECODE, Pipeline
+from sqlalchemy import Executable, Table
 from sqlalchemy.engine.interfaces import _CoreAnyExecuteParams
 from sqlalchemy.exc import DatabaseError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 
 from configs import settings
-from constants import UnsetSentinel
+from constants import READ_ONLY_SESSION_KEY, UnsetSentinel
 from errors.storage import COMMON_DB_ERRORS, DBError, RedisBaseError
 from storages import RedisManager, get_db_session, get_redis_manager
 
@@ -32,9 +44,11 @@ class RelationalRepoMixin:
         params: _CoreAnyExecuteParams | None = None,
     ) -> Any:
         try:
-            return await self._session.execute(query, params=params)
+            result = await self._session.execute(query, params=params)
         except COMMON_DB_ERRORS as error:
             return self._handle_error(error, str(error))
+        await self._release_read_only()
+        return result
 
     async def scalar(
         self,
@@ -42,9 +56,11 @@ class RelationalRepoMixin:
         params: _CoreAnyExecuteParams | None = None,
     ) -> Any:
         try:
-            return await self._session.scalar(query, params=params)
+            result = await self._session.scalar(query, params=params)
         except COMMON_DB_ERRORS as error:
             return self._handle_error(error, str(query))
+        await self._release_read_only()
+        return result
 
     async def scalars(
         self,
@@ -55,22 +71,72 @@ class RelationalRepoMixin:
             result = await self._session.scalars(query, params=params)
         except COMMON_DB_ERRORS as error:
             return self._handle_error(error, str(query))
+        await self._release_read_only()
         return result.all()
 
+    async def stream(
+        self,
+        query: Executable,
+        params: _CoreAnyExecuteParams | None = None,
+    ) -> AsyncResult:
+        try:
+            return await self._session.stream(query, params=params)
+        except COMMON_DB_ERRORS as error:
+            return self._handle_error(error, str(query))
+
+    async def copy_records(
+        self,
+        table: Table,
+        records: AsyncIterable[tuple],
+    ) -> None:
+        connection = await self._session.connection()
+        raw_connection = await connection.get_raw_connection()
+        try:
+            await raw_connection.driver_connection.copy_records_to_table(
+                table.name,
+                records=records,
+                columns=list(table.columns.keys()),
+            )
+        except asyncpg.PostgresError as error:
+            self._handle_error(error, f"COPY {table.name}")
+
+    async def _release_read_only(self) -> None:
+        """
+        End transaction of read-only session to return connection to pool.
+
+        Reads are buffered, so connection is not held until session is closed.
+        Streams are not released, they hold connection until consumed.
+
+        :return:
+        """
+        if self._session.info.get(READ_ONLY_SESSION_KEY):
+            await self._session.commit()
+
     @classmethod
     def _handle_error(
         cls,
-        error: DatabaseError,
+        error: DatabaseError | asyncpg.PostgresError,
         statement: str,
     ) -> Any:
         _logger.error(
-            f"Database error, statement: {statement},\ntype: {type(error)},\nmessage: {error}",
+            "Database error, statement: %s,\ntype: %s,\nmessage: %s",
+            statement,
+            type(error),
+            error,
         )
         raise DBError(f"Database error: {error}")
 
 
 class RedisRepoMixin:
+    """
+    Redis repository of keys in `NAME_SPACE`.
+
+    With `SHARD_KEY`, keys are routed to shards of Redis manager by value of keyword
+    `SHARD_KEY` in keys, so keys of one e.g. game stay in one shard.
+    """
+
     NAME_SPACE: str = ""
+    SHARD_KEY: str | None = None
     EXPIRATION: timedelta = timedelta(seconds=settings.redis_expiration_sec)
 
     def __init__(
@@ -79,10 +145,15 @@ class RedisRepoMixin:
     ):
         self._manger = redis_manager
 
-    async def get(self, name: str, **kwargs) -> Any:
+    async def get(self, name: str, decode: bool = True, **kwargs) -> Any:
         key = self._create_key(name, **kwargs)
-        async with self._manger.client() as client:
+        manager = self._get_manager(key)
+        if manager.get_client_cache(self.NAME_SPACE):
+            return (await self.get_many(key, decode=decode))[0]
+        async with manager.client() as client:
             try:
+                if not decode:
+                    return await client.execute_command("GET", key, **{NEVER_DECODE: True})
                 return await client.get(key)
             except redis.RedisError as error:
                 return self._handle_error(key, error=error)
@@ -96,19 +167,264 @@ class RedisRepoMixin:
     ) -> bool:
         key = self._create_key(name, **kwargs)
         expire = self.EXPIRATION if expire is UnsetSentinel else expire
-        async with self._manger.client() as client:
+        async with self._get_manager(key).client() as client:
+            with self._write_cached({key: value}):
+                try:
+                    return await client.set(key, value, ex=expire)
+                except redis.RedisError as error:
+                    return self._handle_error(key, error=error)
+
+    async def get_many(self, *keys: str, decode: bool = True) -> list[Any]:
+        """
+        Get values of keys in one command per shard, missing values are `None`.
+
+        :param keys: keys, see `_create_key`
+        :param decode: whether to decode responses
+        :return: values in order of keys
+        """
+        groups = self._group_keys(keys)
+        if len(groups) == 1:
+            [(manager, keys)] = groups.items()
+            return await self._get_cached_many(manager, keys, decode=decode)
+
+        results = await asyncio.gather(
+            *(
+                self._get_cached_many(manager, group_keys, decode=decode)
+                for manager, group_keys in groups.items()
+            ),
+        )
+        values = {}
+        for group_keys, group_values in zip(groups.values(), results, strict=True):
+            values.update(zip(group_keys, group_values, strict=True))
+        return [values[key] for key in keys]
+
+    async def _get_cached_many(
+        self,
+        manager: RedisManager,
+        keys: Sequence[str],
+        decode: bool,
+    ) -> list[Any]:
+        # Values of client-side cached namespaces are read from Redis only if not cached
+        cache = manager.get_client_cache(self.NAME_SPACE)
+        if cache is None:
+            return await self._get_many(manager, keys, decode=decode)
+
+        found, epoch = cache.get_many(keys, decode=decode)
+        missing_keys = [key for key in keys if key not in found]
+        if missing_keys:
+            missing_values = await self._get_many(manager, missing_keys, decode=decode)
+            values = dict(zip(missing_keys, missing_values, strict=True))
+            cache.set_many(values, decode=decode, epoch=epoch)
+            found.update(values)
+        return [found[key] for key in keys]
+
+    async def _get_many(
+        self,
+        manager: RedisManager,
+        keys: Sequence[str],
+        decode: bool,
+    ) -> list[Any]:
+        if not keys:
+            return []
+        async with manager.client() as client:
             try:
-                return await client.set(key, value, ex=expire)
+                if not decode:
+                    return await client.execute_command("MGET", *keys, **{NEVER_DECODE: True})
+                return await client.mget(keys)
             except redis.RedisError as error:
-                return self._handle_error(key, error=error)
+                return self._handle_error(*keys, error=error)
+
+    async def set_many(
+        self,
+        values: dict[str, Any],
+        expire: int | timedelta | type(UnsetSentinel) | None = UnsetSentinel,
+    ) -> None:
+        """
+        Set values of keys in one pipeline per shard.
+
+        :param values: values by key, see `_create_key`
+        :param expire: expiration, `EXPIRATION` by default
+        :return:
+        """
+        if not values:
+            return
+        expire = self.EXPIRATION if expire is UnsetSentinel else expire
+        with self._write_cached(values):
+            await asyncio.gather(
+                *(
+                    self._set_many({key: values[key] for key in keys}, expire=expire)
+                    for keys in self._group_keys(values).values()
+                ),
+            )
+
+    async def _set_many(
+        self,
+        values: dict[str, Any],
+        expire: int | timedelta | None,
+    ) -> None:
+        async with self.pipeline(*values) as pipe:
+            for key, value in values.items():
+                pipe.set(key, value, ex=expire)
+            await pipe.execute()
+
+    async def update_many(
+        self,
+        *keys: str,
+        update: Callable[[dict[str, Any]], dict[str, Any]],
+        decode: bool = True,
+        expire: int | timedelta | type(UnsetSentinel) | None = UnsetSentinel,
+    ) -> dict[str, Any]:
+        """
+        Read values of keys and set values returned by `update`, atomically per shard.
+
+        Keys are watched, so if others write them between read and set, they are read
+        and updated again.
+
+        :param keys: keys, see `_create_key`
+        :param update: function of current values by key, missing values are `None`,
+            returning values to set by key
+        :param decode: whether to decode responses
+        :param expire: expiration, `EXPIRATION` by default
+        :return: set values by key
+        """
+        expire = self.EXPIRATION if expire is UnsetSentinel else expire
+        results = await asyncio.gather(
+            *(
+                self._update_many(group_keys, update=update, decode=decode, expire=expire)
+                for group_keys in self._group_keys(keys).values()
+            ),
+        )
+        return {key: value for values in results for key, value in values.items()}
+
+    async def _update_many(
+        self,
+        keys: Sequence[str],
+        update: Callable[[dict[str, Any]], dict[str, Any]],
+        decode: bool,
+        expire: int | timedelta | None,
+    ) -> dict[str, Any]:
+        async with self.transaction(*keys) as pipe:
+            while True:
+                await pipe.watch(*keys)
+                if decode:
+                    current = await pipe.mget(keys)
+                else:
+                    current = await pipe.execute_command("MGET", *keys, **{NEVER_DECODE: True})
+                values = update(dict(zip(keys, current, strict=True)))
+                pipe.multi()
+                for key, value in values.items():
+                    pipe.set(key, value, ex=expire)
+                try:
+                    with self._write_cached(values):
+                        await pipe.execute()
+                except redis.WatchError:
+                    continue
+                return values
 
     async def delete(self, name: str, **kwargs) -> int:
         key = self._create_key(name, **kwargs)
-        async with self._manger.client() as client:
+        async with self._get_manager(key).client() as client:
             try:
-                return await client.delete(key)
+                deleted = await client.delete(key)
             except redis.RedisError as error:
                 return self._handle_error(key, error=error)
+        self._evict_cached(key)
+        return deleted
+
+    async def delete_many(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        deleted = await asyncio.gather(
+            *(
+                self._delete_many(manager, group_keys)
+                for manager, group_keys in self._group_keys(keys).items()
+            ),
+        )
+        self._evict_cached(*keys)
+        return sum(deleted)
+
+    async def _delete_many(self, manager: RedisManager, keys: Sequence[str]) -> int:
+        async with manager.client() as client:
+            try:
+                return await client.delete(*keys)
+            except redis.RedisError as error:
+                return self._handle_error(*keys, error=error)
+
+    @asynccontextmanager
+    async def pipeline(self, *keys: str, transaction: bool = False) -> AsyncIterator[Pipeline]:
+        """
+        Buffer commands to send them in one round trip on `execute`.
+
+        Redis errors raised within context are handled like errors of single commands.
+
+        :param keys: keys of buffered commands, to route them to shard and for error logs
+        :param transaction: whether to wrap commands in MULTI/EXEC
+        :yield: pipeline
+        """
+        groups = self._group_keys(keys)
+        if len(groups) > 1:
+            raise RedisBaseError(f"Redis pipeline keys are in different shards: {keys}")
+        manager = next(iter(groups), self._manger)
+        async with (
+            manager.client() as client,
+            client.pipeline(transaction=transaction) as pipe,
+        ):
+            try:
+                yield pipe
+            except redis.RedisError as error:
+                self._handle_error(*keys, error=error)
+
+    def transaction(self, *keys: str) -> AbstractAsyncContextManager[Pipeline]:
+        """
+        Buffer commands to execute them atomically in one round trip, see `pipeline`.
+
+        :param keys: keys of buffered commands, in one shard
+        :return: context manager of pipeline
+        """
+        return self.pipeline(*keys, transaction=True)
+
+    def _get_manager(self, key: str) -> RedisManager:
+        if self.SHARD_KEY is None or not self._manger.shards:
+            return self._manger
+        prefix = f"{self.SHARD_KEY}="
+        for part in key.split(":")[2:]:
+            if part.startswith(prefix):
+                return self._manger.get_shard(part.removeprefix(prefix))
+        return self._manger
+
+    def _group_keys(self, keys: Iterable[str]) -> dict[RedisManager, list[str]]:
+        groups = defaultdict(list)
+        for key in keys:
+            groups[self._get_manager(key)].append(key)
+        return groups
+
+    @contextmanager
+    def _write_cached(self, values: dict[str, Any]) -> Iterator[None]:
+        """
+        Store values written within context in client-side caches, evict them on errors.
+
+        :param values: written values by key
+        :yield:
+        """
+        writes = []
+        for manager, keys in self._group_keys(values).items():
+            cache = manager.get_client_cache(self.NAME_SPACE)
+            if cache:
+                writes.append((cache, keys, cache.begin_write()))
+        try:
+            yield
+        except BaseException:
+            for cache, keys, _ in writes:
+                cache.evict(keys)
+            raise
+        for cache, keys, epoch in writes:
+            cache.write({key: values[key] for key in keys}, epoch=epoch)
+
+    def _evict_cached(self, *keys: str) -> None:
+        for manager, group_keys in self._group_keys(keys).items():
+            cache = manager.get_client_cache(self.NAME_SPACE)
+            if cache:
+                cache.evict(group_keys)
 
     @classmethod
     def _create_key(cls, name: str, **kwargs) -> str:
@@ -121,6 +437,9 @@ class RedisRepoMixin:
     @classmethod
     def _handle_error(cls, *keys: str, error: redis.RedisError) -> Any:
         _logger.error(
-            f"Redis error for keys={keys}, type={type(error)}, message={error}",
+            "Redis error for keys=%s, type=%s, message=%s",
+            keys,
+            type(error),
+            error,
         )
         raise RedisBaseError(f"Redis error: {error}")
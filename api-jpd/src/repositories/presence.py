@@ -0,0 +1,113 @@
+from collections import defaultdict
+
+import redis.asyncio as redis
+
+from repositories.mixins import RedisRepoMixin
+from schemas.game import GameSessionShema
+from schemas.presence import PresenceSchema
+
+
+class PresenceRepo(RedisRepoMixin):
+    """
+    Heartbeats of nodes in a sorted set scored by time of the last heartbeat, and
+    sockets of each node in a sorted set of the node.
+
+    Sockets are swept only together with their node once it stops sending heartbeats,
+    so sockets of live nodes are not swept by other nodes. Members encode node, socket
+    and game session, so expired sockets are handled without reading anything else.
+    """
+
+    NAME_SPACE = "presence"
+
+    async def touch(self, node_id: str, *presences: PresenceSchema, at: float) -> bool:
+        """
+        Send heartbeat of node and add its sockets in one transaction.
+
+        :param node_id: node ID
+        :param presences: sockets of node
+        :param at: timestamp
+        :return: whether node was not registered, i.e. is new or was swept
+        """
+        nodes_key, sockets_key = self._create_key("nodes"), self._create_sockets_key(node_id)
+        async with self.transaction(nodes_key, sockets_key) as pipe:
+            pipe.zadd(nodes_key, {node_id: at})
+            if presences:
+                pipe.zadd(sockets_key, {self._create_member(p): at for p in presences})
+            is_added, *_ = await pipe.execute()
+        return bool(is_added)
+
+    async def remove(self, *presences: PresenceSchema) -> None:
+        if not presences:
+            return
+        members = defaultdict(list)
+        for presence in presences:
+            members[self._create_sockets_key(presence.node_id)].append(
+                self._create_member(presence),
+            )
+        async with self.pipeline(*members) as pipe:
+            for key, node_members in members.items():
+                pipe.zrem(key, *node_members)
+            await pipe.execute()
+
+    async def pop_expired(self, node_id: str, before: float) -> list[PresenceSchema]:
+        """
+        Get and remove other nodes without heartbeats since `before` with their sockets.
+
+        Nodes are popped in one transaction, retried if heartbeats are sent meanwhile.
+
+        :param node_id: ID of this node, it is never popped
+        :param before: timestamp
+        :return: sockets of expired nodes, each is popped by one node only
+        """
+        key = self._create_key("nodes")
+        async with self.transaction(key) as pipe:
+            while True:
+                await pipe.watch(key)
+                expired_nodes = [
+                    node
+                    for node in map(self._decode, await pipe.zrangebyscore(key, "-inf", before))
+                    if node != node_id
+                ]
+                if not expired_nodes:
+                    return []
+                pipe.multi()
+                pipe.zrem(key, *expired_nodes)
+                for node in expired_nodes:
+                    sockets_key = self._create_sockets_key(node)
+                    pipe.zrangebyscore(sockets_key, "-inf", "+inf")
+                    pipe.delete(sockets_key)
+                try:
+                    _, *results = await pipe.execute()
+                except redis.WatchError:
+                    continue
+                break
+        return [self._parse_member(member) for members in results[::2] for member in members]
+
+    @classmethod
+    def _create_sockets_key(cls, node_id: str) -> str:
+        return cls._create_key("sockets", node_id=node_id)
+
+    @classmethod
+    def _create_member(cls, presence: PresenceSchema) -> str:
+        session = presence.session
+        return (
+            f"{presence.node_id}:{presence.sid}:"
+            f"{session.game_id}:{session.player_id}:{int(session.is_lead)}"
+        )
+
+    @classmethod
+    def _parse_member(cls, member: str | bytes) -> PresenceSchema:
+        node_id, sid, game_id, player_id, is_lead = cls._decode(member).split(":")
+        return PresenceSchema(
+            node_id=node_id,
+            sid=sid,
+            session=GameSessionShema(
+                game_id=int(game_id),
+                player_id=int(player_id),
+                is_lead=is_lead == "1",
+            ),
+        )
+
+    @classmethod
+    def _decode(cls, value: str | bytes) -> str:
+        return value.decode() if isinstance(value, bytes) else value
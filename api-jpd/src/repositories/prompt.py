@@ -1,14 +1,33 @@
-from sqlalchemy import and_, delete, insert, select, update
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+    values,
+)
 from sqlalchemy.orm import selectinload
 
+from constants import NUM_PROMPTS_IN_CATEGORY
+from models.category import CategoryModel
 from models.prompt import PromptModel
-from repositories.mixins import RelationalRepoMixin
-from schemas.prompt.base import BasePromptSchema, PromptCreateSchema, PromptUpdateSchema
+from repositories.cached import InvalidatingRepoMixin
+from schemas.prompt.base import (
+    BasePromptSchema,
+    PromptCreatePublicSchema,
+    PromptCreateSchema,
+    PromptUpdateSchema,
+)
 from schemas.prompt.nested import PromptSchema
 from utils.validation import validate_model
 
 
-class PromptRepo(RelationalRepoMixin):
+class PromptRepo(InvalidatingRepoMixin):
     async def select(self, prompt_id: int, category_id: int | None = None) -> PromptSchema | None:
         stmt = select(PromptModel).options(selectinload(PromptModel.category))
 
@@ -21,21 +40,136 @@ class PromptRepo(RelationalRepoMixin):
         prompt = await self.scalar(stmt)
         return validate_model(prompt, PromptSchema)
 
-    async def insert(self, prompt: PromptCreateSchema) -> BasePromptSchema:
-        stmt = insert(PromptModel).values(prompt.model_dump()).returning(PromptModel)
+    async def insert(
+        self,
+        prompt: PromptCreateSchema,
+        owner_id: int | None = None,
+    ) -> BasePromptSchema | None:
+        values = prompt.model_dump()
+        prompt_columns = PromptModel.__table__.c
+
+        await self._lock_category(prompt.category_id)
+        prompt_count = (
+            select(func.count(PromptModel.id))
+            .where(PromptModel.category_id == prompt.category_id)
+            .scalar_subquery()
+        )
+        order_taken = select(PromptModel.id).where(
+            PromptModel.category_id == prompt.category_id,
+            PromptModel.order == prompt.order,
+        )
+        filters = [prompt_count < NUM_PROMPTS_IN_CATEGORY, ~order_taken.exists()]
+        if owner_id is not None:
+            filters.append(self._owned_category_ids(owner_id, prompt.category_id).exists())
+
+        source = select(
+            *(literal(value, prompt_columns[name].type) for name, value in values.items()),
+        ).where(and_(*filters))
+        stmt = insert(PromptModel).from_select(list(values), source).returning(PromptModel)
         created_prompt = await self.scalar(stmt)
+        if created_prompt is not None:
+            await self._touch_categories(prompt.category_id)
         return validate_model(created_prompt, BasePromptSchema)
 
-    async def update(self, prompt_id: int, prompt: PromptUpdateSchema) -> BasePromptSchema:
+    async def replace(
+        self,
+        category_id: int,
+        prompts: list[PromptCreatePublicSchema],
+        owner_id: int | None = None,
+    ) -> list[BasePromptSchema]:
+        await self._lock_category(category_id)
+        category_filter = [PromptModel.category_id == category_id]
+        if owner_id is not None:
+            category_filter.append(
+                PromptModel.category_id.in_(self._owned_category_ids(owner_id, category_id)),
+            )
+        await self.execute(delete(PromptModel).where(and_(*category_filter)))
+
+        prompt_columns = PromptModel.__table__.c
+        names = [*PromptCreatePublicSchema.model_fields, "category_id"]
+        rows = values(
+            *(column(name, prompt_columns[name].type) for name in names),
+            name="new_prompts",
+        ).data([(*prompt.model_dump().values(), category_id) for prompt in prompts])
+
+        source = select(rows)
+        if owner_id is not None:
+            source = source.where(self._owned_category_ids(owner_id, category_id).exists())
+        stmt = insert(PromptModel).from_select(names, source).returning(PromptModel)
+        created_prompts = await self.scalars(stmt)
+        await self._touch_categories(category_id)
+        return validate_model(
+            sorted(created_prompts, key=lambda prompt: prompt.order),
+            BasePromptSchema,
+        )
+
+    async def _lock_category(self, category_id: int) -> None:
+        """
+        Lock category row until the end of transaction, serializing writes of its prompts.
+
+        Lock is taken by a statement of its own, as subqueries of the locking statement
+        would not see prompts committed by the transaction that held it.
+
+        :param category_id: category ID
+        :return:
+        """
+        stmt = select(CategoryModel.id).where(CategoryModel.id == category_id).with_for_update()
+        await self.execute(stmt)
+
+    async def update(
+        self,
+        prompt_id: int,
+        prompt: PromptUpdateSchema,
+        category_id: int | None = None,
+        owner_id: int | None = None,
+    ) -> BasePromptSchema | None:
         stmt = (
             update(PromptModel)
             .values(prompt.model_dump(exclude_unset=True, exclude_none=True))
-            .where(PromptModel.id == prompt_id)
+            .where(self._scope_filter(prompt_id, category_id, owner_id))
             .returning(PromptModel)
         )
         updated_prompt = await self.scalar(stmt)
+        if updated_prompt is not None:
+            await self._touch_categories(updated_prompt.category_id)
         return validate_model(updated_prompt, BasePromptSchema)
 
-    async def delete(self, prompt_id: int) -> None:
-        stmt = delete(PromptModel).where(PromptModel.id == prompt_id)
-        await self.execute(stmt)
+    async def delete(
+        self,
+        prompt_id: int,
+        category_id: int | None = None,
+        owner_id: int | None = None,
+    ) -> bool:
+        stmt = (
+            delete(PromptModel)
+            .where(self._scope_filter(prompt_id, category_id, owner_id))
+            .returning(PromptModel.category_id)
+        )
+        deleted_category_id = await self.scalar(stmt)
+        if deleted_category_id is None:
+            return False
+        await self._touch_categories(deleted_category_id)
+        return True
+
+    @classmethod
+    def _scope_filter(
+        cls,
+        prompt_id: int,
+        category_id: int | None,
+        owner_id: int | None,
+    ) -> ColumnElement[bool]:
+        filters = [PromptModel.id == prompt_id]
+        if category_id is not None:
+            filters.append(PromptModel.category_id == category_id)
+        if owner_id is not None:
+            filters.append(
+                PromptModel.category_id.in_(cls._owned_category_ids(owner_id, category_id)),
+            )
+        return and_(*filters)
+
+    @classmethod
+    def _owned_category_ids(cls, owner_id: int, category_id: int | None = None) -> Select:
+        stmt = select(CategoryModel.id).where(CategoryModel.owner_id == owner_id)
+        if category_id is not None:
+            stmt = stmt.where(CategoryModel.id == category_id)
+        return stmt
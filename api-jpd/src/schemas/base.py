@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Annotated, Any, Self
 
-from pydantic import AfterValidator, ValidationInfo, model_validator
+from pydantic import AfterValidator, BaseModel, ValidationInfo, model_validator
 
 from errors.request import InputValidationError
 
@@ -15,6 +15,11 @@ def _remove_time_zone(value: datetime) -> datetime:
 NoTZDateTime = Annotated[datetime, AfterValidator(_remove_time_zone)]
 
 
+class VersionSchema(BaseModel):
+    id: int
+    version: int
+
+
 class OneFieldSetMixin:
     @model_validator(mode="after")
     def check_search_fields_set(self) -> Self:
@@ -27,3 +32,10 @@ def supplied_value_is_not_none(value: Any, info: ValidationInfo) -> Any:
     if value is None:
         raise ValueError(f"Field {info.field_name} cannot be None.")
     return value
+
+
+def check_unique_orders(values: list[Any]) -> list[Any]:
+    orders = [value.order for value in values]
+    if len(orders) != len(set(orders)):
+        raise ValueError("Prompt orders must be unique.")
+    return values
@@ -7,6 +7,11 @@ class BaseCategorySchema(BaseModel):
     id: int
     name: str
     owner_id: int
+    version: int
+
+
+class CategorySummarySchema(BaseCategorySchema):
+    prompt_count: int
 
 
 class CategoryCreatePublicSchema(BaseModel):
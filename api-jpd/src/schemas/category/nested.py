@@ -1,16 +1,21 @@
 from pydantic import BaseModel, Field, ValidationInfo, computed_field, field_validator
 
 from constants import NUM_PROMPTS_IN_CATEGORY
-from schemas.base import OneFieldSetMixin, supplied_value_is_not_none
+from schemas.base import OneFieldSetMixin, check_unique_orders, supplied_value_is_not_none
 from schemas.category.base import BaseCategorySchema
 from schemas.lobby.base import BaseLobbySchema
 from schemas.lobby_category.base import BaseLobbyCategorySchema
-from schemas.prompt.base import BasePromptSchema, PromptInGameSchema, PromptOrderUpdateSchema
-from schemas.user.base import BaseUserSchema
+from schemas.prompt.base import (
+    BasePromptSchema,
+    PromptCreatePublicSchema,
+    PromptInGameSchema,
+    PromptOrderUpdateSchema,
+)
+from schemas.user.base import UserPublicSchema
 
 
 class CategorySchema(BaseCategorySchema):
-    owner: BaseUserSchema
+    owner: UserPublicSchema
     prompts: list[BasePromptSchema]
     lobbies: list[BaseLobbySchema]
     lobby_categories: list[BaseLobbyCategorySchema]
@@ -27,6 +32,11 @@ class CategorySchema(BaseCategorySchema):
         )
 
 
+class CategoryBatchSchema(BaseModel):
+    categories: list[CategorySchema]
+    missing_ids: list[int]
+
+
 class CategoryWithPromptsSchema(BaseCategorySchema):
     prompts: list[BasePromptSchema]
 
@@ -81,6 +91,27 @@ class CategoryUpdateSchema(BaseModel, OneFieldSetMixin):
         return prompts
 
 
+class CategoryTransferSchema(BaseModel):
+    name: str = Field(min_length=3, max_length=64)
+    prompts: list[PromptCreatePublicSchema] = Field(
+        default_factory=list,
+        max_length=NUM_PROMPTS_IN_CATEGORY,
+    )
+
+    @field_validator("prompts")
+    @classmethod
+    def validate_prompt_orders(
+        cls,
+        prompts: list[PromptCreatePublicSchema],
+    ) -> list[PromptCreatePublicSchema]:
+        return check_unique_orders(prompts)
+
+
+class CategoryImportResultSchema(BaseModel):
+    categories_count: int
+    prompts_count: int
+
+
 class CategoryInGameSchema(BaseModel):
     id: int
     name: str
@@ -0,0 +1,10 @@
+from schemas.game import GameEventSchema, GamePayloadSchema
+
+
+class GameBatchPayloadSchema(GamePayloadSchema):
+    events: list[str]
+
+
+class GameBatchEvent(GameEventSchema):
+    name: str = "game.batch"
+    payload: GameBatchPayloadSchema
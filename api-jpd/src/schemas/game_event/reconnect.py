@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+from schemas.game import GameEventSchema
+
+
+class GameReconnectPayloadSchema(BaseModel):
+    delay_ms: int
+
+
+class GameReconnectEvent(GameEventSchema):
+    name: str = "game.reconnect"
+    payload: GameReconnectPayloadSchema
+
+
+class GameResumePayloadSchema(BaseModel):
+    resume_token: str
+
+
+class GameResumeEvent(GameEventSchema):
+    name: str = "game.resume"
+    payload: GameResumePayloadSchema
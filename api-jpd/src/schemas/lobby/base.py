@@ -10,6 +10,7 @@ class BaseLobbySchema(BaseModel):
     host_id: int
     state: LobbyStateEnum
     created_at: NoTZDateTime
+    version: int
 
 
 class LobbyCreatePublicSchema(BaseModel):
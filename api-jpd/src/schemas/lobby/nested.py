@@ -1,11 +1,11 @@
 from schemas.category.nested import CategoryWithPromptsSchema
 from schemas.lobby.base import BaseLobbySchema
 from schemas.lobby_category.base import BaseLobbyCategorySchema
-from schemas.user.base import BaseUserSchema
+from schemas.user.base import UserPublicSchema
 
 
 class LobbySchema(BaseLobbySchema):
-    host: BaseUserSchema
+    host: UserPublicSchema
     categories: list[CategoryWithPromptsSchema]
     lobby_categories: list[BaseLobbyCategorySchema]
 
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, ConfigDict
+
+from schemas.game import GameSessionShema
+
+
+class PresenceSchema(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    node_id: str
+    sid: str
+    session: GameSessionShema
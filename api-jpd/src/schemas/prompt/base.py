@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field, ValidationInfo, field_validator
+from typing import Any, Self
+
+from pydantic import BaseModel, Field, ValidationInfo, field_validator, model_validator
 
 from constants import NUM_PROMPTS_IN_CATEGORY
 from enums.prompt import PromptStateEnum, PromptTypeEnum
-from schemas.base import OneFieldSetMixin, supplied_value_is_not_none
+from schemas.base import OneFieldSetMixin, check_unique_orders, supplied_value_is_not_none
 
 
 class BasePromptSchema(BaseModel):
@@ -17,9 +19,9 @@ class BasePromptSchema(BaseModel):
 
 
 class PromptCreatePublicSchema(BaseModel):
-    question: str
+    question: str = Field(max_length=256)
     question_type: PromptTypeEnum
-    answer: str
+    answer: str = Field(max_length=256)
     answer_type: PromptTypeEnum
     order: int = Field(ge=1, le=NUM_PROMPTS_IN_CATEGORY)
     score: int
@@ -29,10 +31,51 @@ class PromptCreateSchema(PromptCreatePublicSchema):
     category_id: int
 
 
+class PromptBulkCreatePublicSchema(BaseModel):
+    prompts: list[PromptCreatePublicSchema] = Field(
+        min_length=1,
+        max_length=NUM_PROMPTS_IN_CATEGORY,
+    )
+
+    @field_validator("prompts")
+    @classmethod
+    def validate_prompt_orders(
+        cls,
+        prompts: list[PromptCreatePublicSchema],
+    ) -> list[PromptCreatePublicSchema]:
+        return check_unique_orders(prompts)
+
+
+class PromptTransferRowSchema(BaseModel):
+    category_name: str = Field(min_length=3, max_length=64)
+    question: str | None = Field(default=None, max_length=256)
+    question_type: PromptTypeEnum | None = None
+    answer: str | None = Field(default=None, max_length=256)
+    answer_type: PromptTypeEnum | None = None
+    order: int | None = Field(default=None, ge=1, le=NUM_PROMPTS_IN_CATEGORY)
+    score: int | None = None
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def empty_str_to_none(cls, value: Any) -> Any:
+        return None if value == "" else value
+
+    @model_validator(mode="after")
+    def check_prompt_is_complete(self) -> Self:
+        prompt_values = self.model_dump(exclude={"category_name"}).values()
+        if any(v is not None for v in prompt_values) and any(v is None for v in prompt_values):
+            raise ValueError("Prompt fields must be either all set or all empty.")
+        return self
+
+    @property
+    def has_prompt(self) -> bool:
+        return self.question is not None
+
+
 class PromptUpdateSchema(BaseModel, OneFieldSetMixin):
-    question: str | None = None
+    question: str | None = Field(default=None, max_length=256)
     question_type: PromptTypeEnum | None = None
-    answer: str | None = None
+    answer: str | None = Field(default=None, max_length=256)
     answer_type: PromptTypeEnum | None = None
     score: int | None = None
 
@@ -1,6 +1,6 @@
 from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 
 IsolationLevelType = Literal[
     "SERIALIZABLE",
@@ -18,7 +18,14 @@ class DBConnectionSchema(BaseModel):
     expire_on_commit: bool = False
     rollback: bool = False
     conn_pool_size: int = 10
+    conn_pool_min_size: int = 0
+    conn_pool_max_overflow: int = 10
+    conn_pool_timeout: float = 30
     conn_pool_recycle: int = 3600
+    conn_pool_pre_ping: bool = False
+    statement_cache_size: int = 100
+    pgbouncer: bool = False
+    replica_retry_sec: float = 5.0
 
 
 class RedisConnectionSchema(BaseModel):
@@ -28,4 +35,48 @@ class RedisConnectionSchema(BaseModel):
     password: str | None = None
     decode_responses: bool = True
     socket_timeout: float | None = None
+    socket_connect_timeout: float | None = None
+    health_check_interval: int = 0
+    min_connections: int = 0
     max_connections: int = 10
+    pool_timeout: float | None = None
+    client_cache_namespaces: list[str] = []
+    client_cache_max_size: int = 1024
+    client_cache_reconnect_sec: float = 5
+
+
+class CacheConfigSchema(BaseModel):
+    expiration_sec: int = 300
+    local_expiration_sec: float = 5
+    local_max_size: int = 1024
+    channel: str = "cache:invalidate"
+    reconnect_sec: float = 5
+
+
+class PoolStatsSchema(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int = 0
+    wait_time_sec: float | None = None
+    max_wait_time_sec: float | None = None
+
+
+class CacheStatsSchema(BaseModel):
+    local_hits: int = 0
+    remote_hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+class ClientCacheStatsSchema(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @computed_field
+    @property
+    def hit_ratio(self) -> float | None:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
@@ -3,10 +3,13 @@ from pydantic import BaseModel, Field
 from schemas.base import NoTZDateTime
 
 
-class BaseUserSchema(BaseModel):
+class UserPublicSchema(BaseModel):
     id: int
     username: str
     created_at: NoTZDateTime
+
+
+class BaseUserSchema(UserPublicSchema):
     password: str = Field(exclude=True)
 
 
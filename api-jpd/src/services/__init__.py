@@ -1,5 +1,7 @@
 from services.category import CategoryService
+from services.category_transfer import CategoryTransferService
 from services.game import GameService
 from services.lobby import LobbyService
+from services.presence import PresenceService
 from services.prompt import PromptService
 from services.user import UserService
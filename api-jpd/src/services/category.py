@@ -1,18 +1,25 @@
 import re
-from typing import Annotated
+from typing import Annotated, NoReturn
 
 from fastapi.params import Depends
 
+from constants import MAX_CATEGORIES_IN_BATCH
 from errors.auth import ForbiddenError
 from errors.request import BadRequestError, NotFoundError
 from repositories import CategoryRepo
+from schemas.base import VersionSchema
 from schemas.category.base import (
     BaseCategorySchema,
     CategoryCreatePublicSchema,
     CategoryCreateSchema,
     CategorySearchSchema,
+    CategorySummarySchema,
+)
+from schemas.category.nested import (
+    CategoryBatchSchema,
+    CategorySchema,
+    CategoryUpdateSchema,
 )
-from schemas.category.nested import CategorySchema, CategoryUpdateSchema
 from schemas.prompt.base import PromptOrderUpdateSchema
 
 
@@ -26,26 +33,62 @@ class CategoryService:
             raise NotFoundError(f"Category {category_id} not found")
         return category
 
+    async def get_category_version(self, category_id: int) -> VersionSchema:
+        version = await self._category_repo.select_version(category_id)
+        if version is None:
+            raise NotFoundError(f"Category {category_id} not found")
+        return VersionSchema(id=category_id, version=version)
+
+    async def get_categories(self, category_ids: list[int]) -> CategoryBatchSchema:
+        unique_category_ids = list(dict.fromkeys(category_ids))
+        if len(unique_category_ids) > MAX_CATEGORIES_IN_BATCH:
+            raise BadRequestError(
+                f"Cannot fetch more than {MAX_CATEGORIES_IN_BATCH} categories at once",
+            )
+
+        categories = await self._category_repo.select_many(*unique_category_ids)
+        category_map = {category.id: category for category in categories}
+
+        return CategoryBatchSchema(
+            categories=[category_map[cid] for cid in unique_category_ids if cid in category_map],
+            missing_ids=[cid for cid in unique_category_ids if cid not in category_map],
+        )
+
     async def search_categories(
         self,
         category_ids: list[int] | None = None,
         search: CategorySearchSchema | None = None,
+        versions: list[VersionSchema] | None = None,
     ) -> list[CategorySchema]:
+        if versions is None:
+            versions = await self.search_category_versions(category_ids, search)
+        if not versions:
+            return []
+
+        categories = await self._category_repo.select_many(
+            *(version.id for version in versions),
+            versions={version.id: version.version for version in versions},
+        )
+        return (
+            [category for category in categories if category.is_valid is search.is_valid]
+            if search and search.is_valid is not None
+            else categories
+        )
+
+    async def search_category_versions(
+        self,
+        category_ids: list[int] | None = None,
+        search: CategorySearchSchema | None = None,
+    ) -> list[VersionSchema]:
         if search and search.name is not None:
             search.name = self._clean_search_term(search.name)
 
-        categories = await self._category_repo.filter(
+        return await self._category_repo.filter_versions(
             category_ids=category_ids,
             name=search.name if search else None,
             owner_id=search.owner_id if search else None,
         )
 
-        return (
-            [category for category in categories if category.is_valid is search.is_valid]
-            if search and search.is_valid is not None
-            else categories
-        )
-
     async def create_category(
         self,
         category: CategoryCreatePublicSchema,
@@ -60,47 +103,50 @@ class CategoryService:
         category: CategoryUpdateSchema,
         user_id: int,
     ) -> CategorySchema:
-        existing_cat = await self._check_permissions(user_id=user_id, category_id=category_id)
+        updated_category = await self._category_repo.update(
+            category_id,
+            category,
+            owner_id=user_id,
+        )
+        if updated_category is None:
+            await self._raise_mutation_error(user_id=user_id, category_id=category_id)
 
         if category.prompts is not None:
-            self._check_prompt_order_update(existing_cat, category.prompts)
+            await self._update_prompt_order(updated_category, category.prompts)
 
-        await self._category_repo.update(category_id, category)
         return await self.get_category(category_id)
 
     async def delete_category(self, category_id: int, user_id: int) -> None:
-        await self._check_permissions(user_id=user_id, category_id=category_id)
-        await self._category_repo.delete(category_id)
+        is_deleted = await self._category_repo.delete(category_id, owner_id=user_id)
+        if not is_deleted:
+            await self._raise_mutation_error(user_id=user_id, category_id=category_id)
 
-    async def _check_permissions(self, user_id: int, category_id: int) -> CategorySchema:
-        category = await self.get_category(category_id)
+    async def check_permissions(self, user_id: int, category_id: int) -> CategorySummarySchema:
+        category = await self._category_repo.select_summary(category_id)
+        if not category:
+            raise NotFoundError(f"Category {category_id} not found")
         if category.owner_id != user_id:
             raise ForbiddenError(f"Category {category_id} is not owned by user {user_id}")
         return category
 
-    @classmethod
-    def _check_prompt_order_update(
-        cls,
-        category: CategorySchema,
+    async def _raise_mutation_error(self, user_id: int, category_id: int) -> NoReturn:
+        await self.check_permissions(user_id=user_id, category_id=category_id)
+        raise NotFoundError(f"Category {category_id} not found")
+
+    async def _update_prompt_order(
+        self,
+        category: CategorySummarySchema,
         new_prompts: list[PromptOrderUpdateSchema],
     ) -> None:
-        existing_prompt_ids = {p.id for p in category.prompts}
-        new_prompt_ids = {p.id for p in new_prompts}
-
-        if existing_prompt_ids != new_prompt_ids:
-            missing = existing_prompt_ids - new_prompt_ids
-            extra = new_prompt_ids - existing_prompt_ids
-
-            if missing:
-                raise BadRequestError(f"Missing prompts in update: {sorted(missing)}")
-            if extra:
-                raise BadRequestError(f"Unknown prompts in update: {sorted(extra)}")
-
-        if len(existing_prompt_ids) != len(new_prompt_ids):
+        if category.prompt_count != len(new_prompts):
             raise BadRequestError(
                 "Updating prompt order must include all prompts from the category",
             )
 
+        updated_count = await self._category_repo.update_prompt_orders(category.id, new_prompts)
+        if updated_count != len(new_prompts):
+            raise BadRequestError(f"Unknown prompts in update of category {category.id}")
+
     @classmethod
     def _clean_search_term(cls, term: str) -> str:
         clean = term.strip()
@@ -0,0 +1,147 @@
+import csv
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from io import StringIO
+from typing import Annotated
+
+import pydantic
+from fastapi import Depends
+
+from constants import MAX_IMPORT_ERRORS
+from enums.transfer import TransferFormatEnum
+from errors.request import BadRequestError
+from repositories import CategoryTransferRepo
+from schemas.category.nested import CategoryImportResultSchema, CategoryTransferSchema
+from schemas.prompt.base import PromptTransferRowSchema
+from utils.streaming import iter_csv_rows, iter_lines
+
+TRANSFER_MEDIA_TYPES = {
+    TransferFormatEnum.NDJSON: "application/x-ndjson",
+    TransferFormatEnum.CSV: "text/csv",
+}
+CSV_COLUMNS = tuple(PromptTransferRowSchema.model_fields)
+
+
+class CategoryTransferService:
+    def __init__(self, category_transfer_repo: Annotated[CategoryTransferRepo, Depends()]):
+        self._category_transfer_repo = category_transfer_repo
+
+    async def import_categories(
+        self,
+        chunks: AsyncIterable[bytes],
+        transfer_format: TransferFormatEnum,
+        user_id: int,
+    ) -> CategoryImportResultSchema:
+        errors: list[str] = []
+        parser = (
+            self._parse_csv if transfer_format is TransferFormatEnum.CSV else self._parse_ndjson
+        )
+        await self._category_transfer_repo.stage_prompts(parser(chunks, errors))
+
+        if errors:
+            raise BadRequestError(f"Invalid import data: {'; '.join(errors[:MAX_IMPORT_ERRORS])}")
+
+        invalid_keys = await self._category_transfer_repo.select_invalid_staged_categories()
+        if invalid_keys:
+            raise BadRequestError(
+                f"Categories with duplicate prompt orders or too many prompts: {invalid_keys}",
+            )
+
+        return await self._category_transfer_repo.merge_staged(owner_id=user_id)
+
+    async def export_categories(
+        self,
+        transfer_format: TransferFormatEnum,
+        user_id: int,
+    ) -> AsyncIterator[bytes]:
+        if transfer_format is TransferFormatEnum.CSV:
+            yield self._to_csv_line(CSV_COLUMNS)
+
+        async for category in self._category_transfer_repo.stream_categories(owner_id=user_id):
+            if transfer_format is TransferFormatEnum.NDJSON:
+                yield category.model_dump_json().encode() + b"\n"
+                continue
+
+            rows = [
+                PromptTransferRowSchema(category_name=category.name, **prompt.model_dump())
+                for prompt in category.prompts
+            ] or [PromptTransferRowSchema(category_name=category.name)]
+            yield b"".join(self._to_csv_line(row.model_dump(mode="json").values()) for row in rows)
+
+    @classmethod
+    async def _parse_ndjson(
+        cls,
+        chunks: AsyncIterable[bytes],
+        errors: list[str],
+    ) -> AsyncIterator[tuple]:
+        async for line_number, line in iter_lines(chunks):
+            try:
+                category = CategoryTransferSchema.model_validate_json(line)
+            except pydantic.ValidationError as error:
+                errors.append(f"line {line_number}: {cls._format_error(error)}")
+                continue
+
+            rows = [
+                PromptTransferRowSchema(category_name=category.name, **prompt.model_dump())
+                for prompt in category.prompts
+            ] or [PromptTransferRowSchema(category_name=category.name)]
+            for row in rows:
+                yield cls._to_record(line_number, str(line_number), row)
+
+    @classmethod
+    async def _parse_csv(
+        cls,
+        chunks: AsyncIterable[bytes],
+        errors: list[str],
+    ) -> AsyncIterator[tuple]:
+        columns = None
+        try:
+            async for line_number, values in iter_csv_rows(chunks):
+                if columns is None:
+                    columns = values
+                    if set(columns) != set(CSV_COLUMNS):
+                        errors.append(
+                            f"line {line_number}: header must contain {list(CSV_COLUMNS)}",
+                        )
+                        return
+                    continue
+
+                try:
+                    row_data = dict(zip(columns, values, strict=True))
+                    row = PromptTransferRowSchema.model_validate(row_data)
+                except ValueError as error:
+                    errors.append(f"line {line_number}: {cls._format_error(error)}")
+                    continue
+
+                yield cls._to_record(line_number, row.category_name, row)
+        except csv.Error as error:
+            errors.append(str(error))
+
+    @classmethod
+    def _to_record(cls, line_number: int, category_key: str, row: PromptTransferRowSchema) -> tuple:
+        return (
+            line_number,
+            category_key,
+            row.category_name,
+            row.question,
+            row.question_type.name if row.question_type else None,
+            row.answer,
+            row.answer_type.name if row.answer_type else None,
+            row.order,
+            row.score,
+        )
+
+    @classmethod
+    def _to_csv_line(cls, values: Iterable) -> bytes:
+        buffer = StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(
+            ["" if value is None else value for value in values],
+        )
+        return buffer.getvalue().encode()
+
+    @classmethod
+    def _format_error(cls, error: ValueError) -> str:
+        if isinstance(error, pydantic.ValidationError):
+            return ", ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in error.errors()
+            )
+        return str(error)
@@ -1,8 +1,8 @@
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from repositories import GameRepo, UserRepo
-from services import UserService
+from repositories import GameRepo, PresenceRepo, UserRepo
+from services import PresenceService, UserService
 from services.game import GameService
 from storages import get_db_manager, get_redis_manager
 
@@ -21,3 +21,8 @@ async def get_game_service() -> AsyncGenerator[GameService, None]:
             game_repo=GameRepo(redis_manager=get_redis_manager()),
             user_service=user_service,
         )
+
+
+@asynccontextmanager
+async def get_presence_service() -> AsyncGenerator[PresenceService, None]:
+    yield PresenceService(presence_repo=PresenceRepo(redis_manager=get_redis_manager()))
@@ -1,15 +1,18 @@
+from collections import defaultdict
+from collections.abc import Iterable
 from typing import Annotated
 
 from fastapi import Depends
 
 from constants import UnsetSentinel
 from enums.game import GameStateEnum
-from enums.player import PlayerStateEnum
+from enums.player import LeadStateEnum, PlayerStateEnum
 from enums.prompt import PromptStateEnum
+from errors.auth import ForbiddenError
 from errors.request import BadRequestError, NotFoundError
 from repositories import GameRepo
 from schemas.category.nested import CategoryInGameSchema
-from schemas.game import GameSchema, GameUpdateSchema
+from schemas.game import GameSchema, GameSessionShema, GameUpdateSchema
 from schemas.lobby.nested import LobbySchema
 from schemas.player import LeadSchema, PlayerSchema
 from services.user import UserService
@@ -61,6 +64,61 @@ class GameService:
         await self._game_repo.set_game(game)
         return updated_game
 
+    async def reconnect_player(self, session: GameSessionShema) -> GameSchema:
+        """
+        Mark lead or player of resumed session connected.
+
+        The game is updated atomically, so concurrent reconnects of the same session
+        cannot both succeed.
+
+        :param session: game session restored from resume token
+        :return: updated game
+        """
+
+        def reconnect(game: GameSchema) -> None:
+            if session.is_lead:
+                if game.lead.id != session.player_id:
+                    raise ForbiddenError(f"User {session.player_id} is not lead of game {game.id}")
+                if game.lead.state is LeadStateEnum.CONNECTED:
+                    raise ForbiddenError(f"Lead {game.lead.id} is already connected")
+                game.lead.state = LeadStateEnum.CONNECTED
+            else:
+                player = game.player_map.get(session.player_id)
+                if player is None:
+                    raise ForbiddenError(f"Player {session.player_id} is not in game {game.id}")
+                if player.state is PlayerStateEnum.CONNECTED:
+                    raise ForbiddenError(f"Player {player.id} is already connected")
+                if player.state is PlayerStateEnum.BANNED:
+                    raise ForbiddenError(f"Player {player.id} is banned")
+                player.state = PlayerStateEnum.CONNECTED
+
+        games = await self._game_repo.update_games(session.game_id, update=reconnect)
+        if not games:
+            raise NotFoundError(f"Game with ID {session.game_id} not found")
+        return games[0]
+
+    async def disconnect_players(self, sessions: Iterable[GameSessionShema]) -> list[GameSchema]:
+        """
+        Mark leads and players of sessions disconnected, updating games in bulk.
+
+        Games are updated atomically, so concurrent updates of the games are not lost.
+
+        :param sessions: game sessions of departing clients
+        :return: updated games
+        """
+        sessions_by_game = defaultdict(list)
+        for session in sessions:
+            sessions_by_game[session.game_id].append(session)
+
+        def disconnect(game: GameSchema) -> None:
+            for session in sessions_by_game[game.id]:
+                if session.is_lead:
+                    game.lead.state = LeadStateEnum.DISCONNECTED
+                elif session.player_id in game.player_map:
+                    game.player_map[session.player_id].state = PlayerStateEnum.DISCONNECTED
+
+        return await self._game_repo.update_games(*sessions_by_game, update=disconnect)
+
     async def _add_new_players(
         self,
         game_update: GameUpdateSchema,
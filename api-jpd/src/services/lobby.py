@@ -1,4 +1,4 @@
-from typing import Annotated
+from typing import Annotated, NoReturn
 
 from fastapi import Depends, Request
 
@@ -6,7 +6,7 @@ from enums.lobby import LobbyStateEnum
 from errors.auth import ForbiddenError
 from errors.request import BadRequestError, NotFoundError
 from repositories import LobbyRepo
-from schemas.category.base import CategorySearchSchema
+from schemas.base import VersionSchema
 from schemas.lobby.base import (
     BaseLobbySchema,
     LobbyCreatePublicSchema,
@@ -38,20 +38,36 @@ class LobbyService:
             raise NotFoundError(f"Lobby {lobby_id} not found")
         return lobby
 
-    async def search_lobbies(self, search: LobbySearchSchema) -> list[LobbySchema]:
-        return await self._lobby_repo.filter(search)
+    async def get_lobby_version(self, lobby_id: int) -> VersionSchema:
+        version = await self._lobby_repo.select_version(lobby_id)
+        if version is None:
+            raise NotFoundError(f"Lobby {lobby_id} not found")
+        return VersionSchema(id=lobby_id, version=version)
 
-    async def create_lobby(self, lobby: LobbyCreatePublicSchema, user_id: int) -> BaseLobbySchema:
-        categories = await self._category_service.search_categories(
-            category_ids=lobby.category_ids,
-            search=CategorySearchSchema(is_valid=True),
+    async def search_lobbies(
+        self,
+        search: LobbySearchSchema,
+        versions: list[VersionSchema] | None = None,
+    ) -> list[LobbySchema]:
+        if versions is None:
+            versions = await self.search_lobby_versions(search)
+        if not versions:
+            return []
+        return await self._lobby_repo.select_many(
+            *(version.id for version in versions),
+            versions={version.id: version.version for version in versions},
         )
 
-        missing_category_ids = {cat.id for cat in categories} - set(lobby.category_ids)
-        if missing_category_ids:
-            raise BadRequestError(f"Missing categories: {missing_category_ids}")
+    async def search_lobby_versions(self, search: LobbySearchSchema) -> list[VersionSchema]:
+        return await self._lobby_repo.filter_versions(search)
+
+    async def create_lobby(self, lobby: LobbyCreatePublicSchema, user_id: int) -> BaseLobbySchema:
+        batch = await self._category_service.get_categories(lobby.category_ids)
 
-        invalid_category_ids = {cat.id for cat in categories if not cat.is_valid}
+        if batch.missing_ids:
+            raise BadRequestError(f"Missing categories: {set(batch.missing_ids)}")
+
+        invalid_category_ids = {cat.id for cat in batch.categories if not cat.is_valid}
         if invalid_category_ids:
             raise BadRequestError(f"Invalid categories: {invalid_category_ids}")
 
@@ -59,18 +75,15 @@ class LobbyService:
         return await self._lobby_repo.insert(lobby_with_host)
 
     async def start_lobby(self, lobby_id: int, user_id: int) -> LobbyStartedPublicSchema:
-        lobby = await self.get_lobby(lobby_id=lobby_id)
-
-        if lobby.host_id != user_id:
-            raise ForbiddenError(f"Lobby {lobby_id} does not belong to user {user_id}")
-
-        if lobby.state != LobbyStateEnum.CREATED:
-            raise BadRequestError(f"Lobby {lobby_id} has been started already")
-
         started_lobby = await self._lobby_repo.update(
             lobby_id=lobby_id,
             state=LobbyStateEnum.STARTED,
+            host_id=user_id,
+            expected_state=LobbyStateEnum.CREATED,
         )
+        if started_lobby is None:
+            await self._raise_start_error(lobby_id=lobby_id, user_id=user_id)
+
         await self._game_service.create_game(started_lobby)
         return LobbyStartedPublicSchema(
             game_url=self._get_game_url(lobby_id),
@@ -78,10 +91,20 @@ class LobbyService:
         )
 
     async def delete_lobby(self, lobby_id: int, user_id: int) -> None:
-        lobby = await self.get_lobby(lobby_id=lobby_id)
-        if lobby.host_id != user_id:
+        is_deleted = await self._lobby_repo.delete(lobby_id, host_id=user_id)
+        if not is_deleted:
+            lobby = await self._lobby_repo.select_base(lobby_id)
+            if not lobby:
+                raise NotFoundError(f"Lobby {lobby_id} not found")
             raise ForbiddenError(f"Lobby {lobby_id} is not hosted by user {user_id}")
-        await self._lobby_repo.delete(lobby_id)
+
+    async def _raise_start_error(self, lobby_id: int, user_id: int) -> NoReturn:
+        lobby = await self._lobby_repo.select_base(lobby_id)
+        if not lobby:
+            raise NotFoundError(f"Lobby {lobby_id} not found")
+        if lobby.host_id != user_id:
+            raise ForbiddenError(f"Lobby {lobby_id} does not belong to user {user_id}")
+        raise BadRequestError(f"Lobby {lobby_id} has been started already")
 
     def _get_game_url(self, lobby_id: int) -> str:
         base_url = str(self._request.base_url).rstrip("/")
@@ -0,0 +1,35 @@
+import time
+from typing import Annotated
+
+from fastapi import Depends
+
+from repositories.presence import PresenceRepo
+from schemas.presence import PresenceSchema
+
+
+class PresenceService:
+    def __init__(self, presence_repo: Annotated[PresenceRepo, Depends()]):
+        self._presence_repo = presence_repo
+
+    async def track(self, node_id: str, *presences: PresenceSchema) -> bool:
+        """
+        Send heartbeat of node and its sockets.
+
+        :param node_id: node ID
+        :param presences: sockets of node
+        :return: whether node was not tracked, i.e. is new or was swept
+        """
+        return await self._presence_repo.touch(node_id, *presences, at=time.time())
+
+    async def untrack(self, *presences: PresenceSchema) -> None:
+        await self._presence_repo.remove(*presences)
+
+    async def pop_expired(self, node_id: str, ttl_sec: float) -> list[PresenceSchema]:
+        """
+        Pop sockets of other nodes without heartbeats for `ttl_sec`, e.g. of failed nodes.
+
+        :param node_id: ID of this node
+        :param ttl_sec: seconds since the last heartbeat
+        :return: expired sockets
+        """
+        return await self._presence_repo.pop_expired(node_id, before=time.time() - ttl_sec)
@@ -1,14 +1,14 @@
-from typing import Annotated
+from typing import Annotated, NoReturn
 
 from fastapi import Depends
 
-from errors.auth import ForbiddenError
+from constants import NUM_PROMPTS_IN_CATEGORY
 from errors.request import BadRequestError, NotFoundError
 from errors.storage import DBError
 from repositories import PromptRepo
-from schemas.category.nested import CategorySchema
 from schemas.prompt.base import (
     BasePromptSchema,
+    PromptBulkCreatePublicSchema,
     PromptCreatePublicSchema,
     PromptCreateSchema,
     PromptUpdateSchema,
@@ -38,21 +38,45 @@ class PromptService:
         category_id: int,
         user_id: int,
     ) -> BasePromptSchema:
-        category = await self._check_category_permissions(category_id=category_id, user_id=user_id)
-        if category.is_full:
-            raise BadRequestError("Category is full")
-        if prompt.order in {p.order for p in category.prompts}:
-            raise BadRequestError("Prompt with this order already exists")
-
         prompt_with_category = PromptCreateSchema(
             category_id=category_id,
             **prompt.model_dump(exclude_unset=True, exclude_none=True),
         )
         try:
-            return await self._prompt_repo.insert(prompt_with_category)
+            created_prompt = await self._prompt_repo.insert(prompt_with_category, owner_id=user_id)
+        except DBError as error:
+            raise BadRequestError("Invalid prompt order in the category") from error
+
+        if created_prompt is None:
+            category = await self._category_service.check_permissions(
+                category_id=category_id,
+                user_id=user_id,
+            )
+            if category.prompt_count >= NUM_PROMPTS_IN_CATEGORY:
+                raise BadRequestError("Category is full")
+            raise BadRequestError("Prompt with this order already exists")
+        return created_prompt
+
+    async def replace_prompts(
+        self,
+        prompts: PromptBulkCreatePublicSchema,
+        category_id: int,
+        user_id: int,
+    ) -> list[BasePromptSchema]:
+        try:
+            created_prompts = await self._prompt_repo.replace(
+                category_id=category_id,
+                prompts=prompts.prompts,
+                owner_id=user_id,
+            )
         except DBError as error:
             raise BadRequestError("Invalid prompt order in the category") from error
 
+        if not created_prompts:
+            await self._category_service.check_permissions(category_id=category_id, user_id=user_id)
+            raise NotFoundError(f"Category {category_id} not found")
+        return created_prompts
+
     async def update_prompt(
         self,
         prompt_id: int,
@@ -60,15 +84,30 @@ class PromptService:
         prompt: PromptUpdateSchema,
         user_id: int,
     ) -> BasePromptSchema:
-        await self._check_category_permissions(category_id=category_id, user_id=user_id)
-        return await self._prompt_repo.update(prompt_id=prompt_id, prompt=prompt)
+        updated_prompt = await self._prompt_repo.update(
+            prompt_id=prompt_id,
+            prompt=prompt,
+            category_id=category_id,
+            owner_id=user_id,
+        )
+        if updated_prompt is None:
+            await self._raise_mutation_error(prompt_id, category_id=category_id, user_id=user_id)
+        return updated_prompt
 
     async def delete_prompt(self, prompt_id: int, category_id: int, user_id: int) -> None:
-        await self._check_category_permissions(category_id=category_id, user_id=user_id)
-        return await self._prompt_repo.delete(prompt_id=prompt_id)
+        is_deleted = await self._prompt_repo.delete(
+            prompt_id=prompt_id,
+            category_id=category_id,
+            owner_id=user_id,
+        )
+        if not is_deleted:
+            await self._raise_mutation_error(prompt_id, category_id=category_id, user_id=user_id)
 
-    async def _check_category_permissions(self, category_id: int, user_id: int) -> CategorySchema:
-        category = await self._category_service.get_category(category_id)
-        if category.owner_id != user_id:
-            raise ForbiddenError(f"Category {category_id} is not owned by user {user_id}")
-        return category
+    async def _raise_mutation_error(
+        self,
+        prompt_id: int,
+        category_id: int,
+        user_id: int,
+    ) -> NoReturn:
+        await self._category_service.check_permissions(category_id=category_id, user_id=user_id)
+        raise NotFoundError(f"Prompt {prompt_id} not found in category {category_id}")
@@ -1,3 +1,11 @@
-from storages.dependencies import get_db_manager, get_db_session, get_redis_manager
+from storages.cache import CacheManager
+from storages.dependencies import (
+    get_cache_manager,
+    get_db_manager,
+    get_db_session,
+    get_redis_manager,
+    use_read_only_db_session,
+)
+from storages.memory import MemoryRedisManager
 from storages.redis import RedisManager
 from storages.relational_db import DBManager
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+
+from redis.exceptions import RedisError
+
+from errors.storage import RedisBaseError
+from schemas.storage import CacheConfigSchema, CacheStatsSchema
+from storages.redis import RedisManager
+
+_logger = logging.getLogger(__name__)
+
+
+class CacheManager:
+    """
+    Two-level cache of serialized DTOs keyed by namespace and ID.
+
+    Values are looked up in a small in-process cache first and in Redis second.
+    Invalidations are published to Redis, so every worker evicts its local copies.
+    Redis errors are logged and treated as misses, cache never fails reads.
+    """
+
+    def __init__(self, redis_manager: RedisManager, conn_config: CacheConfigSchema):
+        self._redis_manager = redis_manager
+        self._config = conn_config
+        self._local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._stats: defaultdict[str, CacheStatsSchema] = defaultdict(CacheStatsSchema)
+
+    async def get_many(self, namespace: str, ids: Iterable[int]) -> dict[int, str]:
+        """
+        Get cached values.
+
+        :param namespace: cache namespace
+        :param ids: IDs of values
+        :return: found values by ID
+        """
+        stats = self._stats[namespace]
+        found = {}
+        remote_ids = []
+        for value_id in ids:
+            value = self._get_local(self._create_key(namespace, value_id))
+            if value is None:
+                remote_ids.append(value_id)
+            else:
+                found[value_id] = value
+                stats.local_hits += 1
+        if not remote_ids:
+            return found
+
+        keys = [self._create_key(namespace, value_id) for value_id in remote_ids]
+        try:
+            async with self._redis_manager.client() as client:
+                values = await client.mget(keys)
+        except RedisBaseError:
+            values = [None] * len(keys)
+
+        for value_id, key, value in zip(remote_ids, keys, values, strict=True):
+            if value is None:
+                stats.misses += 1
+            else:
+                found[value_id] = value
+                stats.remote_hits += 1
+                self._set_local(key, value)
+        return found
+
+    async def set_many(self, namespace: str, values: dict[int, str]) -> None:
+        """
+        Cache values.
+
+        :param namespace: cache namespace
+        :param values: values by ID
+        :return:
+        """
+        if not values:
+            return
+
+        keys = {self._create_key(namespace, value_id): value for value_id, value in values.items()}
+        for key, value in keys.items():
+            self._set_local(key, value)
+        try:
+            async with (
+                self._redis_manager.client() as client,
+                client.pipeline(transaction=False) as pipe,
+            ):
+                for key, value in keys.items():
+                    pipe.set(key, value, ex=self._config.expiration_sec)
+                await pipe.execute()
+        except RedisBaseError:
+            pass
+
+    async def invalidate(self, namespace: str, ids: Iterable[int]) -> None:
+        """
+        Remove values from cache of all workers.
+
+        :param namespace: cache namespace
+        :param ids: IDs of values
+        :return:
+        """
+        keys = [self._create_key(namespace, value_id) for value_id in set(ids)]
+        if not keys:
+            return
+
+        self._evict_local(keys)
+        self._stats[namespace].invalidations += len(keys)
+        try:
+            async with (
+                self._redis_manager.client() as client,
+                client.pipeline(transaction=False) as pipe,
+            ):
+                pipe.delete(*keys)
+                pipe.publish(self._config.channel, " ".join(keys))
+                await pipe.execute()
+        except RedisBaseError:
+            pass
+
+    async def listen(self) -> None:
+        """
+        Evict local values invalidated by other workers, reconnecting on errors.
+
+        Local cache is cleared after reconnecting, as invalidations could be missed.
+
+        :return:
+        """
+        while True:
+            try:
+                async with self._redis_manager.client() as client:
+                    pubsub = client.pubsub(ignore_subscribe_messages=True)
+                    try:
+                        await pubsub.subscribe(self._config.channel)
+                        self._local.clear()
+                        async for message in pubsub.listen():
+                            data = message["data"]
+                            if isinstance(data, bytes):
+                                data = data.decode()
+                            self._evict_local(data.split())
+                    finally:
+                        await pubsub.aclose()
+            except (RedisBaseError, RedisError) as error:
+                _logger.warning(
+                    f"Cache invalidation listener failed, reconnecting in "
+                    f"{self._config.reconnect_sec} seconds",
+                    exc_info=error,
+                )
+                await asyncio.sleep(self._config.reconnect_sec)
+
+    def stats(self) -> dict[str, CacheStatsSchema]:
+        """
+        Get hit and miss counters.
+
+        :return: stats by namespace
+        """
+        return dict(self._stats)
+
+    def _get_local(self, key: str) -> str | None:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: str) -> None:
+        self._local[key] = (time.monotonic() + self._config.local_expiration_sec, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self._config.local_max_size:
+            self._local.popitem(last=False)
+
+    def _evict_local(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._local.pop(key, None)
+
+    @classmethod
+    def _create_key(cls, namespace: str, value_id: int) -> str:
+        return f"cache:{namespace}:{value_id}"
@@ -0,0 +1,144 @@
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from schemas.storage import ClientCacheStatsSchema
+
+
+class ClientCache:
+    """
+    Process copies of values of tracked Redis namespaces.
+
+    Values are served only while invalidation messages of tracked namespaces are
+    received, see `RedisManager.track_invalidations`. Values written by this process
+    are stored on write and, like all values, evicted on invalidation, so the next
+    read loads the latest value even if Redis reports own write and a write of
+    another process with one invalidation. Evictions are remembered per key, values
+    read or written before eviction of their keys are not stored, so writes of other
+    processes are never shadowed.
+    """
+
+    def __init__(self, namespaces: Sequence[str], max_size: int):
+        self.prefixes = [f"{namespace}:" for namespace in namespaces]
+        self._namespaces = frozenset(namespaces)
+        self._max_size = max_size
+        self._values: OrderedDict[tuple[str, bool], Any] = OrderedDict()
+        # Epochs of the latest evictions of keys, older ones are forgotten into floor
+        self._eviction_epochs: OrderedDict[str, int] = OrderedDict()
+        self._epoch = 0
+        self._epoch_floor = 0
+        self._is_active = False
+        self._stats = ClientCacheStatsSchema()
+
+    def is_tracked(self, namespace: str) -> bool:
+        return self._is_active and namespace in self._namespaces
+
+    def activate(self) -> None:
+        self.clear()
+        self._is_active = True
+
+    def deactivate(self) -> None:
+        self._is_active = False
+        self.clear()
+
+    def get_many(self, keys: Iterable[str], decode: bool) -> tuple[dict[str, Any], int]:
+        """
+        Get cached values.
+
+        :param keys: keys
+        :param decode: whether values are decoded responses
+        :return: found values by key and epoch to store missing values with
+        """
+        found = {}
+        for key in keys:
+            entry_key = (key, decode)
+            if entry_key in self._values:
+                self._values.move_to_end(entry_key)
+                found[key] = self._values[entry_key]
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+        return found, self._epoch
+
+    def set_many(self, values: dict[str, Any], decode: bool, epoch: int) -> None:
+        """
+        Store values read from Redis, unless their keys were evicted since `epoch`.
+
+        :param values: values by key
+        :param decode: whether values are decoded responses
+        :param epoch: epoch returned by `get_many` before reading values
+        :return:
+        """
+        if not self._is_active:
+            return
+        for key, value in values.items():
+            if value is not None and not self._is_evicted(key, epoch):
+                self._store((key, decode), value)
+
+    def begin_write(self) -> int:
+        """
+        Start write of this process.
+
+        :return: epoch to store written values with
+        """
+        return self._epoch
+
+    def write(self, values: dict[str, Any], epoch: int) -> None:
+        """
+        Store values written by this process, unless their keys were evicted since `epoch`.
+
+        Stored values replace cached ones, bytes are stored as undecoded responses.
+
+        :param values: values by key
+        :param epoch: epoch returned by `begin_write`
+        :return:
+        """
+        for key, value in values.items():
+            self._values.pop((key, True), None)
+            self._values.pop((key, False), None)
+            if not self._is_active or self._is_evicted(key, epoch):
+                continue
+            if isinstance(value, bytes):
+                self._store((key, False), value)
+            else:
+                self._store((key, True), str(value))
+                self._store((key, False), str(value).encode())
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        """
+        Evict keys invalidated by Redis, including keys of own writes.
+
+        :param keys: keys
+        :return:
+        """
+        self.evict(keys)
+
+    def evict(self, keys: Iterable[str]) -> None:
+        self._epoch += 1
+        for key in keys:
+            self._values.pop((key, True), None)
+            self._values.pop((key, False), None)
+            self._eviction_epochs[key] = self._epoch
+            self._eviction_epochs.move_to_end(key)
+            self._stats.invalidations += 1
+        while len(self._eviction_epochs) > self._max_size:
+            _, epoch = self._eviction_epochs.popitem(last=False)
+            self._epoch_floor = max(self._epoch_floor, epoch)
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._epoch_floor = self._epoch
+        self._values.clear()
+        self._eviction_epochs.clear()
+
+    def stats(self) -> ClientCacheStatsSchema:
+        return self._stats.model_copy(update={"size": len(self._values)})
+
+    def _is_evicted(self, key: str, epoch: int) -> bool:
+        return epoch < self._epoch_floor or self._eviction_epochs.get(key, 0) > epoch
+
+    def _store(self, entry_key: tuple[str, bool], value: Any) -> None:
+        self._values[entry_key] = value
+        self._values.move_to_end(entry_key)
+        while len(self._values) > self._max_size:
+            self._values.popitem(last=False)
@@ -1,11 +1,14 @@
 from collections.abc import AsyncGenerator
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from redis.asyncio.connection import parse_url
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from configs import settings
-from schemas.storage import DBConnectionSchema, RedisConnectionSchema
+from schemas.storage import CacheConfigSchema, DBConnectionSchema, RedisConnectionSchema
+from storages.cache import CacheManager
+from storages.memory import MemoryRedisManager
 from storages.redis import RedisManager
 from storages.relational_db import DBManager
 
@@ -16,7 +19,14 @@ _DEFAULT_DB_CONN_CONFIG = DBConnectionSchema(
     expire_on_commit=settings.db_expire_on_commit,
     rollback=settings.db_rollback,
     conn_pool_size=settings.db_conn_pool_size,
+    conn_pool_min_size=settings.db_conn_pool_min_size,
+    conn_pool_max_overflow=settings.db_conn_pool_max_overflow,
+    conn_pool_timeout=settings.db_conn_pool_timeout,
     conn_pool_recycle=settings.db_conn_pool_recycle,
+    conn_pool_pre_ping=settings.db_conn_pool_pre_ping,
+    statement_cache_size=settings.db_statement_cache_size,
+    pgbouncer=settings.db_pgbouncer,
+    replica_retry_sec=settings.db_replica_retry_sec,
 )
 
 
@@ -27,27 +37,78 @@ _DEFAULT_REDIS_CONFIG = RedisConnectionSchema(
     password=settings.redis_password,
     decode_responses=settings.redis_decode_responses,
     socket_timeout=settings.redis_socket_timeout,
+    socket_connect_timeout=settings.redis_socket_connect_timeout,
+    health_check_interval=settings.redis_health_check_interval,
+    min_connections=settings.redis_min_connections,
     max_connections=settings.redis_max_connections,
+    pool_timeout=settings.redis_pool_timeout,
+    client_cache_namespaces=settings.redis_client_cache_namespaces,
+    client_cache_max_size=settings.redis_client_cache_max_size,
 )
 
 _default_db_manager = DBManager(
     db_url=settings.db_url,
     conn_config=_DEFAULT_DB_CONN_CONFIG,
+    replica_urls=settings.db_replica_urls,
 )
 
-_default_redis_manager = RedisManager(conn_config=_DEFAULT_REDIS_CONFIG)
+_DEFAULT_CACHE_CONFIG = CacheConfigSchema(
+    expiration_sec=settings.cache_expiration_sec,
+    local_expiration_sec=settings.cache_local_expiration_sec,
+    local_max_size=settings.cache_local_max_size,
+)
+
+_REDIS_SHARD_CONFIGS = [
+    _DEFAULT_REDIS_CONFIG.model_copy(
+        update={
+            key: value
+            for key, value in parse_url(url).items()
+            if key in ("host", "port", "db", "password")
+        },
+    )
+    for url in settings.redis_shard_urls
+]
+
+_redis_manager_class = MemoryRedisManager if settings.storage_backend == "memory" else RedisManager
+_default_redis_manager = _redis_manager_class(
+    conn_config=_DEFAULT_REDIS_CONFIG,
+    shards=[_redis_manager_class(conn_config=config) for config in _REDIS_SHARD_CONFIGS],
+)
+
+_default_cache_manager = CacheManager(
+    redis_manager=_default_redis_manager,
+    conn_config=_DEFAULT_CACHE_CONFIG,
+)
 
 
 def get_db_manager() -> DBManager:
     return _default_db_manager
 
 
+def use_read_only_db_session(request: Request) -> None:
+    """
+    Make request use read-only database session.
+
+    Must be set in route `dependencies`, so it is resolved before `get_db_session`.
+
+    :param request: request
+    :return:
+    """
+    request.state.db_read_only = True
+
+
 async def get_db_session(
+    request: Request,
     db_manager: Annotated[DBManager, Depends(get_db_manager)],
 ) -> AsyncGenerator[AsyncSession, None]:
-    async with db_manager.session() as session:
+    read_only = getattr(request.state, "db_read_only", False)
+    async with db_manager.session(read_only=read_only) as session:
         yield session
 
 
 def get_redis_manager() -> RedisManager:
     return _default_redis_manager
+
+
+def get_cache_manager() -> CacheManager:
+    return _default_cache_manager
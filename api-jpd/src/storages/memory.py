@@ -0,0 +1,382 @@
+import asyncio
+import heapq
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import timedelta
+from typing import Any, Self
+
+from redis.asyncio.client import NEVER_DECODE
+from redis.exceptions import ResponseError, WatchError
+
+from schemas.storage import PoolStatsSchema, RedisConnectionSchema
+from storages.redis import RedisManager
+
+
+class MemoryRedis:
+    """
+    In-process subset of `redis.asyncio.Redis` used by repositories and cache.
+
+    Values are kept in a dict, expirations in a heap purged on every command. Strings
+    are stored as bytes and decoded on reads like responses of Redis. Commands are
+    not interleaved, so pipelines are executed atomically. Pipelines watching keys
+    fail on `execute` if the keys were modified or expired since `watch`.
+    """
+
+    COMMANDS = frozenset(
+        (
+            "get",
+            "mget",
+            "set",
+            "delete",
+            "zadd",
+            "zrem",
+            "zrangebyscore",
+            "zremrangebyscore",
+            "publish",
+        ),
+    )
+
+    def __init__(self, decode_responses: bool = True):
+        self._decode_responses = decode_responses
+        self._values: dict[str, bytes | dict[bytes, float]] = {}
+        self._expirations: dict[str, float] = {}
+        self._expiration_heap: list[tuple[float, str]] = []
+        self._subscribers: defaultdict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._watchers: defaultdict[str, set[MemoryPipeline]] = defaultdict(set)
+
+    async def ping(self) -> bool:
+        return True
+
+    async def get(self, key: str) -> Any:
+        return self._get(key, decode=self._decode_responses)
+
+    async def mget(self, keys: str | list[str], *args: str) -> list[Any]:
+        return self._mget(keys, *args, decode=self._decode_responses)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ex: int | timedelta | None = None,
+        nx: bool = False,
+        xx: bool = False,
+    ) -> bool | None:
+        return self._set(key, value, ex=ex, nx=nx, xx=xx)
+
+    async def delete(self, *keys: str) -> int:
+        return self._delete(*keys)
+
+    async def zadd(self, key: str, mapping: dict[str, float]) -> int:
+        return self._zadd(key, mapping)
+
+    async def zrem(self, key: str, *members: str) -> int:
+        return self._zrem(key, *members)
+
+    async def zrangebyscore(
+        self,
+        key: str,
+        min_score: float | str,
+        max_score: float | str,
+    ) -> list[Any]:
+        return self._zrangebyscore(key, min_score, max_score)
+
+    async def zremrangebyscore(
+        self,
+        key: str,
+        min_score: float | str,
+        max_score: float | str,
+    ) -> int:
+        return self._zremrangebyscore(key, min_score, max_score)
+
+    async def publish(self, channel: str, message: Any) -> int:
+        return self._publish(channel, message)
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        return self._execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True) -> "MemoryPipeline":
+        return MemoryPipeline(self)
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> "MemoryPubSub":
+        return MemoryPubSub(self, ignore_subscribe_messages=ignore_subscribe_messages)
+
+    def _execute_command(self, command: str, *args: Any, **options: Any) -> Any:
+        name = command.lower()
+        if name not in self.COMMANDS:
+            raise ResponseError(f"ERR unknown command '{command}'")
+        kwargs = {}
+        if name in ("get", "mget"):
+            kwargs["decode"] = self._decode_responses and NEVER_DECODE not in options
+        return getattr(self, f"_{name}")(*args, **kwargs)
+
+    def _get(self, key: str, decode: bool) -> Any:
+        self._purge_expired()
+        value = self._values.get(key)
+        if isinstance(value, dict):
+            raise ResponseError(f"WRONGTYPE Key {key} holds sorted set")
+        return self._decode(value, decode)
+
+    def _mget(self, keys: str | list[str], *args: str, decode: bool) -> list[Any]:
+        keys = [keys, *args] if isinstance(keys, str) else [*keys, *args]
+        return [self._get(key, decode=decode) for key in keys]
+
+    def _set(
+        self,
+        key: str,
+        value: Any,
+        ex: int | timedelta | None = None,
+        nx: bool = False,
+        xx: bool = False,
+    ) -> bool | None:
+        self._purge_expired()
+        if (nx and key in self._values) or (xx and key not in self._values):
+            return None
+        self._touch(key)
+        self._values[key] = self._encode(value)
+        self._expirations.pop(key, None)
+        if ex is not None:
+            seconds = ex.total_seconds() if isinstance(ex, timedelta) else ex
+            expires_at = time.monotonic() + seconds
+            self._expirations[key] = expires_at
+            heapq.heappush(self._expiration_heap, (expires_at, key))
+        return True
+
+    def _delete(self, *keys: str) -> int:
+        self._purge_expired()
+        deleted = 0
+        for key in keys:
+            if self._values.pop(key, None) is not None:
+                self._expirations.pop(key, None)
+                self._touch(key)
+                deleted += 1
+        return deleted
+
+    def _zadd(self, key: str, mapping: dict[str, float]) -> int:
+        members = self._get_sorted_set(key, create=True)
+        added = 0
+        for member, score in mapping.items():
+            member = self._encode(member)
+            added += member not in members
+            members[member] = float(score)
+        self._touch(key)
+        return added
+
+    def _zrem(self, key: str, *members: str) -> int:
+        sorted_set = self._get_sorted_set(key)
+        removed = sum(sorted_set.pop(self._encode(member), None) is not None for member in members)
+        if removed:
+            self._touch(key)
+        if not sorted_set:
+            self._values.pop(key, None)
+        return removed
+
+    def _zrangebyscore(self, key: str, min_score: float | str, max_score: float | str) -> list[Any]:
+        min_score, max_score = float(min_score), float(max_score)
+        members = sorted(
+            (score, member)
+            for member, score in self._get_sorted_set(key).items()
+            if min_score <= score <= max_score
+        )
+        return [self._decode(member, self._decode_responses) for _, member in members]
+
+    def _zremrangebyscore(self, key: str, min_score: float | str, max_score: float | str) -> int:
+        min_score, max_score = float(min_score), float(max_score)
+        sorted_set = self._get_sorted_set(key)
+        removed = [
+            member for member, score in sorted_set.items() if min_score <= score <= max_score
+        ]
+        for member in removed:
+            del sorted_set[member]
+        if removed:
+            self._touch(key)
+        if not sorted_set:
+            self._values.pop(key, None)
+        return len(removed)
+
+    def _publish(self, channel: str, message: Any) -> int:
+        data = self._encode(message)
+        for queue in self._subscribers[channel]:
+            queue.put_nowait(("message", channel, data))
+        return len(self._subscribers[channel])
+
+    def _get_sorted_set(self, key: str, create: bool = False) -> dict[bytes, float]:
+        self._purge_expired()
+        value = self._values.get(key)
+        if value is None:
+            value = {}
+            if create:
+                self._values[key] = value
+        elif not isinstance(value, dict):
+            raise ResponseError(f"WRONGTYPE Key {key} does not hold sorted set")
+        return value
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        heap = self._expiration_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            # Heap keeps entries of overwritten keys, they are skipped here
+            if self._expirations.get(key) == expires_at:
+                del self._expirations[key]
+                del self._values[key]
+                self._touch(key)
+
+    def _watch(self, pipeline: "MemoryPipeline", *keys: str) -> None:
+        self._purge_expired()
+        for key in keys:
+            self._watchers[key].add(pipeline)
+
+    def _unwatch(self, pipeline: "MemoryPipeline", *keys: str) -> None:
+        for key in keys:
+            watchers = self._watchers.get(key)
+            if watchers is not None:
+                watchers.discard(pipeline)
+                if not watchers:
+                    del self._watchers[key]
+
+    def _touch(self, key: str) -> None:
+        for pipeline in self._watchers.pop(key, ()):
+            pipeline._is_watch_failed = True
+
+    def _decode(self, value: bytes | None, decode: bool) -> Any:
+        if value is not None and decode:
+            return value.decode()
+        return value
+
+    @classmethod
+    def _encode(cls, value: Any) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        if isinstance(value, memoryview | bytearray):
+            return bytes(value)
+        return str(value).encode()
+
+
+class MemoryPipeline:
+    """
+    Buffer of commands of `MemoryRedis`, executed in order on `execute`.
+
+    After `watch` commands are executed immediately until `multi`, like in
+    `redis.asyncio.client.Pipeline`.
+    """
+
+    def __init__(self, redis: MemoryRedis):
+        self._redis = redis
+        self._commands: list[Callable[[], Any]] = []
+        self._watched_keys: list[str] = []
+        self._is_watching = False
+        self._is_watch_failed = False
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.reset()
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name not in MemoryRedis.COMMANDS:
+            raise AttributeError(f"Command {name} is not supported in memory pipeline")
+        command = getattr(self._redis, f"_{name}")
+
+        def call(*args, **kwargs) -> Any:
+            if name in ("get", "mget"):
+                kwargs.setdefault("decode", self._redis._decode_responses)
+            return self._call(lambda: command(*args, **kwargs))
+
+        return call
+
+    def execute_command(self, *args: Any, **options: Any) -> Any:
+        return self._call(lambda: self._redis._execute_command(*args, **options))
+
+    async def watch(self, *keys: str) -> bool:
+        self._redis._watch(self, *keys)
+        self._watched_keys.extend(keys)
+        self._is_watching = True
+        return True
+
+    def multi(self) -> None:
+        self._is_watching = False
+
+    async def execute(self) -> list[Any]:
+        commands, self._commands = self._commands, []
+        is_watch_failed = self._is_watch_failed
+        await self.reset()
+        if is_watch_failed:
+            raise WatchError("Watched variable changed.")
+        return [command() for command in commands]
+
+    async def reset(self) -> None:
+        self._commands.clear()
+        self._redis._unwatch(self, *self._watched_keys)
+        self._watched_keys.clear()
+        self._is_watching = False
+        self._is_watch_failed = False
+
+    def _call(self, command: Callable[[], Any]) -> Any:
+        if self._is_watching:
+            return self._execute_now(command)
+        self._commands.append(command)
+        return self
+
+    @classmethod
+    async def _execute_now(cls, command: Callable[[], Any]) -> Any:
+        return command()
+
+
+class MemoryPubSub:
+    """Subscription to channels of `MemoryRedis`."""
+
+    def __init__(self, redis: MemoryRedis, ignore_subscribe_messages: bool = False):
+        self._redis = redis
+        self._ignore_subscribe_messages = ignore_subscribe_messages
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._channels: list[str] = []
+
+    async def subscribe(self, *channels: str) -> None:
+        for channel in channels:
+            self._redis._subscribers[channel].add(self._queue)
+            self._channels.append(channel)
+            if not self._ignore_subscribe_messages:
+                self._queue.put_nowait(("subscribe", channel, len(self._channels)))
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        while True:
+            message_type, channel, data = await self._queue.get()
+            if message_type == "message":
+                data = self._redis._decode(data, self._redis._decode_responses)
+            yield {"type": message_type, "channel": channel, "data": data}
+
+    async def aclose(self) -> None:
+        for channel in self._channels:
+            self._redis._subscribers[channel].discard(self._queue)
+        self._channels.clear()
+
+
+class MemoryRedisManager(RedisManager):
+    """
+    Manager of in-process `MemoryRedis`, for single-node deployments and tests.
+
+    State is not shared between processes, so it is used with one worker only.
+    """
+
+    def __init__(
+        self,
+        conn_config: RedisConnectionSchema,
+        shards: Sequence["MemoryRedisManager"] = (),
+    ):
+        # Values are in process already, they are not cached again
+        super().__init__(conn_config.model_copy(update={"client_cache_namespaces": []}), shards)
+
+    @classmethod
+    def _create_client(cls, conn_config: RedisConnectionSchema) -> MemoryRedis:
+        return MemoryRedis(decode_responses=conn_config.decode_responses)
+
+    async def prewarm(self) -> None:
+        pass
+
+    def pool_stats(self) -> PoolStatsSchema:
+        return PoolStatsSchema(size=0, checked_in=0, checked_out=0)
+
+    async def close(self) -> None:
+        pass
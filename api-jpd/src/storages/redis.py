@@ -1,28 +1,57 @@
+import asyncio
 import contextlib
 import logging
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Sequence
 
 import redis.asyncio as redis
 from redis.exceptions import RedisError
 
 from errors.storage import RedisBaseError
-from schemas.storage import RedisConnectionSchema
+from schemas.storage import ClientCacheStatsSchema, PoolStatsSchema, RedisConnectionSchema
+from storages.client_cache import ClientCache
+from storages.sharding import HashRing
 
 _logger = logging.getLogger(__name__)
 
+_INVALIDATION_CHANNEL = "__redis__:invalidate"
+
 
 class RedisManager:
-    def __init__(self, conn_config: RedisConnectionSchema):
+    """
+    Manager of Redis connection pool.
+
+    With `shards`, keys are routed to shard managers by consistent hashing of shard keys,
+    see `get_shard`. Keys without shard keys stay in Redis of this manager.
+    """
+
+    def __init__(self, conn_config: RedisConnectionSchema, shards: Sequence["RedisManager"] = ()):
         self._config = conn_config
-        self._client = redis.Redis(
-            host=conn_config.host,
-            port=conn_config.port,
-            db=conn_config.db,
-            password=conn_config.password,
-            decode_responses=conn_config.decode_responses,
-            socket_timeout=conn_config.socket_timeout,
-            max_connections=conn_config.max_connections,
+        self._client = self._create_client(conn_config)
+        self._client_cache = ClientCache(
+            namespaces=conn_config.client_cache_namespaces,
+            max_size=conn_config.client_cache_max_size,
         )
+        self._shards = {shard.name: shard for shard in shards}
+        self._ring = HashRing(list(self._shards)) if shards else None
+
+    @property
+    def name(self) -> str:
+        return f"{self._config.host}:{self._config.port}/{self._config.db}"
+
+    @property
+    def shards(self) -> list["RedisManager"]:
+        return list(self._shards.values())
+
+    def get_shard(self, shard_key: str | int) -> "RedisManager":
+        """
+        Get manager of shard storing keys of `shard_key`, e.g. of one game.
+
+        :param shard_key: shard key
+        :return: shard manager, this manager if there are no shards
+        """
+        if self._ring is None:
+            return self
+        return self._shards[self._ring.get_node(str(shard_key))]
 
     async def ping(self) -> bool:
         try:
@@ -31,6 +60,156 @@ class RedisManager:
             _logger.error("Failed to ping Redis", exc_info=error)
             raise RedisBaseError(f"Redis ping failed: {error}") from error
 
+    async def prewarm(self) -> None:
+        """
+        Open `min_connections` connections in pools of this manager and shards.
+
+        :return:
+        """
+        if self._client is None:
+            raise RedisBaseError("Redis client not initialized")
+
+        await asyncio.gather(*(shard.prewarm() for shard in self.shards))
+        pool = self._client.connection_pool
+        size = min(self._config.min_connections, self._config.max_connections)
+        results = await asyncio.gather(
+            *(pool.get_connection() for _ in range(size)),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        for result in results:
+            if not isinstance(result, BaseException):
+                await pool.release(result)
+        if errors:
+            raise RedisBaseError(f"Redis prewarm failed: {errors[0]}") from errors[0]
+
+    def pool_stats(self) -> PoolStatsSchema | None:
+        """
+        Get stats of connection pool.
+
+        Redis client has no public pool stats, so they are read from private attributes
+        of its pool if present.
+
+        :return: pool stats, `None` if pool does not expose them
+        """
+        if self._client is None:
+            raise RedisBaseError("Redis client not initialized")
+
+        pool = self._client.connection_pool
+        available = getattr(pool, "_available_connections", None)
+        in_use = getattr(pool, "_in_use_connections", None)
+        if available is None or in_use is None:
+            return None
+        return PoolStatsSchema(
+            size=self._config.max_connections,
+            checked_in=len(available),
+            checked_out=len(in_use),
+        )
+
+    def get_client_cache(self, namespace: str) -> ClientCache | None:
+        """
+        Get client-side cache of namespace.
+
+        :param namespace: key namespace
+        :return: cache, `None` if namespace is not tracked or invalidations are not received
+        """
+        return self._client_cache if self._client_cache.is_tracked(namespace) else None
+
+    def client_cache_stats(self) -> ClientCacheStatsSchema:
+        return self._client_cache.stats()
+
+    async def track_invalidations(self) -> None:
+        """
+        Receive invalidations of keys of client-side cached namespaces, reconnecting on errors.
+
+        One connection turns on broadcast tracking of namespace prefixes, redirected to
+        itself, and subscribes to invalidation messages. Cache is cleared and bypassed
+        while connection is down, as invalidations could be missed.
+
+        :return:
+        """
+        if self.shards:
+            await asyncio.gather(
+                self._track_invalidations(),
+                *(shard.track_invalidations() for shard in self.shards),
+            )
+        else:
+            await self._track_invalidations()
+
+    async def _track_invalidations(self) -> None:
+        if not self._client_cache.prefixes:
+            return
+
+        while True:
+            try:
+                await self._receive_invalidations()
+            except (RedisError, OSError) as error:
+                _logger.warning(
+                    "Client cache invalidations failed, reconnecting in %s seconds",
+                    self._config.client_cache_reconnect_sec,
+                    exc_info=error,
+                )
+                await asyncio.sleep(self._config.client_cache_reconnect_sec)
+
+    async def _receive_invalidations(self) -> None:
+        pool = self._client.connection_pool
+        connection = await pool.get_connection()
+        try:
+            await connection.send_command("CLIENT", "ID")
+            client_id = await connection.read_response()
+            prefix_args = [
+                arg for prefix in self._client_cache.prefixes for arg in ("PREFIX", prefix)
+            ]
+            await connection.send_command(
+                "CLIENT",
+                "TRACKING",
+                "ON",
+                "REDIRECT",
+                client_id,
+                "BCAST",
+                *prefix_args,
+            )
+            await connection.read_response()
+            await connection.send_command("SUBSCRIBE", _INVALIDATION_CHANNEL)
+            await connection.read_response()
+            self._client_cache.activate()
+            while True:
+                message_type, _, keys = await connection.read_response()
+                if message_type not in ("message", b"message"):
+                    continue
+                if keys is None:
+                    self._client_cache.clear()
+                else:
+                    self._client_cache.invalidate(
+                        key.decode() if isinstance(key, bytes) else key for key in keys
+                    )
+        finally:
+            self._client_cache.deactivate()
+            await connection.disconnect()
+            await pool.release(connection)
+
+    @classmethod
+    def _create_client(cls, conn_config: RedisConnectionSchema) -> redis.Redis:
+        if conn_config.pool_timeout is None:
+            pool_class, pool_kwargs = redis.ConnectionPool, {}
+        else:
+            pool_class = redis.BlockingConnectionPool
+            pool_kwargs = {"timeout": conn_config.pool_timeout}
+        return redis.Redis(
+            connection_pool=pool_class(
+                host=conn_config.host,
+                port=conn_config.port,
+                db=conn_config.db,
+                password=conn_config.password,
+                decode_responses=conn_config.decode_responses,
+                socket_timeout=conn_config.socket_timeout,
+                socket_connect_timeout=conn_config.socket_connect_timeout,
+                health_check_interval=conn_config.health_check_interval,
+                max_connections=conn_config.max_connections,
+                **pool_kwargs,
+            ),
+        )
+
     @contextlib.asynccontextmanager
     async def client(self) -> AsyncIterator[redis.Redis]:
         if self._client is None:
@@ -43,6 +222,7 @@ class RedisManager:
             raise RedisBaseError(f"Redis error: {error}") from error
 
     async def close(self) -> None:
+        await asyncio.gather(*(shard.close() for shard in self.shards))
         if self._client is not None:
             try:
                 await self._client.close()
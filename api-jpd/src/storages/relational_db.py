@@ -1,41 +1,85 @@
+import asyncio
 import contextlib
+import dataclasses
 import logging
-from collections.abc import AsyncIterator
+import time
+import uuid
+from collections.abc import AsyncIterator, Sequence
 
 from sqlalchemy import URL
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
+from constants import AFTER_COMMIT_KEY, READ_ONLY_SESSION_KEY, REPLICA_SESSION_KEY
 from errors.storage import DBError
-from schemas.storage import DBConnectionSchema
+from schemas.storage import DBConnectionSchema, PoolStatsSchema
 
 _logger = logging.getLogger(__name__)
 
 
+class _TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool measuring time spent on getting connections."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time_sec = 0.0
+        self.max_wait_time_sec = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.wait_time_sec += elapsed
+            self.max_wait_time_sec = max(self.max_wait_time_sec, elapsed)
+
+
+@dataclasses.dataclass
+class _Replica:
+    engine: AsyncEngine
+    read_only_engine: AsyncEngine
+    unavailable_until: float = 0.0
+
+
 class DBManager:
     def __init__(
         self,
         *,
         db_url: str | URL,
         conn_config: DBConnectionSchema,
+        replica_urls: Sequence[str | URL] = (),
     ):
         self.db_url = db_url
-        self._engine = create_async_engine(
-            url=db_url,
-            echo=conn_config.echo,
-            echo_pool=conn_config.echo_pool,
-            isolation_level=conn_config.isolation_level,
-            pool_size=conn_config.conn_pool_size,
-            pool_recycle=conn_config.conn_pool_recycle,
-        )
+        self._engine = self._create_engine(db_url, conn_config)
         self._sessionmaker = async_sessionmaker(
             bind=self._engine,
             expire_on_commit=conn_config.expire_on_commit,
         )
+        self._read_only_sessionmaker = async_sessionmaker(
+            bind=self._engine.execution_options(postgresql_readonly=True),
+            expire_on_commit=False,
+            info={READ_ONLY_SESSION_KEY: True},
+        )
+        self._replicas = []
+        for replica_url in replica_urls:
+            engine = self._create_engine(replica_url, conn_config)
+            self._replicas.append(
+                _Replica(
+                    engine=engine,
+                    read_only_engine=engine.execution_options(postgresql_readonly=True),
+                ),
+            )
+        self._replica_cursor = 0
+        self._replica_retry_sec = conn_config.replica_retry_sec
+        self._pool_min_size = min(conn_config.conn_pool_min_size, conn_config.conn_pool_size)
         self._rollback = conn_config.rollback
 
     async def close(self) -> None:
@@ -47,9 +91,59 @@ class DBManager:
         if self._engine is None:
             raise DBError()
         await self._engine.dispose()
+        for replica in self._replicas:
+            await replica.engine.dispose()
 
         self._engine = None
         self._sessionmaker = None
+        self._read_only_sessionmaker = None
+        self._replicas = []
+
+    async def prewarm(self) -> None:
+        """
+        Open `conn_pool_min_size` connections in primary and replica pools.
+
+        :return:
+        """
+        if self._engine is None:
+            raise DBError()
+
+        engines = [self._engine, *(replica.engine for replica in self._replicas)]
+        async with contextlib.AsyncExitStack() as stack:
+            results = await asyncio.gather(
+                *(
+                    stack.enter_async_context(engine.connect())
+                    for engine in engines
+                    for _ in range(self._pool_min_size)
+                ),
+                return_exceptions=True,
+            )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def pool_stats(self) -> dict[str, PoolStatsSchema]:
+        """
+        Get stats of primary and replica connection pools.
+
+        :return: pool stats by database host
+        """
+        if self._engine is None:
+            raise DBError()
+
+        engines = [self._engine, *(replica.engine for replica in self._replicas)]
+        stats = {}
+        for engine in engines:
+            pool = engine.pool
+            stats[f"{engine.url.host}:{engine.url.port}"] = PoolStatsSchema(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+                wait_time_sec=pool.wait_time_sec,
+                max_wait_time_sec=pool.max_wait_time_sec,
+            )
+        return stats
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -76,28 +170,138 @@ class DBManager:
                     await connection.rollback()
 
     @contextlib.asynccontextmanager
-    async def session(self) -> AsyncIterator[AsyncSession]:
+    async def session(self, read_only: bool = False) -> AsyncIterator[AsyncSession]:
         """
         Create session to database.
 
         If `_rollback` is True, all transactions are rolled back. By default,
         transactions are rolled back if Exception occurs.
 
+        Read-only sessions run `READ ONLY` transactions that are not opened upfront:
+        a connection is acquired on the first statement and repositories release it
+        right after each read, see `RelationalRepoMixin`. They are routed to
+        the least busy available replica, or to primary if there are none;
+        replica sessions have `session.info[REPLICA_SESSION_KEY]` set.
+        Sessions for writes stay on primary, so reads following writes in them
+        see the written data. Callbacks registered in `session.info[AFTER_COMMIT_KEY]`
+        are awaited after the transaction is committed.
+
+        :param read_only: whether to create read-only session
         :yield: database session
         """
         if self._engine is None:
             raise DBError()
 
-        async with self._sessionmaker() as session, session.begin():
-            try:
-                yield session
-            except Exception as error:
-                _logger.exception(
-                    "An exception was raised during session",
-                    exc_info=error,
-                )
-                await session.rollback()
-                raise error
-            else:
-                if self._rollback:
+        if read_only:
+            replica = self._choose_replica()
+            # Without replica, default bind of sessionmaker is read-only primary engine
+            bind = (
+                {"bind": replica.read_only_engine, "info": {REPLICA_SESSION_KEY: True}}
+                if replica
+                else {}
+            )
+            async with self._read_only_sessionmaker(**bind) as session:
+                try:
+                    yield session
+                except Exception as error:
+                    if replica and _is_connection_error(error):
+                        self._mark_unavailable(replica)
+                    raise error
+            return
+
+        async with self._sessionmaker() as session:
+            async with session.begin():
+                try:
+                    yield session
+                except Exception as error:
+                    _logger.exception(
+                        "An exception was raised during session",
+                        exc_info=error,
+                    )
                     await session.rollback()
+                    raise error
+                else:
+                    if self._rollback:
+                        await session.rollback()
+            if not self._rollback:
+                for callback in session.info.pop(AFTER_COMMIT_KEY, []):
+                    await callback()
+
+    def _choose_replica(self) -> _Replica | None:
+        """
+        Choose available replica with the least checked out connections.
+
+        Candidates are rotated on each call to spread sessions between idle replicas.
+
+        :return: replica or None if there are no available replicas
+        """
+        now = time.monotonic()
+        available = [replica for replica in self._replicas if replica.unavailable_until <= now]
+        if not available:
+            return None
+        self._replica_cursor = (self._replica_cursor + 1) % len(available)
+        rotated = available[self._replica_cursor :] + available[: self._replica_cursor]
+        return min(rotated, key=lambda replica: replica.engine.pool.checkedout())
+
+    def _mark_unavailable(self, replica: _Replica) -> None:
+        """
+        Exclude replica from routing for `_replica_retry_sec` after connection error.
+
+        :param replica: replica
+        :return:
+        """
+        replica.unavailable_until = time.monotonic() + self._replica_retry_sec
+        _logger.warning(
+            f"Replica {replica.engine.url!r} is unavailable, "
+            f"retrying in {self._replica_retry_sec} seconds",
+        )
+
+    @classmethod
+    def _create_engine(
+        cls,
+        db_url: str | URL,
+        conn_config: DBConnectionSchema,
+    ) -> AsyncEngine:
+        if conn_config.pgbouncer:
+            # PgBouncer in transaction mode does not keep prepared statements between transactions
+            connect_args = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        else:
+            connect_args = {
+                "statement_cache_size": conn_config.statement_cache_size,
+                "prepared_statement_cache_size": conn_config.statement_cache_size,
+            }
+        return create_async_engine(
+            url=db_url,
+            echo=conn_config.echo,
+            echo_pool=conn_config.echo_pool,
+            isolation_level=conn_config.isolation_level,
+            poolclass=_TimedQueuePool,
+            pool_size=conn_config.conn_pool_size,
+            max_overflow=conn_config.conn_pool_max_overflow,
+            pool_timeout=conn_config.conn_pool_timeout,
+            pool_recycle=conn_config.conn_pool_recycle,
+            pool_pre_ping=conn_config.conn_pool_pre_ping,
+            connect_args=connect_args,
+        )
+
+
+def _is_connection_error(error: BaseException | None) -> bool:
+    """
+    Check whether error or errors it was raised from are caused by lost connection.
+
+    :param error: error
+    :return: whether error is connection error
+    """
+    while error is not None:
+        if isinstance(error, OSError | TimeoutError):
+            return True
+        if isinstance(error, DBAPIError) and error.connection_invalidated:
+            return True
+        if error.__cause__ is None and error.__suppress_context__:
+            return False
+        error = error.__cause__ or error.__context__
+    return False
@@ -0,0 +1,31 @@
+import bisect
+import hashlib
+from collections.abc import Sequence
+
+
+class HashRing:
+    """
+    Consistent hash ring of nodes, each placed at `points_per_node` points.
+
+    Adding a node moves only keys between the new node's points and their predecessors,
+    about `1 / len(nodes)` of all keys, order of nodes does not matter.
+    """
+
+    def __init__(self, nodes: Sequence[str], points_per_node: int = 128):
+        if not nodes:
+            raise ValueError("Hash ring requires at least one node")
+        points = sorted(
+            (self._hash(f"{node}#{point}"), node)
+            for node in nodes
+            for point in range(points_per_node)
+        )
+        self._hashes = [point_hash for point_hash, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def get_node(self, key: str) -> str:
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+    @classmethod
+    def _hash(cls, value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest())
@@ -0,0 +1,58 @@
+import dataclasses
+import hashlib
+
+import orjson
+from fastapi import FastAPI
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.openapi.utils import get_openapi
+
+
+@dataclasses.dataclass(frozen=True)
+class Docs:
+    openapi: bytes
+    etag: str
+    swagger_ui_html: bytes
+    redoc_html: bytes
+
+
+def get_docs(app: FastAPI) -> Docs:
+    """
+    Get OpenAPI schema and documentation pages, building them on first use.
+
+    Routes do not change after startup, so they are built once per worker.
+
+    :param app: application
+    :return: serialized schema with its entity tag and documentation pages
+    """
+    docs = getattr(app.state, "docs", None)
+    if docs is None:
+        docs = build_docs(app)
+        app.state.docs = docs
+    return docs
+
+
+def build_docs(app: FastAPI) -> Docs:
+    """
+    Build OpenAPI schema and documentation pages.
+
+    :param app: application
+    :return: serialized schema with its entity tag and documentation pages
+    """
+    openapi = orjson.dumps(
+        get_openapi(
+            title=app.title,
+            version=app.version,
+            openapi_version=app.openapi_version,
+            description=app.description,
+            routes=app.routes,
+        ),
+    )
+    openapi_url = app.url_path_for("get_openapi_schema")
+    swagger_ui = get_swagger_ui_html(openapi_url=openapi_url, title=app.title + " - Swagger UI")
+    redoc = get_redoc_html(openapi_url=openapi_url, title=app.title + " - ReDoc")
+    return Docs(
+        openapi=openapi,
+        etag=f'"{hashlib.blake2b(openapi, digest_size=16).hexdigest()}"',
+        swagger_ui_html=swagger_ui.body,
+        redoc_html=redoc.body,
+    )
@@ -0,0 +1,38 @@
+import hashlib
+
+from fastapi import Response, status
+
+from configs import settings
+from schemas.base import VersionSchema
+
+
+def create_etag(versions: list[VersionSchema]) -> str:
+    """
+    Create entity tag of resources from their versions.
+
+    Application version is included, so representations change with deployments.
+
+    :param versions: versions of resources in the response
+    :return: quoted entity tag
+    """
+    payload = ",".join(f"{version.id}:{version.version}" for version in versions)
+    digest = hashlib.blake2b(f"{settings.version}|{payload}".encode(), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def is_etag_matched(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check whether `If-None-Match` header matches entity tag, using weak comparison.
+
+    :param if_none_match: `If-None-Match` header value
+    :param etag: current entity tag
+    :return: whether resource is not modified
+    """
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def create_not_modified_response(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
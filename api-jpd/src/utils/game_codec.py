@@ -0,0 +1,48 @@
+import zlib
+
+from schemas.game import GameSchema
+
+GAME_CODEC_VERSION = 1
+
+_FLAG_ZLIB = 0b10
+_JSON_PREFIX = b"{"[0]
+_COMPUTED_FIELDS = frozenset(GameSchema.model_computed_fields)
+
+
+def encode_game(game: GameSchema, compression_min_size: int | None = None) -> bytes:
+    """
+    Encode game as blob of version byte, flags byte and JSON without computed fields.
+
+    JSON larger than `compression_min_size` is compressed with zlib.
+
+    :param game: game
+    :param compression_min_size: minimal size of compressed JSON, `None` to not compress
+    :return: blob
+    """
+    flags, data = 0, game.model_dump_json(exclude=_COMPUTED_FIELDS).encode()
+    if compression_min_size is not None and len(data) >= compression_min_size:
+        flags, data = _FLAG_ZLIB, zlib.compress(data)
+    return bytes((GAME_CODEC_VERSION, flags)) + data
+
+
+def decode_game(blob: bytes | str) -> GameSchema:
+    """
+    Decode game from blob of `encode_game` or from JSON of previous versions.
+
+    :param blob: blob
+    :return: game
+    """
+    if isinstance(blob, str) or blob[0] == _JSON_PREFIX:
+        return GameSchema.model_validate_json(blob)
+
+    version, flags = blob[0], blob[1]
+    if version != GAME_CODEC_VERSION:
+        raise ValueError(f"Unknown game codec version {version}")
+
+    if flags & ~_FLAG_ZLIB:
+        raise ValueError(f"Unknown game codec flags {flags}")
+
+    data = blob[2:]
+    if flags & _FLAG_ZLIB:
+        data = zlib.decompress(data)
+    return GameSchema.model_validate_json(data)
@@ -0,0 +1,19 @@
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+class ModelResponse(JSONResponse):
+    """
+    JSON response of already validated models, serialized once by pydantic-core.
+
+    Routes returning it skip `response_model` validation and serialization, the model
+    is still declared for OpenAPI. Content must consist of instances of the declared
+    models, not their subclasses, or JSON bytes of them.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return pydantic_core.to_json(content)
@@ -0,0 +1,47 @@
+from sqlalchemy import ColumnElement, Enum, Text, case, cast, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+
+def json_object(*columns: ColumnElement, **fields: ColumnElement) -> ColumnElement:
+    """
+    Build `json_build_object` from columns and named expressions.
+
+    Enum columns are stored by member name, so they are mapped to member values
+    to match what pydantic schemas expect.
+
+    :param columns: columns to include under their keys
+    :param fields: extra expressions to include under given names
+    :return: JSON object expression
+    """
+    arguments = []
+    for column in columns:
+        arguments.extend((literal_column(f"'{column.key}'"), _json_value(column)))
+    for name, value in fields.items():
+        arguments.extend((literal_column(f"'{name}'"), value))
+    return func.json_build_object(*arguments)
+
+
+def json_array(value: ColumnElement, *order_by: ColumnElement) -> ColumnElement:
+    """
+    Aggregate values into JSON array, empty array if there are no rows.
+
+    :param value: value to aggregate
+    :param order_by: ordering of aggregated values
+    :return: JSON array expression
+    """
+    aggregated = func.json_agg(aggregate_order_by(value, *order_by) if order_by else value)
+    return func.coalesce(aggregated, literal_column("'[]'::json"))
+
+
+def json_text(value: ColumnElement) -> ColumnElement:
+    return cast(value, Text)
+
+
+def _json_value(column: ColumnElement) -> ColumnElement:
+    enum_class = getattr(column.type, "enum_class", None)
+    if isinstance(column.type, Enum) and enum_class is not None:
+        return case(
+            {member.name: member.value for member in enum_class},
+            value=cast(column, Text),
+        )
+    return column
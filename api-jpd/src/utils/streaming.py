@@ -0,0 +1,110 @@
+import codecs
+import csv
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """
+    Split a stream of byte chunks into numbered, non-empty text lines.
+
+    :param chunks: byte chunks, e.g. a request body stream
+    :yield: line number starting from 1 and decoded line without line break
+    """
+    line_number = 0
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line.decode("utf-8").rstrip("\r")
+
+    if buffer.strip():
+        yield line_number + 1, buffer.decode("utf-8").rstrip("\r")
+
+
+async def iter_csv_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, list[str]]]:
+    """
+    Parse a stream of byte chunks as CSV rows, quoted fields may span lines.
+
+    Lines are fed to one `csv.reader` once quotes of buffered lines are balanced,
+    so the reader never runs out of lines within a row.
+
+    :param chunks: byte chunks, e.g. a request body stream
+    :yield: number of the first line of row starting from 1 and values, empty rows are skipped
+    :raise csv.Error: if row is malformed, message starts with its line number
+    """
+    lines = _CSVLines()
+    reader = csv.reader(lines, strict=True)
+    line_number = row_line_number = 0
+    async for line in _iter_text_lines(chunks):
+        line_number += 1
+        if not lines:
+            row_line_number = line_number
+        lines.append(line)
+        if lines.is_balanced:
+            values = _read_row(reader, row_line_number)
+            if values:
+                yield row_line_number, values
+
+    if lines:
+        _read_row(reader, row_line_number)
+
+
+async def _iter_text_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of byte chunks into text lines with line breaks.
+
+    :param chunks: byte chunks
+    :yield: decoded line
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+def _read_row(reader: Iterator[list[str]], line_number: int) -> list[str]:
+    try:
+        return next(reader)
+    except csv.Error as error:
+        raise csv.Error(f"line {line_number}: {error}") from error
+
+
+class _CSVLines:
+    """Buffer of lines consumed by `csv.reader`, counting quotes of buffered lines."""
+
+    def __init__(self):
+        self._lines: deque[str] = deque()
+        self._quote_count = 0
+
+    def __iter__(self) -> "_CSVLines":
+        return self
+
+    def __next__(self) -> str:
+        if not self._lines:
+            raise StopIteration
+        line = self._lines.popleft()
+        self._quote_count -= line.count('"')
+        return line
+
+    def __bool__(self) -> bool:
+        return bool(self._lines)
+
+    @property
+    def is_balanced(self) -> bool:
+        # Quotes within quoted fields are doubled, so odd count means an open field
+        return self._quote_count % 2 == 0
+
+    def append(self, line: str) -> None:
+        self._lines.append(line)
+        self._quote_count += line.count('"')
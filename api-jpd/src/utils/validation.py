@@ -1,3 +1,4 @@
+import functools
 from collections.abc import Sequence
 
 import pydantic
@@ -38,3 +39,21 @@ def _validate_models(
         return [dto.model_validate(obj, from_attributes=True) for obj in data]
     except pydantic.ValidationError as error:
         raise SQLModelValidationError(error) from error
+
+
+def validate_json_models(
+    data: str | bytes | None,
+    dto: type[schemas.T],
+) -> list[schemas.T]:
+    if data is None:
+        return []
+
+    try:
+        return _get_list_adapter(dto).validate_json(data)
+    except pydantic.ValidationError as error:
+        raise SQLModelValidationError(error) from error
+
+
+@functools.cache
+def _get_list_adapter(dto: type[schemas.T]) -> pydantic.TypeAdapter[list[schemas.T]]:
+    return pydantic.TypeAdapter(list[dto])
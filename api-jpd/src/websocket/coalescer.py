@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from schemas.game import GameEventSchema
+from schemas.game_event.batch import GameBatchEvent, GameBatchPayloadSchema
+
+_logger = logging.getLogger(__name__)
+
+
+class EmitCoalescer:
+    """
+    Merger of game events emitted to one room within `window_sec` into one event.
+
+    The first event of a room schedules emit after window, `0` merges events of one
+    event loop tick. Events are broadcast to the whole room, so all events of a room
+    merge. Events of a room are emitted in order. A single event is emitted as is,
+    several events as `GameBatchEvent` with the latest game and names of merged events.
+    """
+
+    def __init__(self, emit: Callable[..., Awaitable[None]], window_sec: float):
+        self._emit = emit
+        self._window_sec = window_sec
+        self._pending: dict[str | int, list[GameEventSchema]] = {}
+        self._last_tasks: dict[str | int, asyncio.Task] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def add(self, event: GameEventSchema, *, room: str | int) -> None:
+        """
+        Add event to be emitted to room at the end of window.
+
+        :param event: game event, its payload has `game`
+        :param room: room
+        :return:
+        """
+        if room in self._pending:
+            self._pending[room].append(event)
+            return
+
+        self._pending[room] = [event]
+        task = asyncio.create_task(
+            self._emit_after_window(room, previous_task=self._last_tasks.get(room)),
+        )
+        self._last_tasks[room] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda _: self._discard_task(room, task))
+
+    async def flush(self) -> None:
+        """
+        Wait until pending events are emitted.
+
+        :return:
+        """
+        while self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    async def _emit_after_window(
+        self,
+        room: str | int,
+        previous_task: asyncio.Task | None,
+    ) -> None:
+        await asyncio.sleep(self._window_sec)
+        events = self._pending.pop(room)
+        if previous_task is not None:
+            # Events of previous window may still be emitted
+            await previous_task
+
+        if len(events) > 1:
+            event = GameBatchEvent(
+                payload=GameBatchPayloadSchema(
+                    game=events[-1].payload.game,
+                    events=[event.name for event in events],
+                ),
+            )
+        else:
+            event = events[0]
+
+        try:
+            await self._emit(event, room=room)
+        except Exception as error:
+            _logger.warning(
+                "Failed to emit %s events to room %s",
+                len(events),
+                room,
+                exc_info=error,
+            )
+
+    def _discard_task(self, room: str | int, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if self._last_tasks.get(room) is task:
+            del self._last_tasks[room]
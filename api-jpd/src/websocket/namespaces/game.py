@@ -1,10 +1,14 @@
+import asyncio
+import contextlib
 import logging
+import random
+import uuid
 from typing import Any
 from urllib.parse import parse_qs
 
 import socketio
 
-from auth.auth import authenticate_user
+from auth.auth import authenticate_user, create_resume_token, decode_resume_token
 from enums.game import GameStateEnum
 from enums.player import LeadStateEnum, PlayerStateEnum
 from errors.auth import ForbiddenError, UnauthorizedError
@@ -19,16 +23,143 @@ from schemas.game import (
 )
 from schemas.game_event.connect import ConnectEventSchema, DisconnectEventSchema
 from schemas.game_event.error import GameErrorEvent, GameErrorPayloadSchema
+from schemas.game_event.reconnect import (
+    GameReconnectEvent,
+    GameReconnectPayloadSchema,
+    GameResumeEvent,
+    GameResumePayloadSchema,
+)
 from schemas.game_event.start import GameStartedEvent
 from schemas.player import PlayerUpdateSchema
+from schemas.presence import PresenceSchema
 from schemas.user.base import BaseUserSchema
-from services import GameService, UserService
-from services.dependencies import get_game_service
+from services import GameService, PresenceService, UserService
+from services.dependencies import get_game_service, get_presence_service
+from websocket.coalescer import EmitCoalescer
 
 _logger = logging.getLogger(__name__)
 
 
 class GameNamespace(socketio.AsyncNamespace):
+    """
+    Namespace of game events.
+
+    Connected clients receive a short-lived resume token. Reconnecting clients presenting
+    it in `auth` are restored without authentication, database access and query parsing.
+
+    In drain mode new clients are rejected, and games of departing clients are updated
+    in bulk by `drain` instead of one disconnect event at a time. Heartbeats of nodes
+    and their clients are tracked in Redis by `track_presence`, so clients of failed
+    nodes are swept.
+
+    Game events are broadcast to the whole room, their senders included. With
+    `emit_coalesce_sec`, game events of a room are merged by `EmitCoalescer`, so
+    bursts of updates, e.g. of joining players, reach clients as one event.
+    """
+
+    def __init__(self, namespace: str | None = None, emit_coalesce_sec: float | None = None):
+        super().__init__(namespace)
+        self._coalescer = (
+            EmitCoalescer(self._emit, window_sec=emit_coalesce_sec)
+            if emit_coalesce_sec is not None
+            else None
+        )
+        self._node_id = uuid.uuid4().hex[:12]
+        self._presences: dict[str, PresenceSchema] = {}
+        self._is_tracked = False
+        self._draining = False
+        self._departed: set[GameSessionShema] = set()
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def trigger_event(self, event: str, *args) -> Any:
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            return await super().trigger_event(event, *args)
+        finally:
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._idle.set()
+
+    async def drain(self, timeout: float, reconnect_window_sec: float) -> None:
+        """
+        Stop accepting clients and hand connected ones over to other processes.
+
+        In-flight events are awaited up to `timeout`. Then players of clients of this
+        process are marked disconnected in one batch, and clients are told to reconnect
+        after random delays within `reconnect_window_sec`, so that they do not
+        reconnect to remaining processes all at once.
+
+        :param timeout: seconds to wait for in-flight events
+        :param reconnect_window_sec: window of reconnect delays
+        :return:
+        """
+        self._draining = True
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+
+        sids = [sid for sid, _ in self.server.manager.get_participants(self.namespace, None)]
+        sessions = set(self._departed)
+        for sid in sids:
+            with contextlib.suppress(KeyError):
+                game_session = (await self.get_session(sid)).get("game_session")
+                if game_session:
+                    sessions.add(GameSessionShema.model_validate(game_session))
+
+        async with get_game_service() as game_service:
+            games = await game_service.disconnect_players(sessions)
+        async with get_presence_service() as presence_service:
+            await presence_service.untrack(*self._presences.values())
+        self._presences.clear()
+        for game in games:
+            await self._emit_game_event(DisconnectEventSchema, game)
+        if self._coalescer:
+            await self._coalescer.flush()
+
+        window_ms = int(reconnect_window_sec * 1000)
+        for sid in sids:
+            event = GameReconnectEvent(
+                payload=GameReconnectPayloadSchema(delay_ms=random.randint(0, window_ms)),
+            )
+            await self.emit(
+                event=event.name,
+                data=event.payload.model_dump(),
+                room=sid,
+                ignore_queue=True,
+            )
+        _logger.info("Drained %s clients of %s games", len(sids), len(games))
+
+    async def track_presence(self, heartbeat_sec: float, ttl_sec: float) -> None:
+        """
+        Send heartbeats of this node and sweep clients of expired nodes, until cancelled.
+
+        Heartbeat of this node and its clients is sent in one transaction. Other nodes
+        without heartbeats for `ttl_sec` are popped with their clients in one
+        transaction, then games of the clients are updated in bulk.
+
+        :param heartbeat_sec: interval between heartbeats
+        :param ttl_sec: seconds without heartbeats after which clients are disconnected
+        :return:
+        """
+        while True:
+            try:
+                async with get_presence_service() as presence_service:
+                    await self._send_heartbeat(presence_service, *self._presences.values())
+                    expired = await presence_service.pop_expired(self._node_id, ttl_sec)
+                if expired:
+                    async with get_game_service() as game_service:
+                        games = await game_service.disconnect_players(
+                            presence.session for presence in expired
+                        )
+                    for game in games:
+                        await self._emit_game_event(DisconnectEventSchema, game)
+                    _logger.info("Swept %s stale clients of %s games", len(expired), len(games))
+            except Exception as error:
+                _logger.warning("Failed to track presence", exc_info=error)
+            await asyncio.sleep(heartbeat_sec)
+
     @handle_event_errors(emit_error=True, return_value=False)
     async def on_connect(
         self,
@@ -36,6 +167,9 @@ class GameNamespace(socketio.AsyncNamespace):
         environ: dict[str, Any],
         auth: dict[str, Any] | None = None,
     ) -> bool:
+        if self._draining:
+            raise socketio.exceptions.ConnectionRefusedError("Server is restarting, reconnect")
+
         async with get_game_service() as game_service:
             return await self._connect(
                 sid=sid,
@@ -47,9 +181,13 @@ class GameNamespace(socketio.AsyncNamespace):
 
     @handle_event_errors(emit_error=False, return_value=None)
     async def on_disconnect(self, sid: str, reason: str) -> None:
-        async with get_game_service() as game_service:
-            await self._disconnect(sid=sid, game_service=game_service)
-        _logger.info(f"Client {sid} disconnected, reason: {reason}.")
+        if self._draining:
+            # Games are updated in bulk by `drain`
+            self._departed.add(await self._get_session(sid))
+        else:
+            async with get_game_service() as game_service:
+                await self._disconnect(sid=sid, game_service=game_service)
+        _logger.info("Client %s disconnected, reason: %s.", sid, reason)
 
     @handle_event_errors(emit_error=True, return_value=None)
     async def on_game_start(self, sid: str) -> None:
@@ -64,24 +202,32 @@ class GameNamespace(socketio.AsyncNamespace):
         game_service: GameService,
         user_service: UserService,
     ) -> bool:
+        if auth and auth.get("resume_token"):
+            try:
+                session = decode_resume_token(auth["resume_token"])
+            except UnauthorizedError as error:
+                _logger.info("Client %s not resumed: %s", sid, error.detail)
+            else:
+                return await self._resume(sid=sid, session=session, game_service=game_service)
+
         try:
             user = await self._authenticate(auth, user_service=user_service)
         except UnauthorizedError as error:
-            _logger.info(f"Client {sid} rejected: {error.detail}")
+            _logger.info("Client %s rejected: %s", sid, error.detail)
             await self._emit_error(error.detail, room=sid)
             return False
 
         try:
             game_id = self._get_game_from_environment(environ)
         except BadRequestError as error:
-            _logger.info(f"Client {sid} rejected: {error.detail}")
+            _logger.info("Client %s rejected: %s", sid, error.detail)
             await self._emit_error(error.detail, room=sid)
             return False
 
         try:
             game = await self._get_game(game_id, game_service=game_service)
         except NotFoundError as error:
-            _logger.info(f"Client {sid} rejected: no lobby with ID {game_id}")
+            _logger.info("Client %s rejected: no lobby with ID %s", sid, game_id)
             await self._emit_error(error.detail, room=sid)
             return False
 
@@ -93,12 +239,30 @@ class GameNamespace(socketio.AsyncNamespace):
                 game_service=game_service,
             )
         except ForbiddenError as error:
-            _logger.info(f"Client {sid} rejected: {error.detail}")
+            _logger.info("Client %s rejected: %s", sid, error.detail)
             await self._emit_error(error.detail, room=sid)
             return False
 
-        await self._emit_game_event(ConnectEventSchema, game=game, skip_sid=sid)
-        _logger.info(f"Client {sid} connected to game {game.id}")
+        await self._emit_game_event(ConnectEventSchema, game=game)
+        _logger.info("Client %s connected to game %s", sid, game.id)
+        return True
+
+    async def _resume(
+        self,
+        sid: str,
+        session: GameSessionShema,
+        game_service: GameService,
+    ) -> bool:
+        try:
+            game = await game_service.reconnect_player(session)
+        except (NotFoundError, ForbiddenError) as error:
+            _logger.info("Client %s rejected: %s", sid, error.detail)
+            await self._emit_error(error.detail, room=sid)
+            return False
+
+        await self._enter_game(sid, session)
+        await self._emit_game_event(ConnectEventSchema, game=game)
+        _logger.info("Client %s resumed in game %s", sid, game.id)
         return True
 
     async def _disconnect(self, sid: str, game_service: GameService) -> None:
@@ -122,7 +286,8 @@ class GameNamespace(socketio.AsyncNamespace):
                 game_service=game_service,
             )
 
-        await self._emit_game_event(DisconnectEventSchema, game, skip_sid=sid)
+        await self._untrack_presence(sid)
+        await self._emit_game_event(DisconnectEventSchema, game)
 
     async def _start_game(self, sid: str, game_service: GameService) -> None:
         session = await self._get_session(sid)
@@ -166,10 +331,28 @@ class GameNamespace(socketio.AsyncNamespace):
         else:
             game = await self._join_as_new_player(game, user, game_service=game_service)
 
-        await self._set_session(sid=sid, game_id=game.id, player_id=user.id, is_lead=is_lead)
-        await self.enter_room(sid=sid, room=self._get_room(game.id))
+        await self._enter_game(
+            sid,
+            GameSessionShema(game_id=game.id, player_id=user.id, is_lead=is_lead),
+        )
         return game
 
+    async def _enter_game(self, sid: str, session: GameSessionShema) -> None:
+        await self._set_session(
+            sid=sid,
+            game_id=session.game_id,
+            player_id=session.player_id,
+            is_lead=session.is_lead,
+        )
+        await self.enter_room(sid=sid, room=self._get_room(session.game_id))
+        await self._track_presence(sid, session)
+        await self._emit(
+            GameResumeEvent(
+                payload=GameResumePayloadSchema(resume_token=create_resume_token(session)),
+            ),
+            room=sid,
+        )
+
     async def _rejoin_as_player(
         self,
         game: GameSchema,
@@ -216,6 +399,31 @@ class GameNamespace(socketio.AsyncNamespace):
         else:
             raise ForbiddenError(f"Game {game.id} has been started")
 
+    async def _track_presence(self, sid: str, session: GameSessionShema) -> None:
+        presence = PresenceSchema(node_id=self._node_id, sid=sid, session=session)
+        self._presences[sid] = presence
+        async with get_presence_service() as presence_service:
+            await self._send_heartbeat(presence_service, presence)
+
+    async def _send_heartbeat(
+        self,
+        presence_service: PresenceService,
+        *presences: PresenceSchema,
+    ) -> None:
+        is_added = await presence_service.track(self._node_id, *presences)
+        if is_added and self._is_tracked:
+            # Other node swept clients of this one, e.g. after a long event loop stall
+            _logger.warning("Clients of this node were swept, disconnecting them to reconnect")
+            for sid in list(self._presences):
+                await self.disconnect(sid)
+        self._is_tracked = True
+
+    async def _untrack_presence(self, sid: str) -> None:
+        presence = self._presences.pop(sid, None)
+        if presence:
+            async with get_presence_service() as presence_service:
+                await presence_service.untrack(presence)
+
     async def _get_session(self, sid: str) -> GameSessionShema:
         async with self.session(sid) as session:
             game_session: dict = session.get("game_session")
@@ -237,11 +445,14 @@ class GameNamespace(socketio.AsyncNamespace):
         game: GameSchema,
         *,
         room: str | int | None = None,
-        skip_sid: str | list[str] | None = None,
     ) -> None:
         if room is None:
             room = self._get_room(game.id)
-        await self._emit(schema(payload=GamePayloadSchema(game=game)), room=room, skip_sid=skip_sid)
+        event = schema(payload=GamePayloadSchema(game=game))
+        if self._coalescer:
+            self._coalescer.add(event, room=room)
+        else:
+            await self._emit(event, room=room)
 
     async def _emit_error(self, detail: str, *, room: str | int | None = None) -> None:
         await self._emit(
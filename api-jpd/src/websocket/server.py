@@ -1,15 +1,29 @@
+import logging
+
 import socketio
 
 from configs import settings
+from configs.logging_settings import ENGINEIO_LOGGER_NAME, SOCKETIO_LOGGER_NAME
 from websocket.namespaces import GameNamespace
+from websocket.sticky import create_sid_generator
+
+if settings.storage_backend == "memory":
+    client_manager = socketio.AsyncManager()
+else:
+    client_manager = socketio.AsyncRedisManager(url=str(settings.redis_url))
 
 sio = socketio.AsyncServer(
-    client_manager=socketio.AsyncRedisManager(url=str(settings.redis_url)),
+    client_manager=client_manager,
     async_mode="asgi",
     cors_allowed_origins="*",
-    logger=True,
-    engineio_logger=True,
+    http_compression=True,
+    compression_threshold=settings.compression_minimum_size,
+    logger=logging.getLogger(SOCKETIO_LOGGER_NAME),
+    engineio_logger=logging.getLogger(ENGINEIO_LOGGER_NAME),
 )
 
+if settings.worker_id is not None:
+    sio.eio.generate_id = create_sid_generator(sio.eio.generate_id, settings.worker_id)
 
-sio.register_namespace(GameNamespace("/game"))
+game_namespace = GameNamespace("/game", emit_coalesce_sec=settings.ws_emit_coalesce_sec)
+sio.register_namespace(game_namespace)
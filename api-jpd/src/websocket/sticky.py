@@ -0,0 +1,280 @@
+import asyncio
+import contextlib
+import dataclasses
+import logging
+import re
+from collections.abc import Callable, Sequence
+
+_logger = logging.getLogger(__name__)
+
+_SID_SEPARATOR = "."
+_SID_PATTERN = re.compile(rb"[?&]sid=(\d+)\.")
+_CHUNK_SIZE = 65536
+_FORWARDED_FOR_HEADER = b"x-forwarded-for"
+_BAD_GATEWAY_RESPONSE = (
+    b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+)
+
+
+def create_sid_generator(generate_id: Callable[[], str], worker_id: int) -> Callable[[], str]:
+    """
+    Create engine.io session ID generator prefixing IDs with worker ID.
+
+    :param generate_id: original generator
+    :param worker_id: worker ID
+    :return: session ID generator
+    """
+
+    def generate_worker_id() -> str:
+        return f"{worker_id}{_SID_SEPARATOR}{generate_id()}"
+
+    return generate_worker_id
+
+
+def get_sid_worker_id(request_line: bytes) -> int | None:
+    """
+    Get ID of worker that created engine.io session of HTTP request.
+
+    :param request_line: request line, e.g. `GET /ws/?EIO=4&sid=1.abc HTTP/1.1`
+    :return: worker ID or None if request has no session ID of worker
+    """
+    match = _SID_PATTERN.search(request_line)
+    return int(match.group(1)) if match else None
+
+
+@dataclasses.dataclass
+class _WorkerConnection:
+    worker_id: int
+    writer: asyncio.StreamWriter
+    response_task: asyncio.Task
+
+
+class StickyFront:
+    """
+    TCP front routing engine.io sessions to worker processes that created them.
+
+    Long-polling requests of a session must reach the worker holding it, so workers
+    prefix session IDs with their IDs and the front reads request line and headers of
+    each request to route it. Clients reuse keep-alive connections for requests of
+    different sessions, so a request of a session of another worker switches connection
+    to that worker. Requests without session ID, handshakes and other API requests,
+    stay on worker of connection, first ones go to the worker with the least open
+    connections. Websocket upgrades and chunked request bodies are piped as is until
+    connection is closed.
+
+    Requests without session ID go to another worker if theirs is unavailable, requests
+    of sessions of unavailable workers get 502. Client address is passed to workers in
+    `X-Forwarded-For` header, replacing one sent by client.
+    """
+
+    def __init__(self, worker_paths: Sequence[str]):
+        self._worker_paths = list(worker_paths)
+        self._connection_counts = [0] * len(worker_paths)
+        self._retired_worker_ids: set[int] = set()
+
+    def retire_worker(self, worker_id: int) -> None:
+        """
+        Stop routing requests without session ID to worker, e.g. while it is draining.
+
+        Requests of its sessions are still routed to it.
+
+        :param worker_id: worker ID
+        :return:
+        """
+        self._retired_worker_ids.add(worker_id)
+
+    async def serve(self, host: str, port: int) -> None:
+        """
+        Accept connections until cancelled.
+
+        :param host: host to bind
+        :param port: port to bind
+        :return:
+        """
+        server = await asyncio.start_server(self._handle, host=host, port=port, reuse_address=True)
+        async with server:
+            await server.serve_forever()
+
+    def choose_worker(self, request_line: bytes) -> int:
+        """
+        Choose worker for request.
+
+        :param request_line: request line
+        :return: worker ID
+        """
+        worker_id = self._get_sid_worker_id(request_line)
+        if worker_id is not None:
+            return worker_id
+        return min(range(len(self._worker_paths)), key=self._connection_counts.__getitem__)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = None
+        peername = writer.get_extra_info("peername")
+        client_host = peername[0] if isinstance(peername, tuple) else None
+        try:
+            while head := await _read_head(reader):
+                request_line, headers = _parse_head(head)
+                worker_id = self._get_sid_worker_id(request_line)
+                if connection is None or worker_id not in (None, connection.worker_id):
+                    # Client sends next request after reading response, previous one is done
+                    await self._disconnect(connection)
+                    connection = await self._connect_request(worker_id, writer)
+                    if connection is None:
+                        writer.write(_BAD_GATEWAY_RESPONSE)
+                        await writer.drain()
+                        return
+
+                connection.writer.write(_set_forwarded_for(head, client_host))
+                if b"upgrade" in headers or b"chunked" in headers.get(b"transfer-encoding", b""):
+                    await _pipe(reader, connection.writer)
+                    await connection.response_task
+                    return
+                content_length = int(headers.get(b"content-length", 0))
+                if content_length:
+                    connection.writer.write(await reader.readexactly(content_length))
+                await connection.writer.drain()
+        except (
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            ConnectionError,
+            ValueError,
+        ):
+            pass
+        finally:
+            await self._disconnect(connection)
+            writer.close()
+
+    async def _connect_request(
+        self,
+        sid_worker_id: int | None,
+        writer: asyncio.StreamWriter,
+    ) -> _WorkerConnection | None:
+        """
+        Connect to worker of session or, for requests without session, to any available one.
+
+        :param sid_worker_id: ID of worker of session of request
+        :param writer: client stream
+        :return: worker connection or None if no suitable worker is available
+        """
+        if sid_worker_id is not None:
+            return await self._connect(sid_worker_id, writer)
+        for worker_id in sorted(
+            set(range(len(self._worker_paths))) - self._retired_worker_ids,
+            key=self._connection_counts.__getitem__,
+        ):
+            if connection := await self._connect(worker_id, writer):
+                return connection
+        return None
+
+    async def _connect(
+        self,
+        worker_id: int,
+        writer: asyncio.StreamWriter,
+    ) -> _WorkerConnection | None:
+        try:
+            worker_reader, worker_writer = await asyncio.open_unix_connection(
+                self._worker_paths[worker_id],
+            )
+        except OSError as error:
+            _logger.warning("Worker %s is unavailable", worker_id, exc_info=error)
+            return None
+
+        self._connection_counts[worker_id] += 1
+        return _WorkerConnection(
+            worker_id=worker_id,
+            writer=worker_writer,
+            response_task=asyncio.create_task(_pipe_responses(worker_reader, writer)),
+        )
+
+    async def _disconnect(self, connection: _WorkerConnection | None) -> None:
+        if connection is None:
+            return
+        connection.response_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await connection.response_task
+        connection.writer.close()
+        self._connection_counts[connection.worker_id] -= 1
+
+    def _get_sid_worker_id(self, request_line: bytes) -> int | None:
+        worker_id = get_sid_worker_id(request_line)
+        return worker_id if worker_id is not None and worker_id < len(self._worker_paths) else None
+
+
+async def _read_head(reader: asyncio.StreamReader) -> bytes:
+    """
+    Read request line and headers of next request.
+
+    :param reader: client stream
+    :return: request head, empty at end of stream
+    """
+    try:
+        return await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as error:
+        if error.partial:
+            raise
+        return b""
+
+
+def _parse_head(head: bytes) -> tuple[bytes, dict[bytes, bytes]]:
+    """
+    Parse request head.
+
+    :param head: request line and headers
+    :return: request line and lower-cased header values by lower-cased names
+    """
+    request_line, *lines = head.split(b"\r\n")
+    headers = {}
+    for line in lines:
+        name, separator, value = line.partition(b":")
+        if separator:
+            headers[name.strip().lower()] = value.strip().lower()
+    return request_line, headers
+
+
+def _set_forwarded_for(head: bytes, client_host: str | None) -> bytes:
+    """
+    Replace `X-Forwarded-For` headers of request by client address.
+
+    :param head: request line and headers
+    :param client_host: client address, headers are only removed if unknown
+    :return: request head
+    """
+    lines = [
+        line
+        for line in head.removesuffix(b"\r\n\r\n").split(b"\r\n")
+        if line.partition(b":")[0].strip().lower() != _FORWARDED_FOR_HEADER
+    ]
+    if client_host:
+        lines.append(b"X-Forwarded-For: " + client_host.encode())
+    return b"\r\n".join(lines) + b"\r\n\r\n"
+
+
+async def _pipe_responses(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """
+    Copy responses of worker to client, closing client connection when worker closes it.
+
+    :param reader: worker stream
+    :param writer: client stream
+    :return:
+    """
+    with contextlib.suppress(ConnectionError):
+        while chunk := await reader.read(_CHUNK_SIZE):
+            writer.write(chunk)
+            await writer.drain()
+    writer.close()
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """
+    Copy bytes from reader to writer until end of stream, then half-close writer.
+
+    :param reader: source stream
+    :param writer: destination stream
+    :return:
+    """
+    with contextlib.suppress(ConnectionError):
+        while chunk := await reader.read(_CHUNK_SIZE):
+            writer.write(chunk)
+            await writer.drain()
+        if writer.can_write_eof():
+            writer.write_eof()
@@ -0,0 +1,33 @@
+import pytest
+
+from auth.auth import (
+    authenticate_user,
+    create_access_token,
+    create_resume_token,
+    decode_resume_token,
+)
+from errors.auth import UnauthorizedError
+from schemas.game import GameSessionShema
+
+
+def test_resume_token_restores_session():
+    session = GameSessionShema(game_id=10, player_id=2, is_lead=True)
+
+    assert decode_resume_token(create_resume_token(session)) == session
+
+
+def test_access_token_is_not_resume_token():
+    for username in ("user", "game.resume"):
+        token = create_access_token({"sub": username, "user_id": 2})
+
+        with pytest.raises(UnauthorizedError):
+            decode_resume_token(token)
+    with pytest.raises(UnauthorizedError):
+        decode_resume_token("invalid")
+
+
+async def test_resume_token_is_not_access_token():
+    session = GameSessionShema(game_id=10, player_id=2, is_lead=True)
+
+    with pytest.raises(UnauthorizedError):
+        await authenticate_user(create_resume_token(session), user_service=None)
@@ -0,0 +1,53 @@
+import logging
+
+import orjson
+
+from configs.logging_settings import (
+    SOCKETIO_LOGGER_NAME,
+    JsonFormatter,
+    ProjectLoggerFilter,
+    SamplingFilter,
+)
+
+
+def create_record(name: str, level: int, msg: str = "message %s", args: tuple = ("arg",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_project_logger_filter_caches_levels_by_logger_name():
+    log_filter = ProjectLoggerFilter()
+
+    assert log_filter.filter(create_record("services.game", log_filter.project_log_level))
+    assert not log_filter.filter(create_record("sqlalchemy.engine", logging.INFO))
+    assert log_filter.filter(create_record("sqlalchemy.engine", logging.WARNING))
+    assert log_filter._min_levels == {
+        "services.game": log_filter.project_log_level,
+        "sqlalchemy.engine": logging.WARNING,
+    }
+
+
+def test_sampling_filter_passes_every_nth_record_below_warning():
+    log_filter = SamplingFilter((SOCKETIO_LOGGER_NAME,), rate=0.25)
+
+    passed = [
+        log_filter.filter(create_record(SOCKETIO_LOGGER_NAME, logging.INFO)) for _ in range(8)
+    ]
+    assert passed == [True, False, False, False] * 2
+    assert log_filter.filter(create_record(SOCKETIO_LOGGER_NAME, logging.WARNING))
+    assert log_filter.filter(create_record("websocket.namespaces.game", logging.INFO))
+
+
+def test_json_formatter_writes_one_line_per_record():
+    try:
+        raise ValueError("error")
+    except ValueError as error:
+        record = create_record("services.game", logging.ERROR)
+        record.exc_info = (type(error), error, error.__traceback__)
+
+    line = JsonFormatter().format(record)
+
+    assert "\n" not in line
+    entry = orjson.loads(line)
+    assert entry["message"] == "message arg"
+    assert entry["logger"] == "services.game"
+    assert "ValueError: error" in entry["exc_info"]
@@ -0,0 +1,80 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from middlewares import CompressionMiddleware
+
+ITEMS = [{"id": i, "name": f"Category {i}"} for i in range(100)]
+
+
+@pytest.fixture
+def compression_client() -> TestClient:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=512)
+
+    @app.get("/large")
+    async def large():
+        return ORJSONResponse(ITEMS, headers={"ETag": '"tag"'})
+
+    @app.get("/small")
+    async def small():
+        return ITEMS[:1]
+
+    @app.get("/not-modified")
+    async def not_modified():
+        return Response(status_code=304, headers={"ETag": '"tag"'})
+
+    @app.get("/stream")
+    async def stream():
+        chunks = (f"{item}\n".encode() for item in ITEMS)
+        return StreamingResponse(chunks, media_type="application/x-ndjson")
+
+    return TestClient(app)
+
+
+def test_large_json_is_compressed(compression_client: TestClient):
+    resp = compression_client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["Vary"] == "Accept-Encoding"
+    assert resp.headers["ETag"] == 'W/"tag"'
+    assert int(resp.headers["Content-Length"]) < len(resp.content)
+    assert resp.json() == ITEMS
+
+
+def test_small_and_bodyless_responses_are_not_compressed(compression_client: TestClient):
+    small = compression_client.get("/small", headers={"Accept-Encoding": "gzip"})
+    not_modified = compression_client.get("/not-modified", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in small.headers
+    assert small.headers["Vary"] == "Accept-Encoding"
+    assert not_modified.status_code == 304
+    assert "Content-Encoding" not in not_modified.headers
+
+
+def test_streaming_response_is_compressed(compression_client: TestClient):
+    resp = compression_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in resp.headers
+    assert resp.text.count("\n") == len(ITEMS)
+
+
+def test_negotiation_respects_quality_values():
+    middleware = CompressionMiddleware(app=None)
+
+    assert middleware.negotiate("gzip;q=0, identity") is None
+    assert middleware.negotiate("deflate, gzip;q=0.5") == "gzip"
+    assert middleware.negotiate("*") == "gzip"
+    assert middleware.negotiate("br, zstd") is None
+
+
+def test_gzip_compressor_output_is_valid_gzip():
+    compressor = CompressionMiddleware(app=None).create_compressor("gzip")
+
+    data = compressor.compress(b"x" * 10) + compressor.compress(b"y") + compressor.flush()
+
+    assert gzip.decompress(data) == b"x" * 10 + b"y"
@@ -0,0 +1,77 @@
+import inspect
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Select
+
+import repositories
+from constants import REPLICA_SESSION_KEY
+from repositories import CategoryRepo
+from schemas.category.nested import CategorySchema
+from schemas.storage import CacheConfigSchema, RedisConnectionSchema
+from schemas.user.base import UserPublicSchema
+from storages.cache import CacheManager
+from storages.memory import MemoryRedisManager
+
+
+def _create_category(version: int) -> CategorySchema:
+    return CategorySchema(
+        id=1,
+        name=f"Category v{version}",
+        owner_id=1,
+        version=version,
+        owner=UserPublicSchema(id=1, username="owner", created_at=datetime(2025, 1, 1)),
+        prompts=[],
+        lobbies=[],
+        lobby_categories=[],
+    )
+
+
+async def test_select_many_reloads_cached_values_of_other_versions():
+    redis_manager = MemoryRedisManager(conn_config=RedisConnectionSchema(host="memory", port=0))
+    cache_manager = CacheManager(redis_manager=redis_manager, conn_config=CacheConfigSchema())
+    category_repo = CategoryRepo(session=SimpleNamespace(info={}), cache_manager=cache_manager)
+    stale_category, category = _create_category(version=1), _create_category(version=2)
+    await cache_manager.set_many("category", {1: stale_category.model_dump_json()})
+    selected = []
+
+    async def select_json(stmt: Select) -> list[CategorySchema]:
+        selected.append(stmt)
+        return [category]
+
+    category_repo._select_json = select_json
+
+    assert await category_repo.select_many(1) == [stale_category]
+    assert await category_repo.select_many(1, versions={1: 2}) == [category]
+    assert await category_repo.select_many(1, versions={1: 2}) == [category]
+    assert len(selected) == 1
+
+
+async def test_replica_reads_are_not_cached():
+    redis_manager = MemoryRedisManager(conn_config=RedisConnectionSchema(host="memory", port=0))
+    cache_manager = CacheManager(redis_manager=redis_manager, conn_config=CacheConfigSchema())
+    category_repo = CategoryRepo(
+        session=SimpleNamespace(info={REPLICA_SESSION_KEY: True}),
+        cache_manager=cache_manager,
+    )
+    category = _create_category(version=1)
+
+    async def select_json(stmt: Select) -> list[CategorySchema]:
+        return [category]
+
+    category_repo._select_json = select_json
+
+    # Replicas may lag behind invalidations
+    assert await category_repo.select_many(1) == [category]
+    assert await cache_manager.get_many("category", [1]) == {}
+
+
+@pytest.mark.parametrize(
+    "repo_class",
+    [getattr(repositories, name) for name in dir(repositories) if name.endswith("Repo")],
+)
+def test_repos_are_built_from_dependencies(repo_class: type):
+    dependencies = inspect.signature(repo_class).parameters
+
+    assert isinstance(repo_class(**dict.fromkeys(dependencies)), repo_class)
@@ -0,0 +1,55 @@
+import contextlib
+from collections.abc import AsyncIterator
+
+import pytest
+import redis.asyncio as redis
+
+from errors.storage import RedisBaseError
+from repositories import GameRepo
+
+
+class _FailingPipeline:
+    def __init__(self):
+        self.commands = []
+
+    async def __aenter__(self) -> "_FailingPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    def set(self, *args, **kwargs) -> None:
+        self.commands.append(args)
+
+    async def execute(self) -> list:
+        raise redis.ConnectionError("Connection reset")
+
+
+class _FailingRedisManager:
+    shards = ()
+
+    def __init__(self):
+        self.pipe = _FailingPipeline()
+
+    @contextlib.asynccontextmanager
+    async def client(self) -> AsyncIterator["_FailingRedisManager"]:
+        yield self
+
+    def pipeline(self, transaction: bool) -> _FailingPipeline:
+        return self.pipe
+
+    def get_client_cache(self, namespace: str) -> None:
+        return None
+
+
+async def test_pipeline_sends_commands_together_and_maps_errors():
+    redis_manager = _FailingRedisManager()
+    game_repo = GameRepo(redis_manager=redis_manager)
+
+    with pytest.raises(RedisBaseError):
+        await game_repo.set_many({"game:game:game_id=1": "{}", "game:game:game_id=2": "{}"})
+
+    assert [command[0] for command in redis_manager.pipe.commands] == [
+        "game:game:game_id=1",
+        "game:game:game_id=2",
+    ]
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from enums.prompt import PromptTypeEnum
+from repositories import PromptRepo
+from schemas.prompt.base import PromptCreateSchema
+
+
+class _StubSession:
+    def __init__(self):
+        self.info = {}
+        self.statements = []
+
+    async def execute(self, query, params=None):
+        self.statements.append(str(query.compile(dialect=postgresql.dialect())))
+
+    async def scalar(self, query, params=None):
+        self.statements.append(str(query.compile(dialect=postgresql.dialect())))
+
+
+async def test_insert_locks_category_before_counting_prompts():
+    session = _StubSession()
+    prompt_repo = PromptRepo(session=session, cache_manager=SimpleNamespace())
+    prompt = PromptCreateSchema(
+        category_id=1,
+        question="question",
+        question_type=PromptTypeEnum.TEXT,
+        answer="answer",
+        answer_type=PromptTypeEnum.TEXT,
+        order=1,
+        score=100,
+    )
+
+    assert await prompt_repo.insert(prompt) is None
+
+    lock, insert = session.statements
+    assert lock.startswith("SELECT prompt_category.id")
+    assert lock.endswith("FOR UPDATE")
+    assert insert.startswith("INSERT INTO prompt")
@@ -8,3 +8,25 @@ async def test_internal_health(client: TestClient):
     resp = client.get("/api/health")
     assert resp.status_code == status.HTTP_200_OK
     assert resp.json().get("version") == settings.version
+
+
+async def test_internal_ready_until_pools_are_warm(client: TestClient):
+    client.app.state.ready = False
+    resp = client.get("/api/ready")
+    assert resp.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    client.app.state.ready = True
+    resp = client.get("/api/ready")
+    assert resp.status_code == status.HTTP_200_OK
+
+
+async def test_internal_openapi_schema_is_cached_with_etag(client: TestClient):
+    auth = (settings.openapi_schema_user, settings.openapi_schema_pass)
+    resp = client.get("/api/openapi.json", auth=auth)
+    assert resp.status_code == status.HTTP_200_OK
+    assert "/api/v1/lobby" in resp.json()["paths"]
+
+    etag = resp.headers["ETag"]
+    resp = client.get("/api/openapi.json", auth=auth, headers={"If-None-Match": etag})
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+    assert resp.headers["ETag"] == etag.removeprefix("W/")
@@ -0,0 +1,143 @@
+from collections.abc import AsyncIterator
+
+from enums.transfer import TransferFormatEnum
+from schemas.category.nested import CategoryTransferSchema
+from services.category_transfer import CategoryTransferService
+
+NDJSON_DATA = (
+    b'{"name": "Animals", "prompts": [{"question": "q", "question_type": "text", '
+    b'"answer": "a", "answer_type": "image", "order": 1, "score": 100}]}\n'
+    b'{"name": "Empty"}\n'
+)
+
+
+async def _chunks(data: bytes, size: int = 7) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+class _StubTransferRepo:
+    def __init__(self, categories: list[CategoryTransferSchema]):
+        self._categories = categories
+
+    async def stream_categories(self, owner_id: int) -> AsyncIterator[CategoryTransferSchema]:
+        for category in self._categories:
+            yield category
+
+
+async def test_parse_ndjson_reports_invalid_lines():
+    errors = []
+    data = NDJSON_DATA + b'{"name": "x"}\n'
+    records = [r async for r in CategoryTransferService._parse_ndjson(_chunks(data), errors)]
+
+    assert records == [
+        (1, "1", "Animals", "q", "TEXT", "a", "IMAGE", 1, 100),
+        (2, "2", "Empty", None, None, None, None, None, None),
+    ]
+    assert len(errors) == 1
+    assert errors[0].startswith("line 3:")
+
+
+async def test_parse_csv_groups_by_category_name():
+    errors = []
+    data = (
+        b"category_name,question,question_type,answer,answer_type,order,score\n"
+        b"Animals,q,text,a,text,1,100\r\n"
+        b"Empty,,,,,,\n"
+        b"Broken,q\n"
+    )
+    records = [r async for r in CategoryTransferService._parse_csv(_chunks(data), errors)]
+
+    assert records == [
+        (2, "Animals", "Animals", "q", "TEXT", "a", "TEXT", 1, 100),
+        (3, "Empty", "Empty", None, None, None, None, None, None),
+    ]
+    assert len(errors) == 1
+    assert errors[0].startswith("line 4:")
+
+
+async def test_import_reports_too_long_prompts():
+    question = "q" * 257
+    ndjson_data = (
+        b'{"name": "Long", "prompts": [{"question": "' + question.encode() + b'", '
+        b'"question_type": "text", "answer": "a", "answer_type": "text", "order": 1, '
+        b'"score": 100}]}\n'
+    )
+    csv_data = (
+        b"category_name,question,question_type,answer,answer_type,order,score\n"
+        b"Long," + question.encode() + b",text,a,text,1,100\n"
+    )
+
+    for parser, data in (
+        (CategoryTransferService._parse_ndjson, ndjson_data),
+        (CategoryTransferService._parse_csv, csv_data),
+    ):
+        errors = []
+        assert [r async for r in parser(_chunks(data), errors)] == []
+        assert len(errors) == 1
+        assert "256" in errors[0]
+
+
+async def test_export_round_trips_through_import_parser():
+    categories = [
+        CategoryTransferSchema.model_validate_json(line) for line in NDJSON_DATA.splitlines()
+    ]
+    service = CategoryTransferService(category_transfer_repo=_StubTransferRepo(categories))
+
+    for transfer_format in TransferFormatEnum:
+        exported = b"".join(
+            [chunk async for chunk in service.export_categories(transfer_format, user_id=1)],
+        )
+        parser = {
+            TransferFormatEnum.CSV: service._parse_csv,
+            TransferFormatEnum.NDJSON: service._parse_ndjson,
+        }[transfer_format]
+        errors = []
+        records = [r async for r in parser(_chunks(exported), errors)]
+
+        assert not errors
+        assert [r[2:] for r in records] == [
+            ("Animals", "q", "TEXT", "a", "IMAGE", 1, 100),
+            ("Empty", None, None, None, None, None, None),
+        ]
+
+
+async def test_csv_export_round_trips_multi_line_fields():
+    category = CategoryTransferSchema.model_validate(
+        {
+            "name": 'Quotes, "lines"',
+            "prompts": [
+                {
+                    "question": "First line\nsecond line",
+                    "question_type": "text",
+                    "answer": 'Answer "one"\r\n\nlast',
+                    "answer_type": "text",
+                    "order": 1,
+                    "score": 100,
+                },
+            ],
+        },
+    )
+    service = CategoryTransferService(category_transfer_repo=_StubTransferRepo([category]))
+    exported = b"".join(
+        [chunk async for chunk in service.export_categories(TransferFormatEnum.CSV, user_id=1)],
+    )
+
+    errors = []
+    records = [r async for r in service._parse_csv(_chunks(exported + b'Open,"q\n'), errors)]
+
+    assert records == [
+        (
+            2,
+            'Quotes, "lines"',
+            'Quotes, "lines"',
+            "First line\nsecond line",
+            "TEXT",
+            'Answer "one"\r\n\nlast',
+            "TEXT",
+            1,
+            100,
+        ),
+    ]
+    assert len(errors) == 1
+    assert errors[0].startswith("line 6:")
@@ -0,0 +1,88 @@
+from collections.abc import Callable
+
+import pytest
+
+from enums.game import GameStateEnum
+from enums.player import LeadStateEnum, PlayerStateEnum
+from errors.auth import ForbiddenError
+from schemas.game import GameSchema, GameSessionShema
+from schemas.player import LeadSchema, PlayerSchema
+from services.game import GameService
+
+
+class _StubGameRepo:
+    def __init__(self, games: list[GameSchema]):
+        self.games = {game.id: game.model_dump_json() for game in games}
+        self.calls = []
+
+    async def get_game(self, game_id: int) -> GameSchema | None:
+        self.calls.append("get_game")
+        return GameSchema.model_validate_json(self.games[game_id])
+
+    async def set_game(self, game: GameSchema) -> None:
+        self.calls.append("set_game")
+        self.games[game.id] = game.model_dump_json()
+
+    async def get_games(self, *game_ids: int) -> list[GameSchema]:
+        self.calls.append("get_games")
+        return [GameSchema.model_validate_json(self.games[game_id]) for game_id in game_ids]
+
+    async def update_games(self, *game_ids: int, update: Callable) -> list[GameSchema]:
+        self.calls.append("update_games")
+        games = [GameSchema.model_validate_json(self.games[game_id]) for game_id in game_ids]
+        for game in games:
+            update(game)
+            self.games[game.id] = game.model_dump_json()
+        return games
+
+
+def _create_game(game_id: int) -> GameSchema:
+    return GameSchema(
+        id=game_id,
+        state=GameStateEnum.BEFORE_START,
+        lead=LeadSchema(id=1, username="lead"),
+        players=[PlayerSchema(id=2, username="first"), PlayerSchema(id=3, username="second")],
+        categories=[],
+    )
+
+
+async def test_disconnect_players_updates_games_in_one_batch():
+    game_repo = _StubGameRepo([_create_game(10), _create_game(20)])
+    game_service = GameService(game_repo=game_repo, user_service=None)
+
+    games = await game_service.disconnect_players(
+        [
+            GameSessionShema(game_id=10, player_id=1, is_lead=True),
+            GameSessionShema(game_id=10, player_id=2, is_lead=False),
+            GameSessionShema(game_id=20, player_id=3, is_lead=False),
+        ],
+    )
+
+    assert game_repo.calls == ["update_games"]
+    assert [game.id for game in games] == [10, 20]
+    first, second = (GameSchema.model_validate_json(game_repo.games[i]) for i in (10, 20))
+    assert first.lead.state is LeadStateEnum.DISCONNECTED
+    assert [p.state for p in first.players] == [
+        PlayerStateEnum.DISCONNECTED,
+        PlayerStateEnum.CONNECTED,
+    ]
+    assert second.lead.state is LeadStateEnum.CONNECTED
+    assert [p.state for p in second.players] == [
+        PlayerStateEnum.CONNECTED,
+        PlayerStateEnum.DISCONNECTED,
+    ]
+
+
+async def test_reconnect_player_restores_session_without_user_lookup():
+    game = _create_game(10)
+    game.players[0].state = PlayerStateEnum.DISCONNECTED
+    game_repo = _StubGameRepo([game])
+    game_service = GameService(game_repo=game_repo, user_service=None)
+    session = GameSessionShema(game_id=10, player_id=2, is_lead=False)
+
+    game = await game_service.reconnect_player(session)
+
+    assert game_repo.calls == ["update_games"]
+    assert game.player_map[2].state is PlayerStateEnum.CONNECTED
+    with pytest.raises(ForbiddenError):
+        await game_service.reconnect_player(session)
@@ -0,0 +1,50 @@
+import contextlib
+from collections.abc import AsyncIterator
+
+from errors.storage import RedisBaseError
+from schemas.storage import CacheConfigSchema
+from storages.cache import CacheManager
+
+
+class _UnavailableRedisManager:
+    @contextlib.asynccontextmanager
+    async def client(self) -> AsyncIterator[None]:
+        raise RedisBaseError("Redis is unavailable")
+        yield
+
+
+def _create_cache_manager(**config) -> CacheManager:
+    return CacheManager(
+        redis_manager=_UnavailableRedisManager(),
+        conn_config=CacheConfigSchema(**config),
+    )
+
+
+async def test_local_cache_serves_values_without_redis():
+    cache_manager = _create_cache_manager()
+    await cache_manager.set_many("category", {1: '{"id": 1}'})
+
+    values = await cache_manager.get_many("category", [1, 2])
+
+    assert values == {1: '{"id": 1}'}
+    stats = cache_manager.stats()["category"]
+    assert (stats.local_hits, stats.remote_hits, stats.misses) == (1, 0, 1)
+
+
+async def test_invalidate_evicts_local_values():
+    cache_manager = _create_cache_manager()
+    await cache_manager.set_many("lobby", {1: "{}", 2: "{}"})
+
+    await cache_manager.invalidate("lobby", [1])
+
+    assert await cache_manager.get_many("lobby", [1, 2]) == {2: "{}"}
+    assert cache_manager.stats()["lobby"].invalidations == 1
+
+
+async def test_local_cache_evicts_least_recently_used_values():
+    cache_manager = _create_cache_manager(local_max_size=2)
+    await cache_manager.set_many("category", {1: "{}", 2: "{}"})
+    await cache_manager.get_many("category", [1])
+    await cache_manager.set_many("category", {3: "{}"})
+
+    assert await cache_manager.get_many("category", [1, 2, 3]) == {1: "{}", 3: "{}"}
@@ -0,0 +1,47 @@
+from enums.game import GameStateEnum
+from repositories import GameRepo
+from schemas.game import GameSchema
+from schemas.player import LeadSchema
+from schemas.storage import RedisConnectionSchema
+from storages.client_cache import ClientCache
+from storages.memory import MemoryRedisManager
+
+
+def _create_game(state: GameStateEnum) -> GameSchema:
+    return GameSchema(
+        id=10,
+        state=state,
+        lead=LeadSchema(id=1, username="lead"),
+        players=[],
+        categories=[],
+    )
+
+
+async def test_tracked_namespace_is_served_from_client_cache():
+    redis_manager = MemoryRedisManager(conn_config=RedisConnectionSchema(host="memory", port=0))
+    redis_manager._client_cache = client_cache = ClientCache(namespaces=["game"], max_size=10)
+    client_cache.activate()
+    game_repo = GameRepo(redis_manager=redis_manager)
+    key = game_repo._create_key(name="game", game_id=10)
+
+    await game_repo.set_game(_create_game(GameStateEnum.BEFORE_START))
+    await game_repo.get_game(10)
+    await game_repo.set_game(_create_game(GameStateEnum.SELECT_PLAYER))
+    # Own write is served until its invalidation
+    assert (await game_repo.get_game(10)).state is GameStateEnum.SELECT_PLAYER
+
+    # Write of another process reported with own write by one invalidation is read
+    await redis_manager._client.set(
+        key,
+        game_repo._encode(_create_game(GameStateEnum.SELECT_PROMPT)),
+    )
+    client_cache.invalidate([key])
+    assert (await game_repo.get_game(10)).state is GameStateEnum.SELECT_PROMPT
+
+    stats = redis_manager.client_cache_stats()
+    assert (stats.hits, stats.misses, stats.hit_ratio) == (2, 1, 2 / 3)
+
+    _, epoch = client_cache.get_many([], decode=False)
+    client_cache.invalidate([key])
+    client_cache.set_many({key: b"stale", "game:other": b"other"}, decode=False, epoch=epoch)
+    assert client_cache.get_many([key, "game:other"], decode=False)[0] == {"game:other": b"other"}
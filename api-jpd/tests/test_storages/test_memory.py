@@ -0,0 +1,106 @@
+import asyncio
+import contextlib
+from datetime import timedelta
+
+import pytest
+from redis.exceptions import ResponseError, WatchError
+
+from enums.game import GameStateEnum
+from repositories import GameRepo, PresenceRepo
+from schemas.game import GameSchema, GameSessionShema
+from schemas.player import LeadSchema
+from schemas.presence import PresenceSchema
+from schemas.storage import CacheConfigSchema, RedisConnectionSchema
+from storages.cache import CacheManager
+from storages.memory import MemoryRedis, MemoryRedisManager
+
+
+def _create_game() -> GameSchema:
+    return GameSchema(
+        id=10,
+        state=GameStateEnum.BEFORE_START,
+        lead=LeadSchema(id=1, username="lead"),
+        players=[],
+        categories=[],
+    )
+
+
+def _create_redis_manager() -> MemoryRedisManager:
+    return MemoryRedisManager(conn_config=RedisConnectionSchema(host="memory", port=0))
+
+
+async def test_memory_backend_serves_repositories():
+    redis_manager = _create_redis_manager()
+    presence_repo = PresenceRepo(redis_manager=redis_manager)
+    presences = [
+        PresenceSchema(
+            node_id=node_id,
+            sid=sid,
+            session=GameSessionShema(game_id=10, player_id=player_id, is_lead=False),
+        )
+        for player_id, (node_id, sid) in enumerate(
+            (("failed", "first"), ("failed", "second"), ("alive", "third")),
+        )
+    ]
+    assert await presence_repo.touch("failed", *presences[:2], at=1.0)
+    assert await presence_repo.touch("alive", presences[2], at=1.0)
+    assert not await presence_repo.touch("alive", at=2.0)
+    await presence_repo.remove(presences[1])
+
+    assert await presence_repo.pop_expired("alive", before=1.5) == presences[:1]
+    assert await presence_repo.pop_expired("other", before=1.5) == []
+    assert await presence_repo.pop_expired("failed", before=2.5) == presences[2:]
+
+    game_repo = GameRepo(redis_manager=redis_manager)
+    game = _create_game()
+    await game_repo.set_games([game])
+    assert await game_repo.get_games(game.id, 20) == [game]
+
+    await game_repo.set("blob", b"\x00\xff", expire=timedelta(milliseconds=50))
+    assert await game_repo.get("blob", decode=False) == b"\x00\xff"
+    await asyncio.sleep(0.06)
+    assert await game_repo.get("blob", decode=False) is None
+
+
+async def test_memory_backend_publishes_cache_invalidations():
+    redis_manager = _create_redis_manager()
+    cache_manager = CacheManager(redis_manager=redis_manager, conn_config=CacheConfigSchema())
+    listener = asyncio.create_task(cache_manager.listen())
+    await asyncio.sleep(0)
+    other_cache_manager = CacheManager(
+        redis_manager=redis_manager,
+        conn_config=CacheConfigSchema(),
+    )
+    await cache_manager.set_many("lobby", {1: "{}"})
+
+    await other_cache_manager.invalidate("lobby", [1])
+    await asyncio.sleep(0)
+
+    assert await cache_manager.get_many("lobby", [1]) == {}
+    listener.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await listener
+
+
+async def test_memory_pipeline_fails_if_watched_key_changes():
+    client = MemoryRedis()
+    await client.set("counter", 1)
+
+    async with client.pipeline() as pipe:
+        await pipe.watch("counter")
+        value = int(await pipe.get("counter"))
+        pipe.multi()
+        pipe.set("counter", value + 1)
+        assert await pipe.execute() == [True]
+
+    async with client.pipeline() as pipe:
+        await pipe.watch("counter")
+        await client.set("counter", 10)
+        pipe.multi()
+        pipe.set("counter", 3)
+        with pytest.raises(WatchError):
+            await pipe.execute()
+
+    assert await client.execute_command("GET", "counter") == "10"
+    with pytest.raises(ResponseError):
+        await client.execute_command("EVAL", "return 1", 0)
@@ -0,0 +1,14 @@
+from types import SimpleNamespace
+
+from schemas.storage import RedisConnectionSchema
+from storages.redis import RedisManager
+
+
+def test_pool_stats_fall_back_to_none_without_pool_attributes():
+    redis_manager = RedisManager(conn_config=RedisConnectionSchema(host="localhost", port=6379))
+
+    stats = redis_manager.pool_stats()
+    assert (stats.checked_in, stats.checked_out) == (0, 0)
+
+    redis_manager._client.connection_pool = SimpleNamespace()
+    assert redis_manager.pool_stats() is None
@@ -0,0 +1,90 @@
+from enums.game import GameStateEnum
+from repositories import GameRepo
+from schemas.game import GameSchema
+from schemas.player import LeadSchema
+from schemas.storage import RedisConnectionSchema
+from storages.memory import MemoryRedisManager
+from storages.sharding import HashRing
+
+
+def _create_game(game_id: int) -> GameSchema:
+    return GameSchema(
+        id=game_id,
+        state=GameStateEnum.BEFORE_START,
+        lead=LeadSchema(id=1, username="lead"),
+        players=[],
+        categories=[],
+    )
+
+
+def test_hash_ring_moves_only_keys_of_added_node():
+    keys = [str(game_id) for game_id in range(1000)]
+    ring = HashRing(["first", "second", "third"])
+    grown_ring = HashRing(["first", "second", "third", "fourth"])
+
+    moved = [key for key in keys if ring.get_node(key) != grown_ring.get_node(key)]
+
+    assert all(grown_ring.get_node(key) == "fourth" for key in moved)
+    assert 0.1 < len(moved) / len(keys) < 0.4
+
+
+async def test_game_repo_routes_games_to_shards():
+    shards = [
+        MemoryRedisManager(conn_config=RedisConnectionSchema(host="memory", port=port))
+        for port in (1, 2, 3)
+    ]
+    redis_manager = MemoryRedisManager(
+        conn_config=RedisConnectionSchema(host="memory", port=0),
+        shards=shards,
+    )
+    game_repo = GameRepo(redis_manager=redis_manager)
+    games = [_create_game(game_id) for game_id in range(1, 13)]
+
+    await game_repo.set_games(games)
+    await game_repo.set_game(games[0].model_copy(update={"state": GameStateEnum.SELECT_PLAYER}))
+
+    assert await game_repo.get_games(*(game.id for game in games)) == [
+        games[0].model_copy(update={"state": GameStateEnum.SELECT_PLAYER}),
+        *games[1:],
+    ]
+    for shard in shards:
+        assert any(await shard._client.mget(_keys(game_repo, games)))
+    assert not any(await redis_manager._client.mget(_keys(game_repo, games)))
+    assert await game_repo.delete_many(*_keys(game_repo, games)) == len(games)
+
+
+async def test_game_repo_updates_games_again_if_written_meanwhile():
+    shards = [
+        MemoryRedisManager(conn_config=RedisConnectionSchema(host="memory", port=port))
+        for port in (1, 2)
+    ]
+    redis_manager = MemoryRedisManager(
+        conn_config=RedisConnectionSchema(host="memory", port=0),
+        shards=shards,
+    )
+    game_repo = GameRepo(redis_manager=redis_manager)
+    games = [_create_game(game_id) for game_id in range(1, 5)]
+    await game_repo.set_games(games)
+    updated_ids = []
+
+    def update(game: GameSchema) -> None:
+        if game.id == 1 and 1 not in updated_ids:
+            # Another client writes the game between read and write of the update
+            key = _keys(game_repo, [game])[0]
+            written = game.model_copy(update={"state": GameStateEnum.SELECT_PLAYER})
+            game_repo._get_manager(key)._client._set(key, game_repo._encode(written))
+        updated_ids.append(game.id)
+        game.lead.username = "updated"
+
+    updated = await game_repo.update_games(1, 2, 3, 4, 5, update=update)
+
+    # Games in the shard of game 1 are updated again
+    assert updated_ids.count(1) == 2
+    assert set(updated_ids) == {1, 2, 3, 4}
+    assert [game.id for game in updated] == [1, 2, 3, 4]
+    assert updated[0].state is GameStateEnum.SELECT_PLAYER
+    assert await game_repo.get_games(1, 2, 3, 4) == updated
+
+
+def _keys(game_repo: GameRepo, games: list[GameSchema]) -> list[str]:
+    return [game_repo._create_key(name="game", game_id=game.id) for game in games]
@@ -0,0 +1,62 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+
+import lifespan
+from utils.docs import build_docs, get_docs
+
+DOCS_BUILD_BUDGET_SEC = 1.0
+
+
+class _StubManager:
+    def __init__(self):
+        self.is_warm = asyncio.Event()
+        self.is_closed = False
+
+    async def prewarm(self) -> None:
+        await self.is_warm.wait()
+
+    async def listen(self) -> None:
+        await asyncio.Event().wait()
+
+    async def track_invalidations(self) -> None:
+        await asyncio.Event().wait()
+
+    async def track_presence(self, heartbeat_sec: float, ttl_sec: float) -> None:
+        await asyncio.Event().wait()
+
+    async def close(self) -> None:
+        self.is_closed = True
+
+
+async def test_startup_does_not_wait_for_pools(monkeypatch: pytest.MonkeyPatch):
+    manager = _StubManager()
+    for name in ("get_db_manager", "get_redis_manager", "get_cache_manager"):
+        monkeypatch.setattr(lifespan, name, lambda: manager)
+    monkeypatch.setattr(lifespan, "game_namespace", manager)
+    app = SimpleNamespace(state=SimpleNamespace())
+
+    await lifespan.run_startup_events(app)
+    await asyncio.sleep(0)
+    assert not app.state.ready
+
+    manager.is_warm.set()
+    await app.state.tasks[0]
+    assert app.state.ready
+
+    await lifespan.run_shutdown_events(app)
+    assert all(task.done() for task in app.state.tasks)
+    assert manager.is_closed
+
+
+def test_docs_are_built_within_budget_once(test_app: FastAPI):
+    started = time.perf_counter()
+    docs = build_docs(test_app)
+    assert time.perf_counter() - started < DOCS_BUILD_BUDGET_SEC
+
+    test_app.state.docs = None
+    assert get_docs(test_app) is get_docs(test_app)
+    assert get_docs(test_app).etag == docs.etag
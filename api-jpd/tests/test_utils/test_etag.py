@@ -0,0 +1,18 @@
+from schemas.base import VersionSchema
+from utils.etag import create_etag, is_etag_matched
+
+
+def test_etag_changes_with_versions():
+    etag = create_etag([VersionSchema(id=1, version=1), VersionSchema(id=2, version=1)])
+
+    assert etag != create_etag([VersionSchema(id=1, version=2), VersionSchema(id=2, version=1)])
+    assert etag != create_etag([VersionSchema(id=2, version=1), VersionSchema(id=1, version=1)])
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = create_etag([VersionSchema(id=1, version=1)])
+
+    assert is_etag_matched(f'"other", W/{etag}', etag)
+    assert is_etag_matched("*", etag)
+    assert not is_etag_matched('"other"', etag)
+    assert not is_etag_matched(None, etag)
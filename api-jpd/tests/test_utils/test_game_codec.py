@@ -0,0 +1,60 @@
+import pytest
+
+from enums.game import GameStateEnum
+from enums.player import LeadStateEnum, PlayerStateEnum
+from enums.prompt import PromptStateEnum, PromptTypeEnum
+from schemas.category.nested import CategoryInGameSchema
+from schemas.game import GameSchema
+from schemas.player import LeadSchema, PlayerSchema
+from schemas.prompt.base import PromptInGameSchema
+from utils.game_codec import GAME_CODEC_VERSION, decode_game, encode_game
+
+
+def _create_game() -> GameSchema:
+    return GameSchema(
+        id=10,
+        state=GameStateEnum.SELECT_PROMPT,
+        lead=LeadSchema(id=1, username="lead", state=LeadStateEnum.DISCONNECTED),
+        players=[
+            PlayerSchema(id=2, username="first", state=PlayerStateEnum.SELECTED, score=300),
+            PlayerSchema(id=3, username="second", state=PlayerStateEnum.CONNECTED),
+        ],
+        categories=[
+            CategoryInGameSchema(
+                id=4,
+                name="Category",
+                prompts=[
+                    PromptInGameSchema(
+                        id=5,
+                        category_id=4,
+                        question="Question",
+                        question_type=PromptTypeEnum.IMAGE,
+                        answer="Answer",
+                        answer_type=PromptTypeEnum.TEXT,
+                        order=1,
+                        score=100,
+                        state=PromptStateEnum.SELECTED,
+                    ),
+                ],
+            ),
+        ],
+    )
+
+
+def test_game_codec_round_trip_and_reads_json():
+    game = _create_game()
+
+    blob = encode_game(game, compression_min_size=0)
+
+    assert blob[0] == GAME_CODEC_VERSION
+    assert len(blob) < len(game.model_dump_json())
+    assert decode_game(blob).model_dump() == game.model_dump()
+    assert decode_game(game.model_dump_json().encode()).model_dump() == game.model_dump()
+    assert decode_game(game.model_dump_json()).model_dump() == game.model_dump()
+
+
+def test_game_codec_rejects_unknown_flags():
+    blob = encode_game(_create_game(), compression_min_size=0)
+
+    with pytest.raises(ValueError, match="flags"):
+        decode_game(blob[:1] + bytes((0b01,)) + blob[2:])
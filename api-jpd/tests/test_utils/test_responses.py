@@ -0,0 +1,39 @@
+import datetime
+
+import orjson
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+
+from enums.lobby import LobbyStateEnum
+from schemas.category.nested import CategoryWithPromptsSchema
+from schemas.lobby.nested import LobbySchema
+from schemas.user.base import UserPublicSchema
+from utils.responses import ModelResponse
+
+
+def test_model_response_matches_response_model_serialization():
+    created_at = datetime.datetime(2025, 1, 1, 12, 30)
+    lobby = LobbySchema(
+        id=1,
+        host_id=1,
+        state=LobbyStateEnum.CREATED,
+        created_at=created_at,
+        version=2,
+        host=UserPublicSchema(id=1, username="host", created_at=created_at),
+        categories=[
+            CategoryWithPromptsSchema(id=1, name="Name", owner_id=1, version=1, prompts=[]),
+        ],
+        lobby_categories=[],
+    )
+
+    resp = ModelResponse([lobby], headers={"ETag": '"tag"'})
+
+    assert orjson.loads(resp.body) == jsonable_encoder([lobby])
+    assert resp.headers["ETag"] == '"tag"'
+    assert resp.headers["Content-Type"] == "application/json"
+
+
+def test_openapi_keeps_response_models(test_app: FastAPI):
+    get_lobbies = test_app.openapi()["paths"]["/api/v1/lobby"]["get"]
+    schema = get_lobbies["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema["items"]["$ref"].endswith("/LobbySchema")
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import pytest
+
+from enums.game import GameStateEnum
+from schemas.game import GameEventSchema, GamePayloadSchema, GameSchema, GameSessionShema
+from schemas.game_event.connect import ConnectEventSchema, DisconnectEventSchema
+from schemas.player import LeadSchema
+from websocket.coalescer import EmitCoalescer
+from websocket.namespaces.game import GameNamespace
+
+
+def _create_game(state: GameStateEnum) -> GameSchema:
+    return GameSchema(
+        id=10,
+        state=state,
+        lead=LeadSchema(id=1, username="lead"),
+        players=[],
+        categories=[],
+    )
+
+
+async def test_coalescer_merges_events_of_room_within_window():
+    emitted = []
+
+    async def emit(event: GameEventSchema, *, room: str) -> None:
+        emitted.append((event, room))
+
+    coalescer = EmitCoalescer(emit, window_sec=0)
+    first_game = _create_game(GameStateEnum.BEFORE_START)
+    last_game = _create_game(GameStateEnum.SELECT_PLAYER)
+    coalescer.add(ConnectEventSchema(payload=GamePayloadSchema(game=first_game)), room="game:id=10")
+    coalescer.add(
+        DisconnectEventSchema(payload=GamePayloadSchema(game=last_game)),
+        room="game:id=10",
+    )
+    coalescer.add(ConnectEventSchema(payload=GamePayloadSchema(game=first_game)), room="game:id=20")
+    await coalescer.flush()
+
+    [(batch, room), (single, other_room)] = emitted
+    assert (batch.name, room) == ("game.batch", "game:id=10")
+    assert batch.payload.game == last_game
+    assert batch.payload.events == ["game.connect", "game.disconnect"]
+    assert (single.name, other_room) == ("game.connect", "game:id=20")
+
+
+async def test_connects_of_clients_are_merged(monkeypatch: pytest.MonkeyPatch):
+    game = _create_game(GameStateEnum.BEFORE_START)
+    namespace = GameNamespace("/game", emit_coalesce_sec=0)
+    emitted = []
+
+    async def emit(event: str, **kwargs) -> None:
+        emitted.append(event)
+
+    async def enter_game(sid: str, session: GameSessionShema) -> None:
+        pass
+
+    async def reconnect_player(session: GameSessionShema) -> GameSchema:
+        return game
+
+    monkeypatch.setattr(namespace, "emit", emit)
+    monkeypatch.setattr(namespace, "_enter_game", enter_game)
+    game_service = SimpleNamespace(reconnect_player=reconnect_player)
+
+    for player_id in range(2, 10):
+        session = GameSessionShema(game_id=game.id, player_id=player_id, is_lead=False)
+        assert await namespace._resume(f"sid-{player_id}", session, game_service=game_service)
+    await namespace._coalescer.flush()
+
+    assert emitted == ["game.batch"]
@@ -0,0 +1,108 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+import socketio
+
+from schemas.game import GameSessionShema
+from schemas.presence import PresenceSchema
+from websocket.namespaces import game as game_module
+from websocket.namespaces.game import GameNamespace
+
+
+class _StubPresenceService:
+    def __init__(self, expired: list[PresenceSchema]):
+        self.expired = expired
+        self.tracked = []
+        self.node_ids = set()
+
+    async def track(self, node_id: str, *presences: PresenceSchema) -> bool:
+        self.tracked.extend(presences)
+        is_added = node_id not in self.node_ids
+        self.node_ids.add(node_id)
+        return is_added
+
+    async def pop_expired(self, node_id: str, ttl_sec: float) -> list[PresenceSchema]:
+        expired, self.expired = self.expired, []
+        return expired
+
+
+class _StubGameService:
+    def __init__(self):
+        self.disconnected = asyncio.Event()
+        self.sessions = []
+
+    async def disconnect_players(self, sessions) -> list:
+        self.sessions.extend(sessions)
+        self.disconnected.set()
+        return []
+
+
+async def test_track_presence_sweeps_stale_clients(monkeypatch: pytest.MonkeyPatch):
+    stale = PresenceSchema(
+        node_id="failed",
+        sid="stale",
+        session=GameSessionShema(game_id=10, player_id=2, is_lead=False),
+    )
+    presence_service = _StubPresenceService(expired=[stale])
+    game_service = _StubGameService()
+    monkeypatch.setattr(
+        game_module,
+        "get_presence_service",
+        asynccontextmanager(lambda: _yield(presence_service)),
+    )
+    monkeypatch.setattr(
+        game_module,
+        "get_game_service",
+        asynccontextmanager(lambda: _yield(game_service)),
+    )
+    namespace = GameNamespace("/game")
+    await namespace._track_presence(
+        "alive",
+        GameSessionShema(game_id=10, player_id=3, is_lead=False),
+    )
+
+    task = asyncio.create_task(namespace.track_presence(heartbeat_sec=60, ttl_sec=30))
+    await asyncio.wait_for(game_service.disconnected.wait(), timeout=1)
+    task.cancel()
+
+    assert [p.sid for p in presence_service.tracked] == ["alive", "alive"]
+    assert game_service.sessions == [stale.session]
+
+
+async def test_swept_node_disconnects_its_clients(monkeypatch: pytest.MonkeyPatch):
+    presence_service = _StubPresenceService(expired=[])
+    monkeypatch.setattr(
+        game_module,
+        "get_presence_service",
+        asynccontextmanager(lambda: _yield(presence_service)),
+    )
+    namespace = GameNamespace("/game")
+    disconnected = []
+
+    async def disconnect(sid: str) -> None:
+        disconnected.append(sid)
+
+    monkeypatch.setattr(namespace, "disconnect", disconnect)
+    session = GameSessionShema(game_id=10, player_id=3, is_lead=False)
+    await namespace._track_presence("first", session)
+    await namespace._track_presence("second", session)
+    assert disconnected == []
+
+    # Another node swept this one
+    presence_service.node_ids.clear()
+    await namespace._send_heartbeat(presence_service, *namespace._presences.values())
+
+    assert disconnected == ["first", "second"]
+
+
+async def _yield(value):
+    yield value
+
+
+async def test_connect_is_refused_while_draining():
+    namespace = GameNamespace("/game")
+    namespace._draining = True
+
+    with pytest.raises(socketio.exceptions.ConnectionRefusedError):
+        await namespace.on_connect("sid", environ={})
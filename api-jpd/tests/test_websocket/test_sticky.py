@@ -0,0 +1,91 @@
+import asyncio
+import contextlib
+from pathlib import Path
+
+from websocket.sticky import StickyFront, create_sid_generator, get_sid_worker_id
+
+
+def test_sid_is_routed_to_worker_that_created_it():
+    sid = create_sid_generator(lambda: "a.b-c_d", worker_id=12)()
+    front = StickyFront(["worker-0.sock", "worker-1.sock"])
+
+    assert get_sid_worker_id(f"GET /ws/?EIO=4&transport=polling&sid={sid} HTTP/1.1".encode()) == 12
+    assert front.choose_worker(b"GET /ws/?EIO=4&transport=polling&sid=1.abc HTTP/1.1\r\n") == 1
+    assert front.choose_worker(b"GET /ws/?EIO=4&transport=websocket HTTP/1.1\r\n") == 0
+    assert front.choose_worker(b"GET /ws/?EIO=4&sid=abc HTTP/1.1\r\n") == 0
+
+
+async def test_front_routes_each_request_of_connection(tmp_path: Path):
+    async def respond(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, worker_id: int):
+        with contextlib.suppress(asyncio.IncompleteReadError):
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                body = await reader.readexactly(2) if b"POST" in head else b""
+                writer.write(f"{worker_id} ".encode() + head.split(b"\r\n")[0] + body + b"\n")
+                await writer.drain()
+        writer.close()
+
+    paths = [str(tmp_path / f"worker-{worker_id}.sock") for worker_id in range(2)]
+    workers = [
+        await asyncio.start_unix_server(
+            lambda reader, writer, worker_id=worker_id: respond(reader, writer, worker_id),
+            path=path,
+        )
+        for worker_id, path in enumerate(paths)
+    ]
+    front = await asyncio.start_server(StickyFront(paths)._handle, host="127.0.0.1", port=0)
+    port = front.sockets[0].getsockname()[1]
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    for request in (
+        b"GET /api/v1/lobby HTTP/1.1\r\n\r\n",
+        b"POST /ws/?EIO=4&transport=polling&sid=1.abc HTTP/1.1\r\nContent-Length: 2\r\n\r\n40",
+        b"GET /api/v1/lobby HTTP/1.1\r\n\r\n",
+        b"GET /ws/?EIO=4&transport=polling&sid=0.def HTTP/1.1\r\n\r\n",
+    ):
+        writer.write(request)
+        responses.append(await reader.readline())
+    writer.write_eof()
+    assert await reader.read() == b""
+    writer.close()
+
+    assert responses == [
+        b"0 GET /api/v1/lobby HTTP/1.1\n",
+        b"1 POST /ws/?EIO=4&transport=polling&sid=1.abc HTTP/1.140\n",
+        b"1 GET /api/v1/lobby HTTP/1.1\n",
+        b"0 GET /ws/?EIO=4&transport=polling&sid=0.def HTTP/1.1\n",
+    ]
+    for server in [front, *workers]:
+        server.close()
+        await server.wait_closed()
+
+
+async def test_front_falls_back_from_unavailable_worker(tmp_path: Path):
+    heads = []
+
+    async def respond(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        heads.append(await reader.readuntil(b"\r\n\r\n"))
+        writer.write(b"1\n")
+        await writer.drain()
+        writer.close()
+
+    paths = [str(tmp_path / f"worker-{worker_id}.sock") for worker_id in range(2)]
+    worker = await asyncio.start_unix_server(respond, path=paths[1])
+    front = await asyncio.start_server(StickyFront(paths)._handle, host="127.0.0.1", port=0)
+    port = front.sockets[0].getsockname()[1]
+
+    responses = []
+    for request in (
+        b"GET /api/v1/lobby HTTP/1.1\r\nX-Forwarded-For: 1.2.3.4\r\n\r\n",
+        b"GET /ws/?EIO=4&transport=polling&sid=0.abc HTTP/1.1\r\n\r\n",
+    ):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        responses.append(await reader.readline())
+        writer.close()
+
+    assert responses == [b"1\n", b"HTTP/1.1 502 Bad Gateway\r\n"]
+    assert heads == [b"GET /api/v1/lobby HTTP/1.1\r\nX-Forwarded-For: 127.0.0.1\r\n\r\n"]
+    for server in [front, worker]:
+        server.close()
+        await server.wait_closed()